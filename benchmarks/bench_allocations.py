@@ -0,0 +1,61 @@
+"""Count the parser and forest nodes allocated per token by parse() and recognize()"""
+from argparse import ArgumentParser
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+
+from derpy import context, parse, recognize
+from derpy.forest import Forest
+from derpy.grammars.python36 import p, PythonTokenizer
+from derpy.parsers import BaseParser
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+
+allocations = Counter()
+
+
+def subclasses(cls: type):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from subclasses(subclass)
+
+
+def count_allocations(cls: type):
+    """Count the instances of cls which are initialised"""
+    init = cls.__init__
+
+    @wraps(init)
+    def counting_init(self, *args):
+        allocations[type(self).__name__] += 1
+        init(self, *args)
+
+    cls.__init__ = counting_init
+
+
+def main():
+    parser = ArgumentParser(description="Count the nodes allocated per token on the Python 3.6 grammar")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    args = parser.parse_args()
+
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))
+    print(f"Counting with {len(tokens)} tokens")
+
+    # Only classes which define __init__ are counted, so that each allocation is counted once
+    for base in (BaseParser, Forest):
+        for cls in subclasses(base):
+            if "__init__" in vars(cls):
+                count_allocations(cls)
+
+    for func in (parse, recognize):
+        allocations.clear()
+        with context():
+            func(p.file_input, tokens)
+
+        total = sum(allocations.values())
+        print(f"{func.__name__}: {total / len(tokens):.1f} allocations/token")
+        for name, count in allocations.most_common():
+            print(f"    {name:<22} {count / len(tokens):6.2f}")
+
+
+if __name__ == "__main__":
+    main()
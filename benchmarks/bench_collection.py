@@ -0,0 +1,57 @@
+"""Compare parse() with and without the cyclic garbage collector suspended, with the Python 3.6 grammar"""
+import gc
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from derpy import Token, context, parse, recognize, suspended_collection
+from derpy.collection import observe, statistics, unobserve
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+
+
+def measure(func, tokens: list, suspend: bool) -> tuple:
+    """Return the time of a cold parse of tokens, and the time of the collections observed during it"""
+    # Fresh tokens, so that the derivatives of a previous parse are not reused
+    copied = [Token(t.first, t.second) for t in tokens]
+    observed_time = statistics.observed_time
+    with context():
+        start = time.perf_counter()
+        if suspend:
+            with suspended_collection():
+                func(p.file_input, copied)
+        else:
+            func(p.file_input, copied)
+        elapsed = time.perf_counter() - start
+    return elapsed, statistics.observed_time - observed_time
+
+
+def main():
+    parser = ArgumentParser(description="Measure the time of garbage collection during parsing")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))
+    print(f"Parsing {len(tokens)} tokens")
+
+    observe()
+    for func in (parse, recognize):
+        # The collections of the parses with the collector enabled estimate the time of those which are deferred
+        gc.collect()
+        statistics.reset()
+        for suspend in (False, True):
+            elapsed, collection_time = min(measure(func, tokens, suspend) for _ in range(args.repeat))
+            mode = "suspended" if suspend else "enabled"
+            print(f"{func.__name__:<10} collector {mode:<10} {elapsed:7.3f}s  (collections {collection_time:.3f}s)")
+
+        print(
+            f"{'':<10} deferred {statistics.deferred // args.repeat} collections per parse, "
+            f"estimated {statistics.avoided_time / args.repeat:.3f}s avoided"
+        )
+    unobserve()
+
+
+if __name__ == "__main__":
+    main()
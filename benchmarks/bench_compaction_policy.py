@@ -0,0 +1,59 @@
+"""Compare the throughput of parse() under each compaction policy, with the Python 3.6 and EBNF grammars"""
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from derpy import AdaptiveCompaction, CompactionPolicy, PeriodicCompaction, ThresholdCompaction, Token, context, parse
+from derpy.grammars.ebnf import e, EBNFTokenizer
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+sample_path = Path(__file__).parent.parent / "derpy" / "grammars" / "tools" / "sample.ebnf"
+
+policies = {
+    "every token": CompactionPolicy,
+    "every 2 tokens": lambda: PeriodicCompaction(2),
+    "every 4 tokens": lambda: PeriodicCompaction(4),
+    "above 200 parsers": lambda: ThresholdCompaction(200),
+    "adaptive": AdaptiveCompaction,
+}
+
+
+def measure(root, tokens: list, policy: CompactionPolicy, repeat: int) -> float:
+    """Return the best time to parse tokens, over a number of cold parses"""
+    best = float("inf")
+    for _ in range(repeat):
+        # Fresh tokens, so that the derivatives of a previous parse are not reused
+        copied = [Token(t.first, t.second) for t in tokens]
+        policy.statistics.reset()
+        with context():
+            start = time.perf_counter()
+            parse(root, copied, policy)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description="Compare the throughput of the compaction policies of parse()")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-n", "--tokens", type=int, default=1500, help="maximum number of Python tokens")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    grammars = {
+        "python36": (p.file_input, list(PythonTokenizer().tokenize_text(args.filepath.read_text()))[: args.tokens]),
+        "ebnf": (e.grammar, list(EBNFTokenizer().tokenize_file(sample_path, True))),
+    }
+
+    for grammar_name, (root, tokens) in grammars.items():
+        print(f"{grammar_name} ({len(tokens)} tokens)")
+        for name, create_policy in policies.items():
+            policy = create_policy()
+            elapsed = measure(root, tokens, policy, args.repeat)
+            statistics = policy.statistics
+            shrink_ratio = f"shrink ratio {statistics.shrink_ratio:.2f}" if statistics.measured else ""
+            print(f"    {name:<18} {len(tokens) / elapsed:8.0f} tokens/s  {statistics.compactions:6} compactions  {shrink_ratio}")
+
+
+if __name__ == "__main__":
+    main()
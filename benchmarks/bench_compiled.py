@@ -0,0 +1,70 @@
+"""Benchmark the compiled grammar against the object graph of the Python 3.6 grammar"""
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+
+from derpy import context, recognize
+from derpy.grammars.python36 import p, PythonTokenizer
+from derpy.parsers import BaseParser
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+
+
+def time_call(func, *args, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        with context():
+            start_time = perf_counter()
+            result = func(*args)
+            best = min(best, perf_counter() - start_time)
+    return best, result
+
+
+def reachable(*roots: BaseParser) -> set:
+    parsers = list(roots)
+    reached = set(roots)
+    for parser in parsers:
+        for child in parser._children():
+            if child not in reached:
+                reached.add(child)
+                parsers.append(child)
+    return reached
+
+
+def object_bytes(parser: BaseParser) -> int:
+    size = sys.getsizeof(parser)
+    if hasattr(parser, "__dict__"):
+        size += sys.getsizeof(parser.__dict__)
+    return size
+
+
+def main():
+    parser = ArgumentParser(description="Compare the compiled grammar against the objects of the Python 3.6 grammar")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    compile_start = perf_counter()
+    compiled = p.compile()
+    compile_time = perf_counter() - compile_start
+
+    parsers = reachable(*(v for v in vars(p).values() if isinstance(v, BaseParser)))
+    total_bytes = sum(map(object_bytes, parsers))
+
+    print(f"objects:  {len(parsers)} nodes, {total_bytes / len(parsers):.1f} bytes/node")
+    print(f"compiled: {len(compiled)} rows, {compiled.nbytes / len(compiled):.1f} bytes/row ({compile_time:.3f}s)")
+
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))
+    print(f"Benchmarking with {len(tokens)} tokens")
+
+    object_time, object_result = time_call(recognize, p.file_input, tokens, repeat=args.repeat)
+    compiled_time, compiled_result = time_call(compiled.recognize, p.file_input, tokens, repeat=args.repeat)
+    assert object_result == compiled_result
+
+    print(f"recognize: {object_time:.3f}s")
+    print(f"compiled:  {compiled_time:.3f}s ({object_time / compiled_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
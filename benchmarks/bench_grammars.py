@@ -0,0 +1,75 @@
+"""Benchmark parsing with the Python 3.6 and EBNF grammars"""
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+
+from derpy import Token, context, parse
+from derpy.grammars.ebnf import e, EBNFTokenizer
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_python_source = '''
+def fib(n, memo=None):
+    if memo is None:
+        memo = {}
+    if n < 2:
+        return n
+    memo[n] = fib(n - 1, memo) + fib(n - 2, memo)
+    return memo[n]
+
+class Point(object):
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def scale(self, factor):
+        return Point(self.x * factor, self.y * factor)
+
+values = [fib(i) for i in range(10) if i % 2]
+'''
+
+default_ebnf_path = Path(__file__).parent.parent / "derpy" / "grammars" / "tools" / "sample.ebnf"
+
+
+def time_parse(parser, tokens, repeat: int):
+    """Return the best time of a parse with cold caches, and of a parse of a copy of the tokens which follows it"""
+    cold = warm = float("inf")
+    for _ in range(repeat):
+        with context():
+            for copy_number in range(2):
+                copied = [Token(t.first, t.second) for t in tokens]
+                start_time = perf_counter()
+                trees = parse(parser, copied)
+                elapsed = perf_counter() - start_time
+                assert trees
+
+                if copy_number:
+                    warm = min(warm, elapsed)
+                else:
+                    cold = min(cold, elapsed)
+    return cold, warm
+
+
+def main():
+    parser = ArgumentParser(description="Measure the time to parse Python and EBNF sources")
+    parser.add_argument("--python", type=Path, help="Python source (defaults to a built-in sample)")
+    parser.add_argument("--ebnf", type=Path, default=default_ebnf_path, help="EBNF grammar source")
+    parser.add_argument("-n", "--copies", type=int, default=4, help="number of copies of the default Python source")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    python_source = args.python.read_text() if args.python else default_python_source * args.copies
+    benchmarks = (
+        ("python36", p.file_input, list(PythonTokenizer().tokenize_text(python_source))),
+        ("ebnf", e.grammar, list(EBNFTokenizer().tokenize_file(str(args.ebnf), True))),
+    )
+
+    for name, root, tokens in benchmarks:
+        cold, warm = time_parse(root, tokens, args.repeat)
+        print(
+            "{:<8} {:>5} tokens  cold {:.3f}s ({:6.1f}us/token)  warm {:.3f}s ({:6.1f}us/token)".format(
+                name, len(tokens), cold, cold / len(tokens) * 1e6, warm, warm / len(tokens) * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
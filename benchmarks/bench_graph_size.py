@@ -0,0 +1,42 @@
+"""Measure the size of the derived parser graph after each token, with the Python 3.6 grammar"""
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import mean
+
+from derpy import empty_parser, session
+from derpy.grammars.python36 import p, PythonTokenizer
+from derpy.parsers import graph_size
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+
+
+def main():
+    parser = ArgumentParser(description="Report the number of derived parsers which are live after each token")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-n", "--tokens", type=int, help="maximum number of tokens")
+    parser.add_argument("-s", "--segments", type=int, default=10, help="number of segments of the input to report")
+    args = parser.parse_args()
+
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))[: args.tokens]
+    sizes = []
+
+    with session():
+        derivative = p.file_input
+        for token in tokens:
+            derivative = derivative.derive(token).compact()
+            if derivative is empty_parser:
+                raise ValueError(f"Failed to parse {token}")
+
+            sizes.append(graph_size(derivative))
+
+        assert derivative.is_nullable()
+
+    print(f"{len(tokens)} tokens: mean {mean(sizes):.1f}, max {max(sizes)} parsers per token")
+    segment = max(1, len(sizes) // args.segments)
+    for start in range(0, len(sizes), segment):
+        window = sizes[start : start + segment]
+        print(f"tokens {start:>6}-{start + len(window) - 1:<6} mean {mean(window):8.1f}  max {max(window):6}")
+
+
+if __name__ == "__main__":
+    main()
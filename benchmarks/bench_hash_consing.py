@@ -0,0 +1,60 @@
+"""Compare the derivation of a grammar which repeats a subexpression in several of its alternatives (as a generated
+grammar may), with and without hash-consing"""
+import time
+from argparse import ArgumentParser
+from statistics import mean
+
+from derpy import Token, context, lit, session
+from derpy import parsers
+from derpy.parsers import Choice, graph_size, set_hash_consing
+
+
+def arguments():
+    return lit("(") & lit("ID") & lit(",") & lit("ID") & lit(",") & lit("ID") & lit(")")
+
+
+def build(alternatives: int):
+    # Each alternative writes out the same subexpression, rather than referencing a shared rule
+    return Choice(tuple(lit("ID") & lit(".") & lit("ID") & arguments() for _ in range(alternatives)))
+
+
+def measure(alternatives: int, tokens: list, enabled: bool) -> tuple:
+    """Return the time of a parse, the number of parsers derived, and the mean size of the live graph per token"""
+    set_hash_consing(enabled)
+    try:
+        grammar = build(alternatives)
+        sizes = []
+        with context(), session():
+            start = time.perf_counter()
+            derivative = grammar
+            for token in tokens:
+                derivative = derivative.derive(token).compact()
+                sizes.append(graph_size(derivative))
+            assert derivative.is_nullable()
+            elapsed = time.perf_counter() - start
+
+            # The parsers whose derivative memos are set within this session
+            derived = len(parsers._memoized_parsers)
+    finally:
+        set_hash_consing(False)
+
+    return elapsed, derived, mean(sizes)
+
+
+def main():
+    parser = ArgumentParser(description="Measure the effect of hash-consing upon derivation")
+    parser.add_argument("-a", "--alternatives", type=int, default=8)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = [Token(k, k) for k in ("ID", ".", "ID", "(", "ID", ",", "ID", ",", "ID", ")")]
+    for enabled in (False, True):
+        results = [measure(args.alternatives, tokens, enabled) for _ in range(args.repeat)]
+        elapsed = min(r[0] for r in results)
+        _, derived, size = results[0]
+        mode = "enabled" if enabled else "disabled"
+        print(f"hash-consing {mode:<9} {elapsed * 1e6:8.0f} us  {derived:5} parsers derived  {size:6.1f} parsers per token")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare the peak memory of tokenizing a file through a memory map, and from a string of its contents"""
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from derpy.grammars.ebnf import EBNFTokenizer
+from derpy.grammars.python36 import PythonTokenizer
+
+grammars_path = Path(__file__).parent.parent / "derpy" / "grammars"
+sources = {
+    "EBNFTokenizer": (EBNFTokenizer(), grammars_path / "tools" / "sample.ebnf"),
+    "PythonTokenizer": (PythonTokenizer(), grammars_path / "python36" / "grammar.py"),
+}
+
+
+def measure(tokenize, path: Path) -> tuple:
+    """Return the number of tokens of a file, the time to tokenize it and the peak number of bytes allocated"""
+    start = time.perf_counter()
+    count = sum(1 for _ in tokenize(path))
+    elapsed = time.perf_counter() - start
+
+    # Tracing slows tokenization, so the peak is measured separately
+    tracemalloc.start()
+    try:
+        for _ in tokenize(path):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = ArgumentParser(description="Measure the peak memory of the file tokenizers")
+    parser.add_argument("-s", "--size", type=float, default=4.0, help="size of each input file in megabytes")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        for name, (tokenizer, source_path) in sources.items():
+            source = source_path.read_text() + "\n"
+            path = Path(directory) / source_path.name
+            path.write_text(source * (int(args.size * 2 ** 20) // len(source) + 1))
+
+            paths = {
+                "mapped": tokenizer.tokenize_file,
+                "string": lambda p: tokenizer.tokenize_text(p.read_text()),
+            }
+            print(f"{name} ({path.stat().st_size / 2 ** 20:.1f} MiB)")
+            for mode, tokenize in paths.items():
+                count, elapsed, peak = measure(tokenize, path)
+                print(f"    {mode:<8} {count:9} tokens  {elapsed:6.2f}s  peak {peak / 2 ** 20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
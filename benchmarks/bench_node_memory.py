@@ -0,0 +1,83 @@
+"""Measure the memory of parser nodes with tracemalloc"""
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+
+from derpy import Token, context, lit, parse, recognize
+from derpy.grammars.python36 import p, PythonTokenizer
+from derpy.parsers import Alternate, Concatenate, LazyDerivative, Recurrence, Reduce, Sequence
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+
+
+def measure(construct, count: int) -> float:
+    """Return the mean number of bytes allocated by construct()"""
+    nodes = [None] * count
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        for i in range(count):
+            nodes[i] = construct()
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (end - start) / count
+
+
+def measure_peak(func, *args) -> int:
+    """Return the peak number of bytes allocated by func(*args)"""
+    with context():
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+def recurrence() -> Recurrence:
+    parser = Recurrence()
+    parser.parser = a
+    return parser
+
+
+def solved_alternate() -> Alternate:
+    # State which is assigned once parsers are compacted and their nullability is solved
+    parser = Alternate(a, b)
+    parser.compact()
+    parser.is_nullable()
+    return parser
+
+
+a = lit("a")
+b = lit("b")
+token = Token("a", "a")
+constructors = {
+    "Alternate": lambda: Alternate(a, b),
+    "Concatenate": lambda: Concatenate(a, b),
+    "Sequence": lambda: Sequence((a, b)),
+    "Reduce": lambda: Reduce(a, str),
+    "LazyDerivative": lambda: LazyDerivative(a, token),
+    "Recurrence": recurrence,
+    "Alternate (solved)": solved_alternate,
+}
+
+
+def main():
+    parser = ArgumentParser(description="Measure the bytes allocated per parser node")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-n", "--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, construct in constructors.items():
+        print(f"{name:<20} {measure(construct, args.count):6.1f} bytes/node")
+
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))
+    for func in (parse, recognize):
+        peak = measure_peak(func, p.file_input, tokens)
+        print(f"{func.__name__} peak ({len(tokens)} tokens): {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark recognition against parsing on the Python 3.6 grammar"""
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+
+from derpy import context, parse, recognize
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_source = '''
+def fib(n, memo=None):
+    if memo is None:
+        memo = {}
+    if n < 2:
+        return n
+    memo[n] = fib(n - 1, memo) + fib(n - 2, memo)
+    return memo[n]
+
+class Point(object):
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def scale(self, factor):
+        return Point(self.x * factor, self.y * factor)
+
+values = [fib(i) for i in range(10) if i % 2]
+'''
+
+
+def time_call(func, *args, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        with context():
+            start_time = perf_counter()
+            result = func(*args)
+            best = min(best, perf_counter() - start_time)
+    return best, result
+
+
+def main():
+    parser = ArgumentParser(description="Compare recognize() against parse() on the Python 3.6 grammar")
+    parser.add_argument("filepath", type=Path, nargs="?")
+    parser.add_argument("-n", "--copies", type=int, default=4, help="number of copies of the default source")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = args.filepath.read_text() if args.filepath else default_source * args.copies
+    tokens = list(PythonTokenizer().tokenize_text(source))
+    print("Benchmarking with {} tokens".format(len(tokens)))
+
+    parse_time, trees = time_call(parse, p.file_input, tokens, repeat=args.repeat)
+    recognize_time, is_valid = time_call(recognize, p.file_input, tokens, repeat=args.repeat)
+    assert bool(trees) == is_valid
+
+    print("parse:     {:.3f}s".format(parse_time))
+    print("recognize: {:.3f}s ({:.2f}x)".format(recognize_time, parse_time / recognize_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark the scaling of Kleene star and plus with the number of repetitions"""
+from argparse import ArgumentParser
+from time import perf_counter
+
+from derpy import Token, context, lit, parse, plus, star
+
+
+def time_call(func, *args, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        with context():
+            start_time = perf_counter()
+            result = func(*args)
+            best = min(best, perf_counter() - start_time)
+    return best, result
+
+
+def main():
+    parser = ArgumentParser(description="Measure the time to parse long repetitions with star() and plus()")
+    parser.add_argument("sizes", type=int, nargs="*", default=[1000, 10000, 100000])
+    parser.add_argument("-r", "--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    for name, macro in (("star", star), ("plus", plus)):
+        repetition = macro(lit("item")) & lit("end")
+        previous = None
+
+        for size in args.sizes:
+            tokens = [Token("item", i) for i in range(size)]
+            tokens.append(Token("end", None))
+
+            elapsed, trees = time_call(parse, repetition, tokens, repeat=args.repeat)
+            assert trees == {(tuple(range(size)), None)}
+
+            per_item = elapsed / size * 1e6
+            growth = "" if previous is None else " (x{:.1f} per-item time)".format(per_item / previous)
+            print("{}: {:>7} items {:8.3f}s {:6.2f}us/item{}".format(name, size, elapsed, per_item, growth))
+            previous = per_item
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the memory of a list of tokens and of a TokenBuffer, with the Python 3.6 and EBNF tokenizers"""
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+
+from derpy import TokenBuffer, context, parse
+from derpy.grammars.ebnf import EBNFTokenizer
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+sample_path = Path(__file__).parent.parent / "derpy" / "grammars" / "tools" / "sample.ebnf"
+
+
+def measure_memory(create) -> tuple:
+    """Return the object created by create(), and the number of bytes it retains"""
+    tracemalloc.start()
+    try:
+        result = create()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = ArgumentParser(description="Measure the bytes per token of token lists and buffers")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-n", "--copies", type=int, default=10, help="number of copies of each source to tokenize")
+    args = parser.parse_args()
+
+    python_source = (args.filepath.read_text() + "\n") * args.copies
+    ebnf_source = (sample_path.read_text() + "\n") * args.copies
+    python_tokenizer = PythonTokenizer()
+    ebnf_tokenizer = EBNFTokenizer()
+    # The token list, and the token buffer of each source
+    sources = {
+        "PythonTokenizer": (
+            lambda: list(python_tokenizer.tokenize_text(python_source)),
+            lambda: python_tokenizer.tokenize_to_buffer(python_source),
+        ),
+        "EBNFTokenizer (offsets)": (
+            lambda: list(ebnf_tokenizer.tokenize_text(ebnf_source, True)),
+            lambda: ebnf_tokenizer.tokenize_to_buffer(ebnf_source, True),
+        ),
+    }
+
+    for name, (create_list, create_buffer) in sources.items():
+        tokens, list_size = measure_memory(create_list)
+        buffer, buffer_size = measure_memory(create_buffer)
+
+        print(
+            f"{name:<24} {len(tokens):8} tokens  list {list_size / len(tokens):6.1f} bytes/token  "
+            f"buffer {buffer_size / len(buffer):6.1f} bytes/token"
+        )
+
+    # Parsing from a buffer creates each token as it is derived
+    tokens = list(PythonTokenizer().tokenize_text(args.filepath.read_text()))
+    for name, source in (("list", tokens), ("buffer", TokenBuffer.from_tokens(tokens))):
+        with context():
+            start = time.perf_counter()
+            parse(p.file_input, source)
+            print(f"parse from {name:<6} {time.perf_counter() - start:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
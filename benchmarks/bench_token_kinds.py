@@ -0,0 +1,59 @@
+"""Measure the cost of token hashing and kind comparison, and the throughput of parse() with the EBNF and Python 3.6
+grammars"""
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from timeit import timeit
+
+from derpy import Token, context, lit, parse
+from derpy.grammars.ebnf import e, EBNFTokenizer
+from derpy.grammars.python36 import p, PythonTokenizer
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "python36" / "grammar.py"
+sample_path = Path(__file__).parent.parent / "derpy" / "grammars" / "tools" / "sample.ebnf"
+
+
+def measure_parse(root, tokens: list, repeat: int) -> float:
+    """Return the best time of a cold parse of tokens"""
+    best = float("inf")
+    for _ in range(repeat):
+        # Fresh tokens, so that the derivatives (and hashes) of a previous parse are not reused
+        copied = [Token(t.first, t.second) for t in tokens]
+        with context():
+            start = time.process_time()
+            parse(root, copied)
+            best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description="Measure token hashing, kind comparison and parse throughput")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    number = 10 ** 6
+    token = Token("ID", "name")
+    memo = {(None, token): None}
+    key = (None, token)
+    literal = lit("ID")
+    mismatched = lit("NUMBER")
+    operations = {
+        "derivative memo lookup": lambda: memo[key],
+        "Literal.derive (match)": lambda: literal.derive(token),
+        "Literal.derive (mismatch)": lambda: mismatched.derive(token),
+    }
+    for name, operation in operations.items():
+        print(f"{name:<26} {timeit(operation, number=number) / number * 1e9:6.1f} ns")
+
+    grammars = {
+        "ebnf": (e.grammar, list(EBNFTokenizer().tokenize_file(sample_path, True))),
+        "python36": (p.file_input, list(PythonTokenizer().tokenize_text(args.filepath.read_text()))),
+    }
+    for name, (root, tokens) in grammars.items():
+        elapsed = measure_parse(root, tokens, args.repeat)
+        print(f"parse {name:<20} {len(tokens):6} tokens  {len(tokens) / elapsed:8.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
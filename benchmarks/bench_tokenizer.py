@@ -0,0 +1,55 @@
+"""Measure the throughput of the regex tokenizers on multi-megabyte inputs, as text and as streams of chunks"""
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from derpy import RegexTokenizer
+from derpy.grammars.ebnf import EBNFTokenizer
+
+default_path = Path(__file__).parent.parent / "derpy" / "grammars" / "tools" / "sample.ebnf"
+
+expression_source = 'total = (first + second) * 3.5\nname = "value" | other & flag\n'
+
+
+def repeat_text(text: str, size: int) -> str:
+    """Return text repeated to at least size characters"""
+    return text * (size // len(text) + 1)
+
+
+def measure(tokenize, source, repeat: int) -> tuple:
+    """Return the number of tokens of a source, and the best time to tokenize it"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in tokenize(source))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main():
+    parser = ArgumentParser(description="Measure the tokens per second of the regex tokenizers")
+    parser.add_argument("filepath", type=Path, nargs="?", default=default_path, help="EBNF source")
+    parser.add_argument("-s", "--size", type=float, default=4.0, help="size of each input in megabytes")
+    parser.add_argument("-c", "--chunk-size", type=int, default=2 ** 16, help="size of each chunk of the streams")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    size = int(args.size * 2 ** 20)
+    inputs = {
+        "RegexTokenizer": (RegexTokenizer(), repeat_text(expression_source, size)),
+        "EBNFTokenizer": (EBNFTokenizer(), repeat_text(args.filepath.read_text() + "\n", size)),
+    }
+
+    for name, (tokenizer, text) in inputs.items():
+        chunks = [text[i : i + args.chunk_size] for i in range(0, len(text), args.chunk_size)]
+        sources = {"text": (tokenizer.tokenize_text, text), "stream": (tokenizer.tokenize_stream, chunks)}
+        for mode, (tokenize, source) in sources.items():
+            count, elapsed = measure(tokenize, source, args.repeat)
+            print(
+                f"{name:<16} {mode:<6} {len(text) / 2 ** 20:5.1f} MiB  {count:9} tokens  "
+                f"{count / elapsed:10.0f} tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,30 @@ A Python implementation of parsing with derivatives. Provides a concise infix no
 
 See http://maniagnosis.crsr.net/2012/04/parsing-with-derivatives-introduction.html for a Java implementation, or http://matt.might.net/articles/parsing-with-derivatives/ for the original author's publication.
 """
-from .caching import context
+from .caching import context, session
+from .collection import suspended_collection
+from .compaction import AdaptiveCompaction, CompactionPolicy, PeriodicCompaction, ThresholdCompaction
+from .compiled import CompiledGrammar, compile_grammar
 from .grammar import Grammar
-from .parsers import arr, lit, least, cat, alt, opt, star, plus, parse, rec, red, empty_string, empty_parser
-from .token import Token
+from .forest import Forest, empty_forest
+from .parsers import (
+    arr,
+    lit,
+    least,
+    cat,
+    seq,
+    alt,
+    opt,
+    star,
+    plus,
+    parse,
+    parse_forest,
+    rec,
+    red,
+    empty_string,
+    empty_parser,
+)
+from .recognizer import recognize
+from .token import LazyToken, Token, TokenBuffer
 from .tokenizer import BaseTokenizer, RegexTokenizer
 from .tuple import unpack, flatten, selects, select
@@ -1,21 +1,122 @@
 from contextlib import contextmanager
 from functools import wraps
+from itertools import islice
+from weakref import WeakSet
 
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+
+from .fields import FieldMeta
 
-_cache_dict_type = dict
 _root_caches = []
+_pinned = WeakSet()
+_session_depth = 0
+_session_end_hooks = []
+
+# Maximum number of (pinned) entries which each cache retains between sessions
+cache_limit = 2 ** 16
+
+
+class CacheStatistics(metaclass=FieldMeta, fields="sessions dropped evicted"):
+    """Counts of the completed sessions, and the cache entries removed at their end"""
+
+    def reset(self):
+        self.sessions = self.dropped = self.evicted = 0
+
+
+statistics = CacheStatistics(0, 0, 0)
+
+
+class Cache(dict):
+    """Memo whose entries belong to the object returned by owner(key)"""
 
+    __slots__ = ("owner", "session_start")
 
-def create_cache() -> dict:
-    memo = _cache_dict_type()
+    def __init__(self, owner: Callable[[Any], Any]):
+        super().__init__()
+        self.owner = owner
+        self.session_start = 0
+
+
+def _key_owner(key):
+    return key
+
+
+def _first_key_owner(key):
+    return key[0]
+
+
+def create_cache(owner: Callable[[Any], Any] = _key_owner) -> Cache:
+    memo = Cache(owner)
     _root_caches.append(memo)
     return memo
 
 
+def pin(*objects):
+    """Retain the cache entries belonging to objects (e.g. the parsers of a frozen grammar) between sessions"""
+    _pinned.update(objects)
+
+
+def is_pinned(obj) -> bool:
+    try:
+        return obj in _pinned
+    except TypeError:
+        return False
+
+
+def on_session_end(hook: Callable[[], None]):
+    """Register a function to release state (other than these caches) which is scoped to a session"""
+    _session_end_hooks.append(hook)
+    return hook
+
+
+def set_cache_limit(limit: Optional[int]):
+    """Set the maximum number of entries retained by each cache between sessions (None for no limit)"""
+    global cache_limit
+    cache_limit = limit
+
+
 def clear_caches():
     for cache in _root_caches:
         cache.clear()
+        cache.session_start = 0
+
+
+def _end_session(cache: Cache):
+    owner = cache.owner
+    dropped = [k for k in islice(cache, cache.session_start, None) if not is_pinned(owner(k))]
+    for key in dropped:
+        del cache[key]
+    statistics.dropped += len(dropped)
+
+    # Evict the oldest entries beyond the limit
+    if cache_limit is not None and len(cache) > cache_limit:
+        evicted = list(islice(cache, len(cache) - cache_limit))
+        for key in evicted:
+            del cache[key]
+        statistics.evicted += len(evicted)
+
+    cache.session_start = len(cache)
+
+
+@contextmanager
+def session():
+    """Scope the cache entries created within this context to it.
+
+    Upon exit, only the entries belonging to pinned objects survive, up to cache_limit entries per cache.
+    Nested sessions belong to the outermost session.
+    """
+    global _session_depth
+    _session_depth += 1
+    try:
+        yield
+    finally:
+        _session_depth -= 1
+        if not _session_depth:
+            for hook in _session_end_hooks:
+                hook()
+            for cache in _root_caches:
+                _end_session(cache)
+            statistics.sessions += 1
 
 
 @contextmanager
@@ -41,7 +142,7 @@ def memoized(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
 
 def memoized_n(func: Callable) -> Callable:
     """Memoized function accepting self and *args"""
-    memo = create_cache()
+    memo = create_cache(_first_key_owner)
 
     @wraps(func)
     def wrapper(self, *args, memo=memo, func=func):
@@ -70,8 +171,12 @@ def recursive_memoize(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
     return wrapper
 
 
-def cached_property(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
-    memo = create_cache()
+def cached_property(func: Callable[[Any], Any] = None, *, owner: Callable[[Any], Any] = _key_owner):
+    """Memoized property. The owner of each instance's entry may be given to retain it between sessions"""
+    if func is None:
+        return lambda f: cached_property(f, owner=owner)
+
+    memo = create_cache(owner)
 
     @property
     @wraps(func)
@@ -0,0 +1,106 @@
+"""Cyclic garbage collection during parsing.
+
+A parse allocates many short-lived objects, so the cyclic garbage collector runs repeatedly, and its older generations
+(which include the grammar, and the derivatives retained by the parse) are traversed again and again. Within
+suspended_collection, the collector is disabled; when it ends, the derivatives of the parse are released at the end of
+its session. Derived parsers do not reference themselves, so most are reclaimed by reference counting; the remaining
+cycles (e.g. the derivatives of left-recursive rules) are reclaimed by collecting the youngest generation only, as no
+object allocated during the parse was promoted to an older generation.
+"""
+import gc
+from contextlib import contextmanager
+from time import perf_counter
+
+from .caching import session
+from .fields import FieldMeta
+
+__all__ = ("CollectionStatistics", "observe", "statistics", "suspended_collection", "unobserve")
+
+
+class CollectionStatistics(
+    metaclass=FieldMeta, fields="sessions deferred collected release_time observed observed_time"
+):
+    """Counts of the sessions which suspended collection, the collections which they deferred, and the objects which
+    were collected (and the time taken) when they ended. The collections observed outside these sessions (and their
+    time) estimate the time of the deferred collections, so explicit (full) collections skew the estimate. Collections
+    are only observed between observe() and unobserve()"""
+
+    def reset(self):
+        self.sessions = self.deferred = self.collected = self.observed = 0
+        self.release_time = self.observed_time = 0.0
+
+    @property
+    def avoided_time(self) -> float:
+        """Estimated time of the deferred collections, less the time taken to release the objects of the sessions"""
+        if not self.observed:
+            return 0.0
+        return self.deferred * self.observed_time / self.observed - self.release_time
+
+
+statistics = CollectionStatistics(0, 0, 0, 0.0, 0, 0.0)
+
+# Start of the collection which is being observed, if any
+_collection_start = None
+# Whether the objects of a session are being collected, which is not a collection that was deferred
+_releasing = False
+
+
+def _observe_collection(phase: str, info: dict):
+    global _collection_start
+    if phase == "start":
+        if not _releasing:
+            _collection_start = perf_counter()
+    elif _collection_start is not None:
+        statistics.observed += 1
+        statistics.observed_time += perf_counter() - _collection_start
+        _collection_start = None
+
+
+def observe():
+    """Time the collections of the process (see CollectionStatistics), until unobserve is called"""
+    if _observe_collection not in gc.callbacks:
+        gc.callbacks.append(_observe_collection)
+
+
+def unobserve():
+    """Stop timing the collections of the process"""
+    global _collection_start
+    if _observe_collection in gc.callbacks:
+        gc.callbacks.remove(_observe_collection)
+    _collection_start = None
+
+
+@contextmanager
+def suspended_collection():
+    """Suspend the cyclic garbage collector within a session (see caching.session).
+
+    Upon exit, the objects allocated within the session which are unreachable are reclaimed by collecting the youngest
+    generation.
+    """
+    global _releasing
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with session():
+            allocations = gc.get_count()[0]
+            try:
+                yield
+            finally:
+                allocations = gc.get_count()[0] - allocations
+
+        start = perf_counter()
+        _releasing = True
+        try:
+            statistics.collected += gc.collect(0)
+        finally:
+            _releasing = False
+
+        statistics.release_time += perf_counter() - start
+        threshold = gc.get_threshold()[0]
+        if threshold:
+            statistics.deferred += max(allocations, 0) // threshold
+        statistics.sessions += 1
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,128 @@
+"""Policies which schedule the compaction of the derivatives of a parse.
+
+By default, parse_forest compacts the derivative of every token. Compaction removes the empty and redundant parsers
+produced by derivation, but costs a traversal of the new parsers; a policy may defer it, so that the parsers of several
+derivatives are compacted by one traversal (and parsers which are unreachable by then are never compacted).
+Derivation does not require a compacted parser, though a derivative which cannot parse any input is only detected once
+it is compacted.
+"""
+from .fields import FieldMeta
+from .parsers import BaseParser, graph_size
+
+__all__ = (
+    "AdaptiveCompaction",
+    "CompactionPolicy",
+    "CompactionStatistics",
+    "PeriodicCompaction",
+    "ThresholdCompaction",
+)
+
+
+class CompactionStatistics(metaclass=FieldMeta, fields="tokens compactions measured nodes_before nodes_after"):
+    """Counts of the derived tokens, the compactions, and the sizes (see parsers.graph_size) of the measured graphs
+    before and after their compaction"""
+
+    def reset(self):
+        self.tokens = self.compactions = self.measured = self.nodes_before = self.nodes_after = 0
+
+    @property
+    def shrink_ratio(self) -> float:
+        """Ratio of the total size of the measured graphs after compaction to their total size before compaction"""
+        if not self.nodes_before:
+            return 1.0
+        return self.nodes_after / self.nodes_before
+
+
+class CompactionPolicy:
+    """Compacts the derivative of every token (the default schedule of parse_forest)"""
+
+    def __init__(self):
+        self.statistics = CompactionStatistics(0, 0, 0, 0, 0)
+        self._pending = 0
+
+    def should_compact(self, parser: BaseParser, pending: int) -> bool:
+        """Return True if the derivative should be compacted, given the number of tokens derived since the last
+        compaction"""
+        return True
+
+    def derived(self, parser: BaseParser) -> BaseParser:
+        """Return the parser with which to derive the next token, given the derivative of the current token"""
+        self.statistics.tokens += 1
+        self._pending += 1
+        if not self.should_compact(parser, self._pending):
+            return parser
+
+        self.statistics.compactions += 1
+        self._pending = 0
+        return self.compact(parser)
+
+    def compact(self, parser: BaseParser) -> BaseParser:
+        return parser.compact()
+
+    def measure(self, parser: BaseParser) -> BaseParser:
+        """Compact parser, recording the sizes of its graph before and after compaction"""
+        before = graph_size(parser)
+        parser = parser.compact()
+        after = graph_size(parser)
+
+        statistics = self.statistics
+        statistics.measured += 1
+        statistics.nodes_before += before
+        statistics.nodes_after += after
+        self.adapt(before, after)
+        return parser
+
+    def adapt(self, before: int, after: int):
+        """Called with the sizes of a measured graph before and after its compaction"""
+
+
+class PeriodicCompaction(CompactionPolicy):
+    """Compacts the derivative of every n-th token"""
+
+    def __init__(self, interval: int):
+        if interval < 1:
+            raise ValueError("Compaction interval must be at least 1")
+
+        super().__init__()
+        self.interval = interval
+
+    def should_compact(self, parser: BaseParser, pending: int) -> bool:
+        return pending >= self.interval
+
+
+class ThresholdCompaction(CompactionPolicy):
+    """Compacts the derivative once its graph exceeds a number of (unanalysed) parsers"""
+
+    def __init__(self, threshold: int):
+        super().__init__()
+        self.threshold = threshold
+
+    def should_compact(self, parser: BaseParser, pending: int) -> bool:
+        return graph_size(parser, self.threshold) > self.threshold
+
+
+class AdaptiveCompaction(CompactionPolicy):
+    """Compacts the derivative at an interval which adapts to the measured shrink ratio of compaction.
+
+    Where compaction removes most of a graph, the interval is halved; where it removes little, the interval is doubled.
+    """
+
+    def __init__(self, max_interval: int = 16, low_ratio: float = 0.5, high_ratio: float = 0.9):
+        super().__init__()
+        self.interval = 1
+        self.max_interval = max_interval
+        self.low_ratio = low_ratio
+        self.high_ratio = high_ratio
+
+    def should_compact(self, parser: BaseParser, pending: int) -> bool:
+        return pending >= self.interval
+
+    def compact(self, parser: BaseParser) -> BaseParser:
+        return self.measure(parser)
+
+    def adapt(self, before: int, after: int):
+        ratio = after / before
+        if ratio < self.low_ratio:
+            self.interval = max(self.interval // 2, 1)
+        elif ratio > self.high_ratio:
+            self.interval = min(self.interval * 2, self.max_interval)
@@ -0,0 +1,469 @@
+"""Array-backed compiled grammars.
+
+A compiled grammar lowers the parser graph of a (frozen) grammar into an integer-indexed node table, whose columns are
+arrays rather than Python objects. Like the recognizer (see derpy.recognizer), the table describes the language of the
+grammar alone: reductions and recurrences are spliced out, sequences become chains of concatenations and choices become
+balanced trees of alternations. Each node is a row of a kind code and two integer operands (the rows of its children,
+or the kind id of a literal), and the nullability and FIRST sets of the grammar are precomputed as columns of the table.
+
+Recognition derives over the table. The derivatives of each token are appended as rows to a copy of the table and
+compacted in place, and the rows which are no longer reachable are periodically discarded by copying the live rows.
+"""
+from array import array
+from typing import Dict, Iterable
+
+from .parsers import (
+    Alternate,
+    BaseParser,
+    Choice,
+    Concatenate,
+    DeferredReduce,
+    Empty,
+    Epsilon,
+    Literal,
+    Recurrence,
+    Reduce,
+    Sequence,
+    empty_parser,
+)
+from .token import Token
+
+__all__ = ("CompiledGrammar", "compile_grammar")
+
+# Kinds of node
+EMPTY, EPSILON, LITERAL, ALTERNATE, CONCATENATE, REFERENCE = range(6)
+
+# Rows of the shared empty and epsilon nodes
+EMPTY_ROW = 0
+EPSILON_ROW = 1
+
+_transparent_types = (Recurrence, Reduce, DeferredReduce)
+
+
+class CompiledGrammar:
+    """Node table of a grammar, in which each node is a row of the kinds, left and right columns.
+
+    The left operand of a literal is its kind id, and a reference (which only occurs in derivatives) stands for the
+    row of its left operand.
+    """
+
+    # Number of derivative rows which may be appended before the unreachable rows are discarded
+    collection_threshold = 2 ** 16
+
+    def __init__(self, kinds: array, left: array, right: array, rows: Dict[BaseParser, int], kind_ids: Dict[str, int]):
+        self.kinds = kinds
+        self.left = left
+        self.right = right
+        self.rows = rows
+        self.kind_ids = kind_ids
+
+        self.nullable = _solve_nullable(kinds, left, right)
+        self.words = len(kind_ids) // 64 + 1
+        self.firsts = _solve_firsts(kinds, left, right, self.nullable, self.words)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the columns of the table, in bytes"""
+        columns = self.kinds, self.left, self.right, self.nullable, self.firsts
+        return sum(len(c) * c.itemsize for c in columns)
+
+    def row(self, parser: BaseParser) -> int:
+        """Return the row of a parser of the grammar"""
+        try:
+            return self.rows[_target(parser)]
+        except KeyError:
+            raise ValueError(f"{parser!r} is not a parser of the compiled grammar") from None
+
+    def recognize(self, parser: BaseParser, tokens: Iterable[Token]) -> bool:
+        """Determine whether tokens are a sentence of the language of a parser of the grammar"""
+        return _Recognition(self).run(self.row(parser), tokens)
+
+
+def _target(parser: BaseParser) -> BaseParser:
+    """Follow the parsers which are transparent to recognition (e.g. recurrences, reductions and sequences of a single
+    item) to the parser which they stand for"""
+    visited = set()
+    while True:
+        parser_type = type(parser)
+        if parser_type in _transparent_types:
+            following = parser.parser
+        elif (parser_type is Sequence or parser_type is Choice) and len(parser.parsers) == 1:
+            following = parser.parsers[0]
+        else:
+            return parser
+
+        # A cycle of transparent parsers (e.g. x = x) matches nothing
+        if parser in visited:
+            return empty_parser
+        visited.add(parser)
+        parser = following
+
+
+def compile_grammar(*roots: BaseParser) -> CompiledGrammar:
+    """Lower the parsers reachable from roots into a node table, which must be complete (e.g. of a frozen Grammar)"""
+    kinds = array("B", (EMPTY, EPSILON))
+    left = array("i", (0, 0))
+    right = array("i", (0, 0))
+    rows = {}
+    kind_ids = {}
+    literal_rows = {}
+    pending = []
+
+    def append(kind: int, left_row: int = 0, right_row: int = 0) -> int:
+        kinds.append(kind)
+        left.append(left_row)
+        right.append(right_row)
+        return len(kinds) - 1
+
+    def lower(parser: BaseParser) -> int:
+        parser = _target(parser)
+        try:
+            return rows[parser]
+        except KeyError:
+            pass
+
+        parser_type = type(parser)
+        if parser_type is Empty or (parser_type is Choice and not parser.parsers):
+            result = EMPTY_ROW
+        elif parser_type is Epsilon:
+            result = EPSILON_ROW
+        elif parser_type is Literal:
+            kind_id = kind_ids.setdefault(parser.string, len(kind_ids))
+            try:
+                result = literal_rows[kind_id]
+            except KeyError:
+                result = literal_rows[kind_id] = append(LITERAL, kind_id)
+        elif parser_type is Alternate or parser_type is Choice:
+            result = append(ALTERNATE)
+            pending.append(parser)
+        elif parser_type is Concatenate or parser_type is Sequence:
+            result = append(CONCATENATE)
+            pending.append(parser)
+        else:
+            raise TypeError(f"Cannot compile {parser_type.__name__}")
+
+        rows[parser] = result
+        return result
+
+    def branch(kind: int, operands: list) -> int:
+        """Return the row of a balanced tree of the given kind over the rows of several operands"""
+        if len(operands) == 1:
+            return operands[0]
+
+        middle = len(operands) // 2
+        return append(kind, branch(kind, operands[:middle]), branch(kind, operands[middle:]))
+
+    for root in roots:
+        lower(root)
+
+    while pending:
+        parser = pending.pop()
+        result = rows[parser]
+        parser_type = type(parser)
+
+        if parser_type is Alternate or parser_type is Concatenate:
+            left[result] = lower(parser.left)
+            right[result] = lower(parser.right)
+
+        else:
+            # The first item of a sequence (or option of a choice) is the left operand of its row
+            first, *remainder = [lower(p) for p in parser.parsers]
+            left[result] = first
+            right[result] = branch(kinds[result], remainder)
+
+    return CompiledGrammar(kinds, left, right, rows, kind_ids)
+
+
+def _solve_nullable(kinds: array, left: array, right: array) -> array:
+    """Compute the nullability of every row, by Kleene iteration from non-nullable rows"""
+    nullable = array("b", bytes(len(kinds)))
+    nullable[EPSILON_ROW] = 1
+
+    changed = True
+    while changed:
+        changed = False
+        for row in range(len(kinds) - 1, EPSILON_ROW, -1):
+            if nullable[row]:
+                continue
+
+            kind = kinds[row]
+            if kind == ALTERNATE:
+                value = nullable[left[row]] or nullable[right[row]]
+            elif kind == CONCATENATE:
+                value = nullable[left[row]] and nullable[right[row]]
+            else:
+                continue
+
+            if value:
+                nullable[row] = 1
+                changed = True
+
+    return nullable
+
+
+def _solve_firsts(kinds: array, left: array, right: array, nullable: array, words: int) -> array:
+    """Compute the FIRST set of every row, as a bit set of kind ids held in words of 64 bits"""
+    firsts = [0] * len(kinds)
+    for row, kind in enumerate(kinds):
+        if kind == LITERAL:
+            firsts[row] = 1 << left[row]
+
+    changed = True
+    while changed:
+        changed = False
+        for row in range(len(kinds) - 1, EPSILON_ROW, -1):
+            kind = kinds[row]
+            if kind == ALTERNATE:
+                first = firsts[left[row]] | firsts[right[row]]
+            elif kind == CONCATENATE:
+                first = firsts[left[row]]
+                if nullable[left[row]]:
+                    first |= firsts[right[row]]
+            else:
+                continue
+
+            if first != firsts[row]:
+                firsts[row] = first
+                changed = True
+
+    mask = (1 << 64) - 1
+    return array("Q", [(first >> (64 * word)) & mask for first in firsts for word in range(words)])
+
+
+class _Recognition:
+    """State of a recognition over a compiled grammar, whose derivative rows are appended to copies of its columns"""
+
+    def __init__(self, grammar: CompiledGrammar):
+        self.grammar = grammar
+        self.kinds = array("B", grammar.kinds)
+        self.left = array("i", grammar.left)
+        self.right = array("i", grammar.right)
+        self.nullable = array("b", grammar.nullable)
+
+        # Derivatives of the grammar rows by each kind, which are shared between tokens (keyed by row * kinds + kind)
+        self.shared = {}
+        self.threshold = grammar.collection_threshold
+
+    def run(self, root: int, tokens: Iterable[Token]) -> bool:
+        kind_ids = self.grammar.kind_ids
+        grammar_size = len(self.grammar)
+
+        for token in tokens:
+            kind = kind_ids.get(token.first)
+            if kind is None:
+                return False
+
+            start = len(self.kinds)
+            root = self.derive(root, kind)
+            root = self.compact(root, start)
+
+            if root == EMPTY_ROW:
+                return False
+
+            self.solve_nullable(start)
+
+            if len(self.kinds) - grammar_size > self.threshold:
+                root = self.collect(root)
+
+        return bool(self.nullable[root])
+
+    def derive(self, root: int, kind: int) -> int:
+        """Append the rows of the derivative of a row by a kind, and return its row.
+
+        The derivative of each row is allocated before those of its children, so that cycles refer to it.
+        """
+        kinds, left, right, nullable = self.kinds, self.left, self.right, self.nullable
+        grammar = self.grammar
+        grammar_size = len(grammar)
+        firsts, words = grammar.firsts, grammar.words
+        word, bit = kind // 64, 1 << (kind % 64)
+        stride = len(grammar.kind_ids)
+
+        shared = self.shared
+        derived = {}
+        pending = []
+
+        def derivative(row: int) -> int:
+            row_kind = kinds[row]
+            while row_kind == REFERENCE:
+                row = left[row]
+                row_kind = kinds[row]
+
+            if row_kind == LITERAL:
+                return EPSILON_ROW if left[row] == kind else EMPTY_ROW
+
+            if row_kind == EMPTY or row_kind == EPSILON:
+                return EMPTY_ROW
+
+            if row < grammar_size:
+                if not firsts[row * words + word] & bit:
+                    return EMPTY_ROW
+
+                key = row * stride + kind
+                memo = shared
+            else:
+                key = row
+                memo = derived
+
+            result = memo.get(key)
+            if result is None:
+                result = memo[key] = len(kinds)
+                kinds.append(REFERENCE)
+                left.append(EMPTY_ROW)
+                right.append(EMPTY_ROW)
+                nullable.append(0)
+                pending.append((result, row))
+
+            return result
+
+        root = derivative(root)
+
+        while pending:
+            result, row = pending.pop()
+            head = derivative(left[row])
+
+            if kinds[row] == ALTERNATE:
+                kinds[result] = ALTERNATE
+                left[result] = head
+                right[result] = derivative(right[row])
+                continue
+
+            # The tail may only derive the kind if the head is skipped, which requires it to be nullable
+            if nullable[left[row]]:
+                kinds.append(CONCATENATE)
+                left.append(head)
+                right.append(right[row])
+                nullable.append(0)
+
+                kinds[result] = ALTERNATE
+                left[result] = len(kinds) - 1
+                right[result] = derivative(right[row])
+
+            elif head == EMPTY_ROW:
+                left[result] = EMPTY_ROW
+
+            else:
+                kinds[result] = CONCATENATE
+                left[result] = head
+                right[result] = right[row]
+
+        return root
+
+    def compact(self, root: int, start: int) -> int:
+        """Simplify the rows appended since start in place, in reverse order (such that the children of a row are
+        mostly compacted before it), and return the compacted row of the root"""
+        kinds, left, right = self.kinds, self.left, self.right
+
+        def resolve(row: int) -> int:
+            while kinds[row] == REFERENCE:
+                row = left[row]
+            return row
+
+        for row in range(len(kinds) - 1, start - 1, -1):
+            kind = kinds[row]
+            head = resolve(left[row])
+
+            if kind == REFERENCE:
+                target = head
+
+            else:
+                tail = resolve(right[row])
+
+                if kind == ALTERNATE:
+                    if head == EMPTY_ROW or head == tail:
+                        target = tail
+                    elif tail == EMPTY_ROW:
+                        target = head
+                    else:
+                        target = None
+
+                elif head == EMPTY_ROW or tail == EMPTY_ROW:
+                    target = EMPTY_ROW
+                elif head == EPSILON_ROW:
+                    target = tail
+                elif tail == EPSILON_ROW:
+                    target = head
+                else:
+                    target = None
+
+                if target is None:
+                    left[row] = head
+                    right[row] = tail
+                    continue
+
+            # A row which stands for itself (e.g. the derivative of x = x | y, where y does not derive the kind)
+            # matches nothing
+            kinds[row] = REFERENCE
+            left[row] = EMPTY_ROW if target == row else target
+
+        return resolve(root)
+
+    def solve_nullable(self, start: int):
+        """Compute the nullability of the rows appended since start, by Kleene iteration"""
+        kinds, left, right, nullable = self.kinds, self.left, self.right, self.nullable
+
+        changed = True
+        while changed:
+            changed = False
+            for row in range(len(kinds) - 1, start - 1, -1):
+                if nullable[row]:
+                    continue
+
+                kind = kinds[row]
+                if kind == ALTERNATE:
+                    value = nullable[left[row]] or nullable[right[row]]
+                elif kind == CONCATENATE:
+                    value = nullable[left[row]] and nullable[right[row]]
+                else:
+                    value = nullable[left[row]]
+
+                if value:
+                    nullable[row] = 1
+                    changed = True
+
+    def collect(self, root: int) -> int:
+        """Discard the derivative rows which are unreachable from the root or the shared derivatives, by copying the
+        live rows after the grammar rows. Return the new row of the root"""
+        kinds, left, right, nullable = self.kinds, self.left, self.right, self.nullable
+        grammar_size = len(self.grammar)
+
+        copied = {}
+        new_kinds = kinds[:grammar_size]
+        new_left = left[:grammar_size]
+        new_right = right[:grammar_size]
+        new_nullable = nullable[:grammar_size]
+
+        def copy(row: int) -> int:
+            while kinds[row] == REFERENCE:
+                row = left[row]
+
+            if row < grammar_size:
+                return row
+
+            try:
+                return copied[row]
+            except KeyError:
+                result = copied[row] = len(new_kinds)
+                new_kinds.append(kinds[row])
+                new_left.append(left[row])
+                new_right.append(right[row])
+                new_nullable.append(nullable[row])
+                pending.append(result)
+                return result
+
+        pending = []
+        root = copy(root)
+        shared = {key: copy(row) for key, row in self.shared.items()}
+
+        while pending:
+            row = pending.pop()
+            new_left[row] = copy(new_left[row])
+            new_right[row] = copy(new_right[row])
+
+        self.kinds, self.left, self.right, self.nullable = new_kinds, new_left, new_right, new_nullable
+        self.shared = shared
+        self.threshold = max(self.threshold, 2 * (len(new_kinds) - grammar_size))
+        return root
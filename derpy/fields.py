@@ -6,6 +6,7 @@ def __init__(self, {arg_list}):
 """
 
 _field_assignment_stmt = "self.{0} = {0}"
+_state_assignment_stmt = "{targets} = {default}"
 _repr_getter_stmt = "self.{0}"
 
 _field_repr_body = """
@@ -14,35 +15,69 @@ def __repr__(self):
 """
 
 
+def _validate_names(names: tuple, kind: str):
+    for n in names:
+        if not n.isidentifier():
+            raise ValueError(f"{kind} name {n!r} is not a valid identifier")
+        if iskeyword(n):
+            raise ValueError(f"{kind} name {n!r} is an existing Python keyword")
+
+
 class FieldMeta(type):
     """Metaclass which provides machinery to set named fields on class instance during initialisation.
-    
-    Use of this decorator automatically invokes the __slots__ mechanism
+
+    Use of this decorator automatically invokes the __slots__ mechanism. Per-instance state which is not a field may be
+    named by the state argument, whose defaults are given in the class body, and which is assigned upon initialisation.
+    A class attribute of a subclass (e.g. a constant) replaces inherited state of the same name.
     """
 
-    def __new__(metacls, name, bases, cls_dict, fields=None):
-        if fields:
-            field_names = tuple(fields.split())
-            for n in field_names:
-                if not n.isidentifier():
-                    raise ValueError(f"Field name {n!r} is not a valid identifier")
-                if iskeyword(n):
-                    raise ValueError(f"Field name {n!r} is an existing Python keyword")
+    def __new__(metacls, name, bases, cls_dict, fields=None, state=None):
+        field_names = tuple(fields.split()) if fields else ()
+        _validate_names(field_names, "Field")
+
+        state_names = tuple(state.split()) if state else ()
+        _validate_names(state_names, "State")
+
+        inherited_fields = ()
+        defaults = {}
+        for base in reversed(bases):
+            inherited_fields = getattr(base, "_fields", inherited_fields)
+            defaults.update(getattr(base, "_defaults", {}))
+
+        replaced = [n for n in defaults if n in cls_dict]
+        for n in replaced:
+            del defaults[n]
+
+        for n in state_names:
+            defaults[n] = cls_dict.pop(n, None)
+
+        all_fields = inherited_fields + field_names
+
+        if (field_names or state_names or replaced) and "__init__" not in cls_dict:
+            assignments = [_field_assignment_stmt.format(n) for n in all_fields]
 
-            arg_list = ", ".join(field_names)
-            assignment_body = "\n    ".join((_field_assignment_stmt.format(n) for n in field_names))
-            init_body = _field_init_body.format(arg_list=arg_list, assignment_body=assignment_body)
-            exec(init_body, cls_dict)
+            # State with a common default is assigned by a single (chained) assignment
+            init_globals = {}
+            targets = {}
+            for n, default in defaults.items():
+                targets.setdefault(id(default), []).append(f"self.{n}")
+                init_globals[f"_default_{id(default)}"] = default
+            for key, names in targets.items():
+                assignments.append(_state_assignment_stmt.format(targets=" = ".join(names), default=f"_default_{key}"))
 
-        else:
-            field_names = ()
+            init_body = _field_init_body.format(
+                arg_list=", ".join(all_fields), assignment_body="\n    ".join(assignments or ["pass"])
+            )
+            exec(init_body, init_globals)
+            cls_dict["__init__"] = init_globals["__init__"]
 
         # Repr definition
-        repr_str = ", ".join(f"{n}={{{_repr_getter_stmt.format(n)}!r}}" for n in field_names)
+        repr_str = ", ".join(f"{n}={{{_repr_getter_stmt.format(n)}!r}}" for n in all_fields)
         repr_body = _field_repr_body.format(cls_name=name, repr_str=repr_str)
         exec(repr_body, cls_dict)
 
-        cls_dict["__slots__"] = field_names
-        cls_dict["_fields"] = field_names
+        cls_dict["__slots__"] = tuple(cls_dict.get("__slots__", ())) + field_names + state_names
+        cls_dict["_fields"] = all_fields
+        cls_dict["_defaults"] = defaults
 
         return super().__new__(metacls, name, bases, cls_dict)
@@ -0,0 +1,607 @@
+"""Shared packed parse forests.
+
+The null parse of a parser is represented as a graph of forest nodes, rather than an eagerly expanded set of trees.
+Sub-forests are shared between every parse which contains them, and ambiguity is packed into Union nodes, so that the
+number of trees can be counted (or a single tree extracted) without enumerating the entire set.
+
+Unambiguous forests are collapsed eagerly: a Pair of two Leaves is a Leaf of a tuple, and a Mapped Leaf is a Leaf of the
+mapped value. Consequently, only the ambiguous regions of a parse are stored as packed nodes.
+
+A parse derives by token kinds (see parsers.parse_forest), so the trees of its forest hold the placeholder token_value in
+place of the value of each token. Forests which hold placeholders are open, and the reductions of their trees are
+deferred (see Applied); a Bound forest substitutes the values of the tokens for the placeholders in order, and applies
+the deferred reductions, when its trees are built.
+"""
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+import itertools
+
+from typing import Any, Callable, Dict, Iterator
+
+from .fields import FieldMeta
+
+__all__ = (
+    "Applied",
+    "Bound",
+    "Forest",
+    "Leaf",
+    "OpenLeaf",
+    "Union",
+    "Pair",
+    "Product",
+    "Mapped",
+    "Deferred",
+    "empty_forest",
+    "leaf",
+    "union",
+    "pair",
+    "product",
+    "mapped",
+    "deferred_mapped",
+    "bind",
+    "defer",
+    "token_value",
+    "token_forest",
+)
+
+
+_no_tree = object()
+
+
+class TokenValue:
+    """Placeholder for the value of a token in the trees of an open forest"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<token value>"
+
+
+token_value = TokenValue()
+
+
+_applied_tag = object()
+
+
+class Applied(tuple):
+    """Deferred application of a reduction to a tree which holds placeholders (see bind).
+
+    Trees may be deeply nested, so the application is a (tagged) tuple, which is hashed and compared without recursion
+    through Python methods
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, func: Callable, tree):
+        return tuple.__new__(cls, (_applied_tag, func, tree))
+
+    @property
+    def func(self) -> Callable:
+        return self[1]
+
+    @property
+    def tree(self) -> Any:
+        return self[2]
+
+    def __repr__(self):
+        return f"Applied(func={self[1]!r}, tree={self[2]!r})"
+
+
+def defer(func: Callable, tree) -> Any:
+    """Apply a reduction to a tree which holds placeholders.
+
+    Reductions which only arrange the trees that they are given (e.g. those of compaction) define apply_open, and are
+    applied immediately. Other reductions, which may observe the values of tokens, are deferred
+    """
+    apply_open = getattr(func, "apply_open", None)
+    if apply_open is not None:
+        return apply_open(tree)
+    return Applied(func, tree)
+
+
+class _Build(metaclass=FieldMeta, fields="size"):
+    """Instruction of bind, to build a tuple of the last size results"""
+
+
+class _Apply(metaclass=FieldMeta, fields="func"):
+    """Instruction of bind, to apply a reduction to the last result"""
+
+
+def bind(tree, tokens=()) -> Any:
+    """Return a tree with the values of tokens substituted for its placeholders (which are in the order of the tokens),
+    and its deferred reductions applied"""
+    position = 0
+    results = []
+    pending = [tree]
+
+    while pending:
+        node = pending.pop()
+        node_type = type(node)
+
+        if node is token_value:
+            results.append(tokens[position].second)
+            position += 1
+
+        elif node_type is tuple:
+            pending.append(_Build(len(node)))
+            pending.extend(reversed(node))
+
+        elif node_type is Applied:
+            pending.append(_Apply(node[1]))
+            pending.append(node[2])
+
+        elif node_type is _Build:
+            size = node.size
+            if size:
+                items = tuple(results[-size:])
+                del results[-size:]
+            else:
+                items = ()
+            results.append(items)
+
+        elif node_type is _Apply:
+            results.append(node.func(results.pop()))
+
+        else:
+            results.append(node)
+
+    return results[0]
+
+
+def _is_cyclic_value(result, cyclic_value) -> bool:
+    """Return whether the result of a fold is that of a forest without trees"""
+    return result is cyclic_value or (type(result) is type(cyclic_value) and result == cyclic_value)
+
+
+class ForestMeta(FieldMeta, ABCMeta):
+    pass
+
+
+class Forest(metaclass=ForestMeta, state="is_open"):
+    """Base class for parse forest nodes"""
+
+    # Whether the trees of the forest may hold placeholders, or deferred reductions
+    is_open = False
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_trees()
+
+    def count_trees(self) -> int:
+        """Return the number of derivations packed into this forest.
+
+        Cycles (from nullable recursive grammars) do not contribute any additional trees.
+        """
+        return self._fold("_count", 0)
+
+    def is_unambiguous(self) -> bool:
+        """Return whether the forest holds exactly one tree, and no cycles.
+
+        The trees of a cyclic forest depend upon the node at which each cycle is entered, so a forest which holds a
+        Deferred node is not unambiguous (even if it counts one tree). Otherwise, every node holds a tree, so only Union
+        nodes are ambiguous.
+        """
+        visited = set()
+        pending = [self]
+        while pending:
+            forest = pending.pop()
+            forest_type = type(forest)
+            if forest_type is Union or forest_type is Deferred or forest is empty_forest:
+                return False
+
+            if forest not in visited:
+                visited.add(forest)
+                pending.extend(forest._children())
+
+        return True
+
+    def first_tree(self) -> Any:
+        """Return the first tree in the forest, without enumerating the remainder"""
+        tree = self.first_open_tree()
+        if tree is _no_tree:
+            raise ValueError("Forest contains no trees")
+
+        return self._bind(tree) if self.is_open else tree
+
+    def first_open_tree(self) -> Any:
+        """Return the first tree in the forest, which may hold placeholders (see bind)"""
+        return self._fold("_first", _no_tree)
+
+    def iter_trees(self) -> Iterator[Any]:
+        """Lazily enumerate the trees in the forest"""
+        trees = self._iter_trees(frozenset())
+        return map(self._bind, trees) if self.is_open else trees
+
+    def trees(self) -> frozenset:
+        """Return the set of distinct trees in the forest"""
+        trees = self._fold("_trees", frozenset())
+        return frozenset(map(self._bind, trees)) if self.is_open else trees
+
+    def _bind(self, tree) -> Any:
+        """Return a tree of the forest, with its deferred reductions applied"""
+        return bind(tree)
+
+    def _fold(self, method_name: str, cyclic_value) -> Any:
+        """Evaluate a method over the forest bottom-up, using an explicit stack so that deep forests do not recurse.
+
+        Each method receives the results of the child nodes. Re-entrant references (cycles) take cyclic_value, so the
+        result of a node within a cycle depends upon where the cycle was entered. If the forest then holds no trees,
+        it is evaluated again without sharing such results (see _refold).
+        """
+        results = {}
+        pending = [(self, False)]
+
+        while pending:
+            node, is_expanded = pending.pop()
+
+            if is_expanded:
+                results[node] = getattr(node, method_name)(results)
+
+            elif node not in results:
+                results[node] = cyclic_value
+                pending.append((node, True))
+                pending.extend((child, False) for child in node._children())
+
+        result = results[self]
+        if _is_cyclic_value(result, cyclic_value) and any(type(node) is Deferred for node in results):
+            return self._refold(method_name, cyclic_value)
+        return result
+
+    def _refold(self, method_name: str, cyclic_value) -> Any:
+        """Evaluate a method over a cyclic forest, like _fold.
+
+        A node of a cycle which takes no trees only because the cycle was entered elsewhere (e.g. a forest which is
+        shared between the derivatives of a token kind) may hold trees where it is referenced from outside the cycle.
+        Such results are discarded once the cycle has been evaluated, so that every node with a (finite) tree holds one.
+        """
+        results = {self: cyclic_value}
+        # Depths of the nodes whose children are being evaluated, and of the shallowest such node upon which the (empty)
+        # result of each node depends
+        depths = {self: 0}
+        lows = {}
+        # Nodes whose results depend upon the node at each depth
+        dependents = defaultdict(list)
+        # Each frame holds a node, its children to visit, and the shallowest depth upon which its result depends
+        frames = [[self, list(self._children()), 0]]
+
+        while frames:
+            frame = frames[-1]
+            node, children, low = frame
+            if children:
+                child = children.pop()
+                if child in depths:
+                    frame[2] = min(low, depths[child])
+                elif child in lows:
+                    frame[2] = min(low, lows[child])
+                elif child not in results:
+                    depth = depths[child] = len(frames)
+                    results[child] = cyclic_value
+                    frames.append([child, list(child._children()), depth])
+                continue
+
+            frames.pop()
+            depth = depths.pop(node)
+            result = results[node] = getattr(node, method_name)(results)
+            if low < depth and _is_cyclic_value(result, cyclic_value):
+                lows[node] = low
+                dependents[low].append(node)
+                frames[-1][2] = min(frames[-1][2], low)
+
+            for dependent in dependents.pop(depth, ()):
+                del results[dependent]
+                del lows[dependent]
+
+        return results[self]
+
+    def _children(self) -> tuple:
+        return ()
+
+    @abstractmethod
+    def _count(self, counts: Dict["Forest", int]) -> int:
+        pass
+
+    @abstractmethod
+    def _first(self, firsts: Dict["Forest", Any]) -> Any:
+        pass
+
+    @abstractmethod
+    def _trees(self, trees: Dict["Forest", frozenset]) -> frozenset:
+        pass
+
+    @abstractmethod
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        pass
+
+
+class EmptyForest(Forest):
+    _singleton = None
+
+    def __new__(cls):
+        if cls._singleton is not None:
+            raise ValueError
+
+        instance = super().__new__(cls)
+        cls._singleton = instance
+        return instance
+
+    def __bool__(self) -> bool:
+        return False
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return 0
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        return _no_tree
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return frozenset()
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        return iter(())
+
+
+class Leaf(Forest, fields="value"):
+    """Forest of a single tree"""
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return 1
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        return self.value
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return frozenset((self.value,))
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        yield self.value
+
+
+class OpenLeaf(Leaf):
+    """Forest of a single tree which holds placeholders"""
+
+    is_open = True
+
+
+class Union(Forest, fields="left right"):
+    """Packed ambiguity node; the trees of both forests"""
+
+    def _children(self) -> tuple:
+        return self.left, self.right
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return counts[self.left] + counts[self.right]
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        left = firsts[self.left]
+        if left is _no_tree:
+            return firsts[self.right]
+        return left
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return trees[self.left] | trees[self.right]
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        yield from self.left._iter_trees(path)
+        yield from self.right._iter_trees(path)
+
+
+class Pair(Forest, fields="left right"):
+    """Product of two forests; each tree is a (left, right) tuple"""
+
+    def _children(self) -> tuple:
+        return self.left, self.right
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return counts[self.left] * counts[self.right]
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        left = firsts[self.left]
+        right = firsts[self.right]
+        if left is _no_tree or right is _no_tree:
+            return _no_tree
+        return left, right
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return frozenset(itertools.product(trees[self.left], trees[self.right]))
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        for left in self.left._iter_trees(path):
+            for right in self.right._iter_trees(path):
+                yield left, right
+
+
+class Product(Forest, fields="forests"):
+    """Product of several forests; each tree is a flat tuple of one tree from each forest"""
+
+    def _children(self) -> tuple:
+        return self.forests
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        count = 1
+        for forest in self.forests:
+            count *= counts[forest]
+        return count
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        tree = tuple(firsts[f] for f in self.forests)
+        if any(t is _no_tree for t in tree):
+            return _no_tree
+        return tree
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return frozenset(itertools.product(*(trees[f] for f in self.forests)))
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        return self._iter_from(0, path)
+
+    def _iter_from(self, index: int, path: frozenset) -> Iterator[tuple]:
+        if index == len(self.forests):
+            yield ()
+            return
+
+        for tree in self.forests[index]._iter_trees(path):
+            for remainder in self._iter_from(index + 1, path):
+                yield (tree,) + remainder
+
+
+class Mapped(Forest, fields="forest func"):
+    """Forest of the trees of another forest, transformed by a reduction"""
+
+    def _children(self) -> tuple:
+        return (self.forest,)
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return counts[self.forest]
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        tree = firsts[self.forest]
+        if tree is _no_tree:
+            return _no_tree
+        return self._apply(tree)
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return frozenset(map(self._apply, trees[self.forest]))
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        return map(self._apply, self.forest._iter_trees(path))
+
+    def _apply(self, tree) -> Any:
+        return defer(self.func, tree) if self.is_open else self.func(tree)
+
+
+class Deferred(Forest, fields="forest"):
+    """Placeholder for the forest of a recursive parser, which is resolved once the forest has been built. The resolved
+    forest is not known upon construction, so it is assumed to be open"""
+
+    is_open = True
+
+    def _children(self) -> tuple:
+        return (self.forest,)
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return counts[self.forest]
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        return firsts[self.forest]
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return trees[self.forest]
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        if self in path:
+            return iter(())
+
+        return self.forest._iter_trees(path | {self})
+
+
+class Bound(Forest, fields="forest tokens"):
+    """Forest of the trees of an open forest, whose placeholders are substituted by the values of tokens"""
+
+    is_open = True
+
+    def _children(self) -> tuple:
+        return (self.forest,)
+
+    def _count(self, counts: Dict[Forest, int]) -> int:
+        return counts[self.forest]
+
+    def _first(self, firsts: Dict[Forest, Any]) -> Any:
+        return firsts[self.forest]
+
+    def _trees(self, trees: Dict[Forest, frozenset]) -> frozenset:
+        return trees[self.forest]
+
+    def _iter_trees(self, path: frozenset) -> Iterator[Any]:
+        return self.forest._iter_trees(path)
+
+    def _bind(self, tree) -> Any:
+        return bind(tree, self.tokens)
+
+
+def _opened(forest: Forest) -> Forest:
+    forest.is_open = True
+    return forest
+
+
+def _leaf_type(*forests: Forest) -> type:
+    """Return the type of the leaf of the trees of several leaves"""
+    return OpenLeaf if any(type(f) is OpenLeaf for f in forests) else Leaf
+
+
+def leaf(value) -> Leaf:
+    """Create a forest of a single tree"""
+    if value is token_value:
+        return token_forest
+    return Leaf(value)
+
+
+def union(left: Forest, right: Forest) -> Forest:
+    """Create a forest of the trees of both forests"""
+    if left is empty_forest:
+        return right
+
+    if right is empty_forest:
+        return left
+
+    if type(left) in _leaf_types and type(right) is type(left) and left.value == right.value:
+        return left
+
+    forest = Union(left, right)
+    return _opened(forest) if left.is_open or right.is_open else forest
+
+
+def pair(left: Forest, right: Forest) -> Forest:
+    """Create a forest of the product of two forests"""
+    if left is empty_forest or right is empty_forest:
+        return empty_forest
+
+    if type(left) in _leaf_types and type(right) in _leaf_types:
+        return _leaf_type(left, right)((left.value, right.value))
+
+    forest = Pair(left, right)
+    return _opened(forest) if left.is_open or right.is_open else forest
+
+
+def product(forests: tuple) -> Forest:
+    """Create a forest of the product of several forests"""
+    if any(f is empty_forest for f in forests):
+        return empty_forest
+
+    if all(type(f) in _leaf_types for f in forests):
+        return _leaf_type(*forests)(tuple(f.value for f in forests))
+
+    forest = Product(forests)
+    return _opened(forest) if any(f.is_open for f in forests) else forest
+
+
+def mapped(forest: Forest, func: Callable) -> Forest:
+    """Create a forest of the trees of a forest transformed by func"""
+    if forest is empty_forest:
+        return empty_forest
+
+    is_open = forest.is_open or getattr(func, "is_open", False)
+    if type(forest) in _leaf_types:
+        if is_open:
+            return OpenLeaf(defer(func, forest.value))
+        return Leaf(func(forest.value))
+
+    return deferred_mapped(forest, func, is_open)
+
+
+def deferred_mapped(forest: Forest, func: Callable, is_open: bool = None) -> Forest:
+    """Create a forest of the trees of a forest transformed by func, which is applied only when the trees are built"""
+    if is_open is None:
+        is_open = forest.is_open or getattr(func, "is_open", False)
+
+    forest = Mapped(forest, func)
+    return _opened(forest) if is_open else forest
+
+
+_leaf_types = frozenset((Leaf, OpenLeaf))
+
+empty_forest = EmptyForest()
+
+# Forest of the tree of a token, whose value is substituted when the trees are built (see Bound)
+token_forest = OpenLeaf(token_value)
@@ -1,4 +1,5 @@
-from .parsers import Recurrence, BaseParser
+from .compiled import CompiledGrammar, compile_grammar
+from .parsers import Recurrence, BaseParser, Sequence, analyse, splice_recurrences
 
 
 class Grammar:
@@ -17,11 +18,27 @@ class Grammar:
             if parser.parser is None:
                 raise ValueError(f"{name} parser is not defined")
 
-    def freeze(self):
-        """Check all parsers are defined"""
+    def freeze(self) -> int:
+        """Check all parsers are defined, and analyse the complete grammar.
+
+        Return the number of recurrences (e.g. forward-referenced rules) which are spliced out of the grammar (see
+        splice_recurrences)
+        """
         self.validate()
         object.__setattr__(self, "_frozen", True)
 
+        rules = [v for v in vars(self).values() if isinstance(v, BaseParser)]
+        spliced = splice_recurrences(*rules)
+        analyse(*rules)
+        return spliced
+
+    def compile(self) -> CompiledGrammar:
+        """Lower the rules of the frozen grammar into a compiled node table (see derpy.compiled)"""
+        if not self._frozen:
+            raise ValueError(f"Grammar {self._name} must be frozen before it is compiled")
+
+        return compile_grammar(*(v for v in vars(self).values() if isinstance(v, BaseParser)))
+
     def extend(self, name: str) -> "Grammar":
         self.validate()
 
@@ -67,6 +84,12 @@ class Grammar:
 
         # No recurrence relation (as assignment BEFORE get)
         else:
+            if type(value) is Sequence:
+                # A rule is a single item of any sequence which uses it, rather than a chain to extend
+                recurrence = Recurrence()
+                recurrence.parser = value
+                value = recurrence
+
             object.__setattr__(self, name, value)
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 from collections import deque
 
-from ... import Grammar, lit, star, unpack, plus
+from ... import Grammar, lit, seq, star, plus
 from ...ast import iter_fields
 from ..python36 import ast
 
@@ -9,7 +9,7 @@ from ..python36 import ast
 
 
 def emit_func_def(args):
-    _, name, params, ret_type, _, body = unpack(args, 6)
+    _, name, params, ret_type, _, body = args
     decorators = ()
 
     if ret_type == "":
@@ -29,7 +29,7 @@ def emit_func_def(args):
 
 
 def emit_params(args):
-    _, typed_args, _ = unpack(args, 3)
+    _, typed_args, _ = args
     return typed_args
 
 
@@ -70,7 +70,7 @@ def emit_import_from_all(args):
 
 
 def emit_import_from_names(args):
-    alias, remainder, _ = unpack(args, 3)
+    alias, remainder, _ = args
 
     if remainder == "":
         aliases = (alias,)
@@ -82,7 +82,7 @@ def emit_import_from_names(args):
 
 
 def emit_dotted_as_names(args):
-    alias, remainder = unpack(args, 2)
+    alias, remainder = args
 
     if remainder == "":
         aliases = (alias,)
@@ -94,12 +94,12 @@ def emit_dotted_as_names(args):
 
 
 def emit_import_from_names_paren(args):
-    _, name_args, _ = unpack(args, 3)
+    _, name_args, _ = args
     return name_args
 
 
 def emit_import_from(args):
-    _, module, _, submodule = unpack(args, 4)
+    _, module, _, submodule = args
     return ast.ImportFrom(module.module, submodule.aliases, module.level)
 
 
@@ -109,7 +109,7 @@ def emit_import(args):
 
 
 def emit_nonlocal(args):
-    _, name, names = unpack(args, 3)
+    _, name, names = args
     if names != "":
         other_names = tuple(n[1] for n in names)
     else:
@@ -118,7 +118,7 @@ def emit_nonlocal(args):
 
 
 def emit_global(args):
-    _, name, names = unpack(args, 3)
+    _, name, names = args
     if names != "":
         other_names = tuple(n[1] for n in names)
     else:
@@ -127,7 +127,7 @@ def emit_global(args):
 
 
 def emit_assert(args):
-    _, test, msg = unpack(args, 3)
+    _, test, msg = args
     if msg != "":
         _, message = msg
     else:
@@ -136,7 +136,7 @@ def emit_assert(args):
 
 
 def emit_lambda_def(args):
-    _, varargs, _, test = unpack(args, 4)
+    _, varargs, _, test = args
     return ast.LambdaDef(varargs, test)
 
 
@@ -148,35 +148,38 @@ def emit_return(args):
 
 
 def emit_if(args):
-    _, condition, _, body, elifs, else_ = unpack(args, 6)
+    _, condition, _, body, elifs, else_ = args
 
     # Unpack the else statements
     if else_ == "":
         orelse = ()
     else:
-        _, _, orelse = unpack(else_, 3)
+        _, _, orelse = else_
 
     # Now deal with elifs
     if elifs != "":
         for elem in reversed(elifs):
-            _, else_condition, _, else_body = unpack(elem, 4)
+            _, else_condition, _, else_body = elem
             orelse = (ast.If(else_condition, else_body, orelse),)
 
     return ast.If(condition, body, orelse)
 
 
 def emit_while(args):
-    _, condition, _, body, else_ = unpack(args, 5)
+    _, condition, _, body, else_ = args
     if else_ == "":
         else_stmt = None
     else:
-        else_stmt = else_
+        _, _, else_stmt = else_
     return ast.While(condition, body, else_stmt)
 
 
 def emit_for(args):
-    _, target, _, iterable, _, body, optelse = unpack(args, 7)
-    else_ = () if optelse == "" else optelse
+    _, target, _, iterable, _, body, optelse = args
+    if optelse == "":
+        else_ = ()
+    else:
+        _, _, else_ = optelse
 
     if isinstance(target, tuple):
         target = ast.Tuple(target)
@@ -185,7 +188,7 @@ def emit_for(args):
 
 
 def emit_with(args):
-    _, with_item, with_items, _, body = unpack(args, 5)
+    _, with_item, with_items, _, body = args
     if with_items == "":
         all_items = (with_item,)
     else:
@@ -202,12 +205,12 @@ def emit_with_item(args):
 
 
 def emit_try_except_else_finally(args):
-    excepts_and_bodies, opt_else_raw, opt_finally_raw = unpack(args, 3)
+    excepts_and_bodies, opt_else_raw, opt_finally_raw = args
 
     except_handlers_list = []
 
     for element in excepts_and_bodies:
-        clause, _, body = unpack(element, 3)
+        clause, _, body = element
         _, opt_alias = clause
 
         type_ = None
@@ -223,24 +226,24 @@ def emit_try_except_else_finally(args):
     if opt_else_raw == "":
         orelse = ()
     else:
-        _, _, orelse = unpack(opt_else_raw, 3)
+        _, _, orelse = opt_else_raw
 
     if opt_finally_raw == "":
         finalbody = ()
     else:
-        _, _, finalbody = unpack(opt_finally_raw, 3)
+        _, _, finalbody = opt_finally_raw
 
     return ast.tryexceptelsefinally(except_handlers, orelse, finalbody)
 
 
 def emit_try_finally(args):
-    _, _, body = unpack(args, 3)
+    _, _, body = args
 
     return ast.tryfinally(body)
 
 
 def emit_try(args):
-    _, _, body, following = unpack(args, 4)
+    _, _, body, following = args
     # Try = stmt.subclass('Try', 'body handlers orelse finalbody')
     if isinstance(following, ast.tryexceptelsefinally):
         return ast.Try(body, following.handlers, following.orelse, following.finalbody)
@@ -275,7 +278,7 @@ def emit_tfpdef(args):
 
 
 def emit_varargs(args):
-    _, vararg, any_opt_ass, kwarg = unpack(args, 4)
+    _, vararg, any_opt_ass, kwarg = args
     if vararg == "":
         vararg = None
 
@@ -304,7 +307,7 @@ def emit_varargs(args):
 
 
 def emit_first(args):
-    opt_ass_first, remaining_opt_ass, opt_remainder = unpack(args, 3)
+    opt_ass_first, remaining_opt_ass, opt_remainder = args
 
     if remaining_opt_ass == "":
         args_optional_values = (opt_ass_first,)
@@ -351,7 +354,7 @@ def emit_first(args):
 
 
 def emit_simple_stmt(args):
-    first_stmt, remainder, opt_colon, newline = unpack(args, 4)
+    first_stmt, remainder, opt_colon, newline = args
     if remainder != "":
         all_stmts = (first_stmt,) + tuple(s for c, s in remainder)
     else:
@@ -364,12 +367,12 @@ def emit_test_left(args):
     or_test, opt_if = args
     if opt_if == "":
         return or_test
-    _, cond, _, orelse = unpack(opt_if, 4)
+    _, cond, _, orelse = opt_if
     return ast.IfExp(cond, or_test, orelse)
 
 
 def emit_test_list_star_expr(args):
-    test_or_star, opt_following_test_or_star, opt_trailing_comma = unpack(args, 3)
+    test_or_star, opt_following_test_or_star, opt_trailing_comma = args
     if opt_following_test_or_star != "":
         _, exprs = zip(*opt_following_test_or_star)
         all_exprs = (test_or_star,) + exprs
@@ -378,7 +381,7 @@ def emit_test_list_star_expr(args):
 
 
 def emit_test_list(args):
-    first, remainder, opt_trail = unpack(args, 3)
+    first, remainder, opt_trail = args
     if remainder == "":
         return first
     _, following = zip(*remainder)
@@ -386,7 +389,7 @@ def emit_test_list(args):
 
 
 def emit_expr_augassign(args):
-    test_list, augassign, yield_or_test_list = unpack(args, 3)
+    test_list, augassign, yield_or_test_list = args
     if isinstance(test_list, ast.Tuple):
         raise SyntaxError("Invalid multiple assignments for augassign")
 
@@ -565,7 +568,7 @@ def emit_id(value):
 
 
 def emit_arg_list(args):
-    arg, opt_args, opt_comma = unpack(args, 3)
+    arg, opt_args, opt_comma = args
     if opt_args == "":
         return (arg,)
     commas, following_args = zip(*opt_args)
@@ -573,7 +576,7 @@ def emit_arg_list(args):
 
 
 def emit_subscript_list(args):
-    subscript, opt_subscripts, opt_comma = unpack(args, 3)
+    subscript, opt_subscripts, opt_comma = args
     if opt_subscripts == "":
         return subscript
     commas, following_subscripts = zip(*opt_subscripts)
@@ -591,7 +594,7 @@ def emit_starred(args):
 
 
 def emit_nl_indent_one_plus_dedent_suite(args):
-    _, _, list_of_stmts, _ = unpack(args, 4)
+    _, _, list_of_stmts, _ = args
     stmts = []
     for n in list_of_stmts:
         if isinstance(n, ast.AST):
@@ -630,18 +633,18 @@ def split_args_list_to_arg_kwargs(arg_list):
 
 
 def emit_class_def(args):
-    _, cls_name, opt_args, _, body = unpack(args, 5)
+    _, cls_name, opt_args, _, body = args
     if opt_args == "":
         bases = ()
         keywords = ()
     else:
-        _, arg_list, _ = unpack(opt_args, 3)
+        _, arg_list, _ = opt_args
         bases, keywords = split_args_list_to_arg_kwargs(arg_list)
     return ast.ClassDef(cls_name, bases, keywords, body, ())
 
 
 def emit_keyword(args):
-    name, _, value = unpack(args, 3)
+    name, _, value = args
     if not isinstance(name, ast.Name):
         raise SyntaxError()
     return ast.keyword(name.id, value)
@@ -656,7 +659,7 @@ def emit_arg(args):
 
 
 def emit_comp_for(args):
-    _, expr_list, _, or_test, opt_if_or_for = unpack(args, 5)
+    _, expr_list, _, or_test, opt_if_or_for = args
     if opt_if_or_for == "":
         opt_if_or_for = None
 
@@ -667,7 +670,7 @@ def emit_comp_for(args):
 
 
 def emit_comp_if(args):
-    _, cond, opt = unpack(args, 3)
+    _, cond, opt = args
     if opt == "":
         opt = None
 
@@ -702,7 +705,7 @@ def emit_atom_expr(args):
 
 
 def emit_expr_list(args):
-    root_expr, opt_com_del_exprs, opt_trail = unpack(args, 3)
+    root_expr, opt_com_del_exprs, opt_trail = args
     if opt_com_del_exprs == "":
         return root_expr
 
@@ -723,14 +726,14 @@ def emit_lit(lits):
 
 
 def emit_list_comp(args):
-    _, body, _ = unpack(args, 3)
+    _, body, _ = args
     if body == "":
         return ast.List(())
     return body
 
 
 def emit_generator_comp(args):
-    _, body, _ = unpack(args, 3)
+    _, body, _ = args
     if body == "":
         return ast.Tuple(())
 
@@ -746,7 +749,7 @@ def emit_generator_comp(args):
 
 
 def emit_trailer_call(args):
-    _, body, _ = unpack(args, 3)
+    _, body, _ = args
     if body == "":
         arguments, keywords = (), ()
     else:
@@ -755,7 +758,7 @@ def emit_trailer_call(args):
 
 
 def emit_trailer_subscript(args):
-    _, all_subscripts, _ = unpack(args, 3)
+    _, all_subscripts, _ = args
     return ast.Subscript(None, all_subscripts)
 
 
@@ -817,7 +820,7 @@ def emit_test_list_comp(args):
 
 
 def emit_dict_comp(args):
-    _, body, _ = unpack(args, 3)
+    _, body, _ = args
     if body == "":
         return ast.Dict((), ())
     return body
@@ -832,7 +835,7 @@ def emit_list_exprs(args):
 
 
 def emit_dict_pair(args):
-    key, _, value = unpack(args, 3)
+    key, _, value = args
     return ast.keyword(key, value)
 
 
@@ -878,13 +881,13 @@ def emit_decorated(args):
 
 
 def emit_decorator(args):
-    _, name_str, opt_calls, _ = unpack(args, 4)
+    _, name_str, opt_calls, _ = args
 
     name = ast.Name(name_str)
     if opt_calls == "":
         return name
 
-    _, arg_list, _ = unpack(opt_calls, 3)
+    _, arg_list, _ = opt_calls
     args, keywords = split_args_list_to_arg_kwargs(arg_list)
     return ast.Call(name, args, keywords)
 
@@ -906,7 +909,7 @@ def emit_alias(args):
 
 
 def emit_slice(args):
-    lower, _, upper, opt_slice_op = unpack(args, 4)
+    lower, _, upper, opt_slice_op = args
     if lower == "":
         lower = None
 
@@ -946,15 +949,16 @@ def generate_args_list(tfpdef):
     tfpdef_opt_ass = tfpdef & ~(lit("=") & p.test)
     tfpdef_kwargs = lit("**") & tfpdef
     return (
-        (
-            tfpdef_opt_ass
-            & star(lit(",") & tfpdef_opt_ass)
-            & ~(
+        # seq() keeps tfpdef_opt_ass as a single item, whereas & would extend its sequence
+        seq(
+            tfpdef_opt_ass,
+            star(lit(",") & tfpdef_opt_ass),
+            ~(
                 lit(",")
                 & ~(
                     (lit("*") & ~tfpdef & star(lit(",") & tfpdef_opt_ass) & ~(lit(",") & tfpdef_kwargs)) | tfpdef_kwargs
                 )
-            )
+            ),
         )
         >> emit_first
         | (lit("*") & ~tfpdef & star(lit(",") & tfpdef_opt_ass) & ~(lit(",") & tfpdef_kwargs)) >> emit_varargs
@@ -2,27 +2,79 @@ import token
 import tokenize
 from io import StringIO
 from keyword import iskeyword
+from mmap import mmap, ACCESS_READ
+from os import fstat
 from tokenize import generate_tokens
 
 from ast import literal_eval
 from derpy import Token, BaseTokenizer
+from derpy.tokenizer import decode_chunks
 
-from typing import Iterable, Callable
+from typing import Iterable, Iterator, Callable, Union
 from os import PathLike
 
 
+def terminated_lines(readline: Callable[[], bytes]) -> Iterator[bytes]:
+    """Yield the lines of a source, as though a newline were appended to it"""
+    for line in iter(readline, b""):
+        if not line.endswith(b"\n"):
+            yield line + b"\n"
+            return
+
+        yield line
+
+    yield b"\n"
+
+
+def stream_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the lines of chunks of text, as though a newline were appended to the text"""
+    parts = []
+    for chunk in chunks:
+        start = 0
+        end = chunk.find("\n")
+        while end >= 0:
+            parts.append(chunk[start : end + 1])
+            yield "".join(parts)
+            parts.clear()
+
+            start = end + 1
+            end = chunk.find("\n", start)
+
+        parts.append(chunk[start:])
+
+    parts.append("\n")
+    yield "".join(parts)
+
+
 class PythonTokenizer(BaseTokenizer):
     def tokenize_text(self, source: str) -> Iterable[Token]:
         string_io = StringIO(source + "\n")
         return self.tokenize_readline(string_io.readline)
 
     def tokenize_file(self, file_path: PathLike) -> Iterable[Token]:
-        with open(file_path) as f:
-            string_io = StringIO(f.read() + "\n")
-        return self.tokenize_readline(string_io.readline)
-
-    def tokenize_readline(self, readline: Callable[[], str]) -> Iterable[Token]:
-        for tok_info in generate_tokens(readline):
+        """Tokenize the lines of a file through a read-only memory map, rather than reading it into a string"""
+        with open(file_path, "rb") as f:
+            # Empty files cannot be mapped
+            if not fstat(f.fileno()).st_size:
+                yield from self.tokenize_text("")
+                return
+
+            with mmap(f.fileno(), 0, access=ACCESS_READ) as source:
+                # As tokenize_text, a newline is appended to the source
+                yield from self.tokenize_bytes_readline(terminated_lines(source.readline).__next__)
+
+    def tokenize_stream(self, chunks: Iterable[Union[str, bytes]]) -> Iterable[Token]:
+        """Tokenize chunks of text, or of UTF-8 encoded bytes, line by line"""
+        return self.tokenize_readline(stream_lines(decode_chunks(chunks)).__next__)
+
+    def tokenize_bytes_readline(self, readline: Callable[[], bytes]) -> Iterable[Token]:
+        """Tokenize encoded lines, which are decoded by their detected encoding (see tokenize.tokenize)"""
+        return self.tokenize_readline(readline, tokenize.tokenize)
+
+    def tokenize_readline(
+        self, readline: Callable[[], str], generate: Callable[[Callable], Iterable] = generate_tokens
+    ) -> Iterable[Token]:
+        for tok_info in generate(readline):
             if tok_info.type == token.NAME:
                 value = tok_info.string
                 if iskeyword(value):
@@ -55,6 +107,9 @@ class PythonTokenizer(BaseTokenizer):
             elif tok_info.type == tokenize.COMMENT:
                 continue
 
+            elif tok_info.type == tokenize.ENCODING:
+                continue
+
             elif tok_info.type == tokenize.NL:
                 continue
 
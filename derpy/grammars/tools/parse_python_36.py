@@ -3,7 +3,7 @@ from pathlib import Path
 from time import time
 
 from derpy.ast import to_string
-from derpy import parse
+from derpy import TokenBuffer, parse
 from derpy.grammars.python36 import p, PythonTokenizer
 
 
@@ -14,7 +14,7 @@ def main():
     args = parser.parse_args()
 
     tokeniser = PythonTokenizer()
-    tokens = list(tokeniser.tokenize_file(args.filepath))
+    tokens = TokenBuffer.from_tokens(tokeniser.tokenize_file(args.filepath))
     print("Parsing: {} with {} tokens".format(args.filepath, len(tokens)))
 
     start_time = time()
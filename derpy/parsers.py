@@ -15,29 +15,58 @@ captures the progress of the parsing process. In other words, taking the derivat
  
 """
 from abc import ABCMeta, abstractmethod
-from itertools import product
+from types import GeneratorType
 
-from typing import Iterable, Callable
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable
+from weakref import WeakValueDictionary
 
-from .caching import cached_property, memoized_n
+from .caching import create_cache, on_session_end, pin, session
 from .fields import FieldMeta
-from .token import Token
+from .forest import (
+    Bound,
+    Deferred,
+    Forest,
+    Leaf,
+    OpenLeaf,
+    defer,
+    deferred_mapped,
+    empty_forest,
+    leaf,
+    mapped,
+    pair,
+    product,
+    token_value,
+    union,
+)
+from .token import Token, intern_kind
 from .tuple import unpack
 
+if TYPE_CHECKING:
+    from .compaction import CompactionPolicy
+
 __all__ = (
     "Alternate",
+    "Choice",
     "Concatenate",
+    "Sequence",
     "Recurrence",
     "Reduce",
     "Literal",
     "Token",
     "empty_parser",
     "empty_string",
+    "graph_size",
+    "kind_token",
     "plus",
+    "solve_nullability",
     "star",
     "opt",
     "parse",
+    "parse_forest",
     "lit",
+    "seq",
+    "set_hash_consing",
+    "splice_recurrences",
 )
 
 
@@ -47,11 +76,21 @@ class OperatorMixin:
     As parsers may operate upon their own types, these methods are defined later.
     """
 
-    def __and__(self, other) -> "Concatenate":
-        return cat(self, other)
+    __slots__ = ()
+
+    def __and__(self, other) -> "Sequence":
+        # Extend the sequence of a chain of & operators, so that it produces a flat tuple
+        if type(self) is Sequence:
+            return Sequence(self.parsers + (other,))
 
-    def __or__(self, other) -> "Alternate":
-        return alt(self, other)
+        return seq(self, other)
+
+    def __or__(self, other) -> "Choice":
+        # Alternation is associative, so chains of | operators build a single choice
+        parsers = self.parsers if type(self) is Choice else (self,)
+        if type(other) is Choice:
+            return Choice(parsers + other.parsers)
+        return Choice(parsers + (other,))
 
     def __getitem__(self, item) -> "BaseParser":
         if item is Ellipsis:
@@ -74,147 +113,570 @@ class OperatorMixin:
 
 
 class BaseParserMeta(FieldMeta, ABCMeta):
-    pass
+    def __call__(cls, *args, **kwargs):
+        if _hash_consing:
+            return _construct_interned(cls, args, kwargs)
+        return super().__call__(*args, **kwargs)
+
+
+# Evaluation of a parser which yields the child parsers that it depends upon, receives their results, and returns its
+# own. Traversals are driven with explicit stacks (see _compact and _null_forest), so that the depth of the
+# parser graph is not limited by the Python call stack
+Traversal = Generator["BaseParser", Any, Any]
+
+
+# Structurally equal parsers, when hash-consing is enabled (see set_hash_consing)
+_interned_parsers = WeakValueDictionary()
+_hash_consing = False
+
+
+def _construct_interned(cls: BaseParserMeta, args: tuple, kwargs: dict) -> "BaseParser":
+    construct = super(BaseParserMeta, cls).__call__
+
+    # Placeholders (e.g. Alternate(None, None)) are completed after construction, so cannot be shared
+    if cls not in _interned_types or kwargs or None in args:
+        return construct(*args, **kwargs)
+
+    key = (cls, *args)
+    try:
+        return _interned_parsers[key]
+    except KeyError:
+        parser = _interned_parsers[key] = construct(*args)
+        return parser
+    except TypeError:
+        return construct(*args)
+
+
+def set_hash_consing(enabled: bool):
+    """Share structurally equal Alternate, Concatenate, Sequence, Reduce, Delta, Epsilon and Literal parsers upon
+    construction.
+
+    Parsers are equal if they are of the same type, and their fields are identical parsers or equal values. Hash-consing
+    only affects the parsers which are constructed whilst it is enabled.
+    """
+    global _hash_consing
+    _hash_consing = enabled
+
+    if not enabled:
+        _interned_parsers.clear()
+
+
+# Compacted form of a parser which is its own compacted form. A parser does not reference itself, so that derived parsers
+# are released by reference counting, rather than by the cyclic garbage collector
+_final = object()
+
 
+class BaseParser(OperatorMixin, metaclass=BaseParserMeta, state="_nullable _compacted"):
+    # Parsers are weakly referenced by the pinned set and the hash-consing table
+    __slots__ = ("__weakref__",)
+
+    # Nullability, where it is known (see solve_nullability)
+    _nullable = None
+    # Compacted form, where it is known (see _compact), or _final
+    _compacted = None
 
-class BaseParser(OperatorMixin, metaclass=BaseParserMeta):
     @abstractmethod
     def derive(self, token: Token) -> "BaseParser":
         pass
 
     @abstractmethod
-    def derive_null(self) -> frozenset:
+    def derive_null(self) -> Forest:
+        pass
+
+    @abstractmethod
+    def is_nullable(self) -> bool:
+        pass
+
+    @abstractmethod
+    def _first(self, firsts: Dict["BaseParser", frozenset]) -> frozenset:
+        """Return the set of token kinds which may begin a sentence, given the sets of the child parsers"""
         pass
 
+    def _children(self) -> tuple:
+        return ()
+
     def compact(self) -> "BaseParser":
-        return self._compact(set())
+        """Return the compacted form of this parser.
+
+        Compacted forms are final, so successive compactions (e.g. after each token) only rewrite the new parsers.
+        """
+        compacted = self._compacted
+        if compacted is not None:
+            return self if compacted is _final else compacted
+
+        return _compact(self)
 
-    def _compact(self, seen: set) -> "BaseParser":
+    def _is_final(self) -> bool:
+        """Return whether this parser is compacted, and is its own compacted form"""
+        return self._compacted is _final
+
+    def _as_final(self) -> "BaseParser":
+        """Mark a parser which a rewrite builds of compacted parsers as compacted, so that it is not rewritten in turn
+        (unless it is shared by hash-consing, and already compacted)"""
+        if self._compacted is None:
+            self._compacted = _final
+        return self
+
+    def _rewrite(self, seen: set) -> "BaseParser":
+        """Return a simpler, equivalent parser (which is compacted in turn), or a traversal which yields the children
+        to compact (upon the first visit of this parser) and returns it"""
         seen.add(self)
         return self
 
+    def _derive_null(self) -> Forest:
+        """Return the null forest of this parser, or a traversal which yields the children whose forests it requires"""
+        return self.derive_null()
+
+
+# Parsers whose derivative memos are set, which are reset at the end of a session (see forget_derivatives)
+_memoized_parsers = []
+
+# Memo of the Epsilon of the last token which a literal matched
+_matched_token = None
+_matched_epsilon = None
+
+
+@on_session_end
+def forget_derivatives():
+    """Reset the derivative memos of parsers, such that they no longer retain derivatives (and their descendants).
+
+    The derivatives of analysed parsers remain cached for subsequent parses (see caching.session).
+    """
+    global _matched_token, _matched_epsilon
+
+    for parser in _memoized_parsers:
+        parser._derived_token = parser._derivative = parser._derivatives = None
+    _memoized_parsers.clear()
+
+    _matched_token = _matched_epsilon = None
 
-class LazyDerivative(BaseParser, fields="parser token"):
+
+class LazyDerivative(BaseParser, fields="parser token", state="_derivative"):
     """Lazy derivative evaluation of derivative of a parser w.r.t a given token.
     Partially avoids non-terminating recursion.
     """
 
-    def _compact(self, seen: set) -> BaseParser:
-        return self.derivative._compact(seen)
+    _derivative = None
+
+    def _rewrite(self, seen: set) -> BaseParser:
+        return self._resolve()
 
-    @cached_property
+    @property
     def derivative(self) -> BaseParser:
-        return self.parser._derive(self.token)
+        derivative = self._derivative
+        if derivative is None:
+            parser = self.parser
+            # Deriving the lazy children of a parser evaluates them, so these are evaluated beforehand (see _evaluate)
+            if parser._compacted is None and parser._first_set is None:
+                _evaluate(parser)
+
+            derivative = self._derivative = parser._derive(self.token)
+        return derivative
+
+    def _resolve(self) -> BaseParser:
+        """Return the first derivative in the chain of lazy derivatives from this parser which is not lazy.
+        A chain which returns to a lazy derivative (e.g. deriving x = x | y by a token which y rejects) matches nothing.
+        """
+        parser = self.derivative
+        if type(parser) is not LazyDerivative:
+            return parser
+
+        chain = {self}
+        while type(parser) is LazyDerivative:
+            if parser in chain:
+                return empty_parser
+            chain.add(parser)
+            parser = parser.derivative
+        return parser
 
     def derive(self, token: Token) -> BaseParser:
-        return self.derivative.derive(token)
+        return self._resolve().derive(token)
+
+    def derive_null(self) -> Forest:
+        return _null_forest(self)
+
+    def _derive_null(self) -> Traversal:
+        return (yield self._resolve())
+
+    def is_nullable(self) -> bool:
+        return self._resolve().is_nullable()
+
+    def _children(self) -> tuple:
+        return (self.derivative,)
 
-    def derive_null(self) -> BaseParser:
-        return self.derivative.derive_null()
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return firsts[self.derivative]
 
 
-class FixedPoint(BaseParser):
+class FixedPoint(BaseParser, state="_null_set _first_set _derived_token _derivative _derivatives"):
     """Delays derivative evaluation to avoid non-terminating recursion"""
 
     _null_set = None
+    _first_set = None
+
+    # Memo of the last derivative, which avoids hashing the token whilst a token is derived
+    _derived_token = None
+    _derivative = None
+    # Memo of the derivatives by every token
+    _derivatives = None
 
     @abstractmethod
     def _derive(self, token: Token) -> BaseParser:
         pass
 
     @abstractmethod
-    def _derive_null(self) -> BaseParser:
+    def _derive_null(self) -> Traversal:
         pass
 
-    @memoized_n
-    def derive(self, token: Token) -> LazyDerivative:
-        return LazyDerivative(self, token)
+    @abstractmethod
+    def _is_nullable(self) -> bool:
+        pass
+
+    def derive(self, token: Token) -> BaseParser:
+        if token is self._derived_token:
+            return self._derivative
+
+        if self._first_set is not None:
+            # Parsers with a known FIRST set (see analyse) cannot derive tokens of any other kind
+            if token.first in self._first_set:
+                derivative = _derive_memoized(self, token, _shared_derivatives, (self, token))
+            else:
+                derivative = empty_parser
+
+        else:
+            derivatives = self._derivatives
+            if derivatives is None:
+                derivatives = self._derivatives = {}
+                _memoized_parsers.append(self)
+
+            derivative = _derive_memoized(self, token, derivatives, token)
+
+        self._derived_token = token
+        self._derivative = derivative
+        return derivative
 
-    def derive_null(self) -> frozenset:
-        """A stupid way to calculate the fixed point of the function"""
+    def derive_null(self) -> Forest:
         if self._null_set is not None:
             return self._null_set
 
-        new_set = frozenset()
+        return _null_forest(self)
 
-        while True:
-            self._null_set = new_set
-            new_set = self._derive_null()
-
-            if self._null_set == new_set:
-                return self._null_set
+    def is_nullable(self) -> bool:
+        if self._nullable is None:
+            solve_nullability(self)
+        return self._nullable
 
 
 class Alternate(FixedPoint, fields="left right"):
-    def _compact(self, seen: set) -> BaseParser:
+    def _rewrite(self, seen: set) -> Traversal:
         if self not in seen:
             seen.add(self)
-            self.left = self.left._compact(seen)
-            self.right = self.right._compact(seen)
+            self.left = yield self.left
+            self.right = yield self.right
+
+        left, right = self.left, self.right
+        if left is empty_parser or left is right:
+            return right
+
+        elif right is empty_parser or _has_branch(left, right):
+            return left
+
+        elif type(left) is Epsilon and type(right) is Epsilon:
+            return Epsilon(union(left.forest, right.forest))
+
+        return self
+
+    def _derive(self, token: Token) -> BaseParser:
+        left = self.left.derive(token)
+        right = self.right.derive(token)
+
+        if left is empty_parser:
+            return right
+
+        if right is empty_parser:
+            return left
+
+        return self.__class__(left, right)
+
+    def _derive_null(self) -> Traversal:
+        return union((yield self.left), (yield self.right))
+
+    def _is_nullable(self) -> bool:
+        return self.left.is_nullable() or self.right.is_nullable()
+
+    def _children(self) -> tuple:
+        return self.left, self.right
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return firsts[self.left] | firsts[self.right]
+
+
+# Depth to which parsers are compared by _equivalent
+_equivalence_depth = 8
+
 
-        if self.left is empty_parser:
-            return self.right
+def _equivalent(left: BaseParser, right: BaseParser, depth: int = _equivalence_depth) -> bool:
+    """Return whether parsers are structurally equal (of the same type, with equivalent children and equal values, e.g.
+    reductions) to the given depth, such that they parse the same trees"""
+    if left is right:
+        return True
 
-        elif self.right is empty_parser:
-            return self.left
+    # Only parsers whose fields determine them may be equal (e.g. unlike recurrences)
+    cls = type(left)
+    if type(right) is not cls or cls not in _interned_types or not depth:
+        return False
 
+    depth -= 1
+    for name in cls._fields:
+        left_value, right_value = getattr(left, name), getattr(right, name)
+        if left_value is right_value:
+            continue
+
+        if isinstance(left_value, BaseParser):
+            if not _equivalent(left_value, right_value, depth):
+                return False
+
+        # The items of a sequence
+        elif type(left_value) is tuple and cls is Sequence:
+            if len(left_value) != len(right_value):
+                return False
+            for left_item, right_item in zip(left_value, right_value):
+                if not _equivalent(left_item, right_item, depth):
+                    return False
+
+        elif not left_value == right_value:
+            return False
+
+    return True
+
+
+def _has_branch(alternate: BaseParser, parser: BaseParser) -> bool:
+    """Return whether an alternation of several parsers (e.g. the derivative of a choice) has a branch which is
+    equivalent to parser"""
+    # The left spine of a recursive alternation may be cyclic, so each alternation is visited once
+    visited = set()
+    while type(alternate) is Alternate:
+        if alternate in visited:
+            return False
+        visited.add(alternate)
+        if _equivalent(alternate.right, parser):
+            return True
+        alternate = alternate.left
+    return _equivalent(alternate, parser)
+
+
+class Choice(FixedPoint, fields="parsers", state="_index"):
+    """Alternation of several parsers, which derives only the parsers that may begin with the kind of the token.
+
+    The parsers are indexed by their FIRST sets when the choice is first derived, so the grammar must be complete.
+    """
+
+    _index = None
+
+    def _rewrite(self, seen: set) -> BaseParser:
+        # Choices belong to the grammar, rather than to a derivative, so are never rewritten
+        seen.add(self)
         return self
 
-    def _derive(self, token: Token) -> "Alternate":
-        return self.__class__(self.left.derive(token), self.right.derive(token))
+    def _derive(self, token: Token) -> BaseParser:
+        if self._index is None:
+            _build_choice_indices(first_sets(self))
+
+        derivative = empty_parser
+        for parser in self._index.get(token.first, ()):
+            branch = parser.derive(token)
+
+            if branch is empty_parser:
+                continue
+
+            derivative = branch if derivative is empty_parser else Alternate(derivative, branch)
+
+        return derivative
+
+    def _derive_null(self) -> Traversal:
+        forest = empty_forest
+        for parser in self.parsers:
+            forest = union(forest, (yield parser))
+        return forest
+
+    def _is_nullable(self) -> bool:
+        return any(p.is_nullable() for p in self.parsers)
 
-    def _derive_null(self) -> frozenset:
-        left_branch = self.left.derive_null()
-        right_branch = self.right.derive_null()
+    def _children(self) -> tuple:
+        return self.parsers
 
-        return left_branch | right_branch
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return frozenset().union(*(firsts[p] for p in self.parsers))
 
 
 class Concatenate(FixedPoint, fields="left right"):
-    def _compact(self, seen: set) -> BaseParser:
+    def _rewrite(self, seen: set) -> Traversal:
         if self not in seen:
             seen.add(self)
-            self.left = self.left._compact(seen)
-            self.right = self.right._compact(seen)
+            self.left = yield self.left
+            self.right = yield self.right
 
         if self.left is empty_parser or self.right is empty_parser:
             return empty_parser
 
-        if type(self.left) is Epsilon and self.left.size == 1:
-            result_set = set(self.left.derive_null())
-            result = result_set.pop()
-            assert not result_set
+        if type(self.left) is Epsilon and type(self.right) is Epsilon:
+            return Epsilon(pair(self.left.forest, self.right.forest))
 
-            def reduction(token: Token):
-                return result, token
+        if type(self.left) is Epsilon and type(self.left.forest) in _leaf_types:
+            return Reduce(self.right, PairAfter.of(self.left.forest))
 
-            return Reduce(self.right, reduction)
+        if type(self.left) is Epsilon and self.left.forest.is_unambiguous():
+            # Defer evaluation of an unambiguous prefix (e.g. from a DeferredReduce) until the trees are built. The tree
+            # of a cyclic forest depends upon where it is entered, so these are kept as a concatenation
+            return DeferredReduce(self.right, Prefix(self.left.forest))
 
-        if type(self.right) is Epsilon and self.right.size == 1:
-            result_set = set(self.right.derive_null())
-            result = result_set.pop()
-            assert not result_set
+        if type(self.right) is Epsilon and type(self.right.forest) in _leaf_types:
+            return Reduce(self.left, PairBefore.of(self.right.forest))
 
-            def reduction(token: Token):
-                return token, result
+        return self
 
-            return Reduce(self.left, reduction)
+    def _derive(self, token: Token) -> BaseParser:
+        cls = self.__class__
+        left = self.left.derive(token)
 
-        return self
+        # The right parser may only match the token if the left parser is skipped, which requires it to be nullable
+        if not self.left.is_nullable():
+            return empty_parser if left is empty_parser else cls(left, self.right)
+
+        right = self.right.derive(token)
+
+        # Omit branches which cannot match (e.g. pruned by FIRST sets), rather than building them only to compact them
+        if right is empty_parser:
+            return empty_parser if left is empty_parser else cls(left, self.right)
+
+        # A skipped Epsilon (e.g. of several trees) records its own trees
+        skipped = _skipped(self.left)
+        if left is empty_parser:
+            return cls(skipped, right)
+
+        return Alternate(cls(left, self.right), cls(skipped, right))
+
+    def _derive_null(self) -> Traversal:
+        return pair((yield self.left), (yield self.right))
+
+    def _is_nullable(self) -> bool:
+        return self.left.is_nullable() and self.right.is_nullable()
+
+    def _children(self) -> tuple:
+        return self.left, self.right
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        if self.left.is_nullable():
+            return firsts[self.left] | firsts[self.right]
+        return firsts[self.left]
+
+
+class Sequence(FixedPoint, fields="parsers"):
+    """Concatenation of several parsers, whose parse trees are flat tuples of one tree from each parser"""
+
+    def _rewrite(self, seen: set) -> Traversal:
+        if self not in seen:
+            seen.add(self)
+            parsers = []
+            for parser in self.parsers:
+                parsers.append((yield parser))
+            self.parsers = tuple(parsers)
+
+        parsers = self.parsers
+        if empty_parser in parsers:
+            return empty_parser
 
-    def _derive(self, token: Token) -> Alternate:
+        # Move the trees of parsed (leading) items into a reduction of the remaining items
+        i = 0
+        while i < len(parsers) and type(parsers[i]) is Epsilon and type(parsers[i].forest) in _leaf_types:
+            i += 1
+
+        if not i:
+            first = parsers[0]
+            if (
+                isinstance(first, Reduce)
+                and type(first.parser) is Sequence
+                and all(p._is_final() for p in parsers + (first.parser,))
+            ):
+                return self._reassociate(first)
+
+            return self
+
+        prefix = product(tuple(p.forest for p in parsers[:i]))
+        remainder = parsers[i:]
+
+        if not remainder:
+            return Epsilon(prefix) if prefix.is_open else Epsilon.from_value(prefix.value)
+
+        if len(remainder) == 1:
+            return Reduce(remainder[0], Prepend.of(prefix))
+
+        return Reduce(self.__class__(remainder), Extend.of(prefix))
+
+    def _reassociate(self, first: "Reduce") -> "Reduce":
+        """Return the reduction of a sequence of the first item of a leading (reduced) sequence, and the remaining items.
+
+        Each derivative of nested brackets (e.g. "((x))") leads a sequence with the reduced sequence of the previous
+        derivative, so that a token is otherwise derived through every level of nesting. The sequences which are built
+        are of compacted parsers, and are not compacted again, so that a cyclic sequence is reassociated only once.
+        """
+        cls = self.__class__
+        items = first.parser.parsers
+        remainder = cls(items[1:] + self.parsers[1:])._as_final()
+        sequence = cls((items[0], remainder))._as_final()
+
+        # Deferral of the leading reduction applies to the combination
+        reduce_cls = DeferredReduce if isinstance(first, DeferredReduce) else Reduce
+        return reduce_cls(sequence, Reassociate(first.func, len(items) - 1))
+
+    def _derive(self, token: Token) -> BaseParser:
         cls = self.__class__
-        return Alternate(cls(self.left.derive(token), self.right), cls(Delta(self.left), self.right.derive(token)))
+        parsers = self.parsers
+
+        # Each item may consume the token if all of the preceding items are nullable
+        first = parsers[0].derive(token)
+        derivative = empty_parser if first is empty_parser else cls((first,) + parsers[1:])
+        skipped = ()
+
+        for i in range(1, len(parsers)):
+            if not parsers[i - 1].is_nullable():
+                break
+
+            skipped += (_skipped(parsers[i - 1]),)
+
+            item = parsers[i].derive(token)
+            if item is empty_parser:
+                continue
+
+            branch = cls(skipped + (item,) + parsers[i + 1 :])
+            derivative = branch if derivative is empty_parser else Alternate(derivative, branch)
+
+        return derivative
+
+    def _derive_null(self) -> Traversal:
+        forests = []
+        for parser in self.parsers:
+            forests.append((yield parser))
+        return product(tuple(forests))
 
-    def _derive_null(self) -> frozenset:
-        left_branch = self.left.derive_null()
-        right_branch = self.right.derive_null()
+    def _is_nullable(self) -> bool:
+        return all(p.is_nullable() for p in self.parsers)
 
-        return frozenset(product(left_branch, right_branch))
+    def _children(self) -> tuple:
+        return self.parsers
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        first = frozenset()
+        for parser in self.parsers:
+            first |= firsts[parser]
+            if not parser.is_nullable():
+                break
+        return first
 
 
 class Empty(BaseParser):
     _singleton = None
+    _nullable = False
 
     def __new__(cls):
         if cls._singleton is not None:
@@ -227,111 +689,855 @@ class Empty(BaseParser):
     def derive(self, token: Token) -> "Empty":
         return empty_parser
 
-    def derive_null(self) -> frozenset:
+    def derive_null(self) -> Forest:
+        return empty_forest
+
+    def is_nullable(self) -> bool:
+        return False
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
         return frozenset()
 
 
-class Epsilon(BaseParser, fields="_trees"):
-    def __new__(cls, trees: frozenset):
-        if not type(trees) is frozenset:
-            raise ValueError(trees)
+class Epsilon(BaseParser, fields="forest"):
+    _nullable = True
 
-        if not trees:
+    def __new__(cls, forest: Forest):
+        if not isinstance(forest, Forest):
+            raise ValueError(forest)
+
+        if forest is empty_forest:
             return empty_parser
 
         return super().__new__(cls)
 
     @classmethod
     def from_value(cls, value) -> "Epsilon":
-        as_set = frozenset((value,))
-        return cls(as_set)
-
-    @property
-    def size(self) -> int:
-        return len(self._trees)
+        if not _hash_consing:
+            return cls(leaf(value))
+
+        # Leaves are compared by identity, so equal values are interned here
+        key = (cls, type(value), value)
+        try:
+            return _interned_parsers[key]
+        except KeyError:
+            parser = _interned_parsers[key] = type.__call__(cls, leaf(value))
+            return parser
+        except TypeError:
+            return cls(leaf(value))
 
     def derive(self, token: Token) -> Empty:
         return empty_parser
 
-    def derive_null(self) -> frozenset:
-        return self._trees
+    def derive_null(self) -> Forest:
+        return self.forest
+
+    def is_nullable(self) -> bool:
+        return True
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return frozenset()
 
 
 class Delta(BaseParser, fields="parser"):
     """Used to keep a record of skipped parse trees"""
 
-    def _compact(self, seen: set) -> Epsilon:
+    def _rewrite(self, seen: set) -> BaseParser:
+        if not self.parser.is_nullable():
+            return empty_parser
+
         return Epsilon(self.parser.derive_null())
 
     def derive(self, token: Token) -> Empty:
         return empty_parser
 
-    def derive_null(self) -> BaseParser:
-        return self.parser.derive_null()
+    def derive_null(self) -> Forest:
+        return _null_forest(self)
+
+    def _derive_null(self) -> Traversal:
+        return (yield self.parser)
+
+    def is_nullable(self) -> bool:
+        return self.parser.is_nullable()
+
+    def _children(self) -> tuple:
+        return (self.parser,)
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return frozenset()
+
+
+# Records of the skipped analysed parsers, whose (compacted) forms are shared between derivatives
+_shared_deltas = create_cache()
+
 
+def _skipped(parser: BaseParser) -> BaseParser:
+    """Return the record of the trees of a nullable parser which is skipped by a derivative"""
+    if type(parser) is Epsilon:
+        return parser
 
-class Recurrence(FixedPoint):
+    if not isinstance(parser, FixedPoint) or parser._first_set is None:
+        return Delta(parser)
+
+    try:
+        return _shared_deltas[parser]
+    except KeyError:
+        delta = _shared_deltas[parser] = Delta(parser)
+        return delta
+
+
+class Recurrence(FixedPoint, state="parser"):
     parser = None
 
-    def _compact(self, seen) -> BaseParser:
-        return self.parser._compact(seen)
+    def _rewrite(self, seen: set) -> BaseParser:
+        # A cycle of recurrences (e.g. the mirror of a rule which only reduces itself) matches nothing, and would
+        # otherwise be rewritten without end
+        parser = self.parser
+        visited = {self}
+        while type(parser) is Recurrence:
+            if parser in visited:
+                return empty_parser
+            visited.add(parser)
+            parser = parser.parser
+        return parser
 
     def _derive(self, token: Token) -> BaseParser:
         return self.parser.derive(token)  # .compact()
 
-    def _derive_null(self) -> frozenset:
-        return self.parser.derive_null()
+    def _derive_null(self) -> Traversal:
+        return (yield self.parser)
+
+    def _is_nullable(self) -> bool:
+        return self.parser.is_nullable()
+
+    def _children(self) -> tuple:
+        return (self.parser,)
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return firsts[self.parser]
+
+
+class Composition(metaclass=FieldMeta, fields="inner outer", state="is_open"):
+    """Reduction which applies inner, and then outer, to a parse tree.
+
+    Compacting nested reductions (e.g. of a long repetition) builds deep chains of compositions, so these are evaluated
+    with an explicit stack rather than recursively.
+    """
+
+    def __init__(self, inner: Callable, outer: Callable):
+        self.inner = inner
+        self.outer = outer
+        # Whether either reduction holds placeholders (see forest.defer)
+        self.is_open = getattr(inner, "is_open", False) or getattr(outer, "is_open", False)
+
+    def __call__(self, tree):
+        return self._apply(tree, _call)
+
+    def apply_open(self, tree):
+        return self._apply(tree, defer)
+
+    def _apply(self, tree, apply: Callable):
+        pending = [self]
+
+        while pending:
+            func = pending.pop()
+
+            if type(func) is Composition:
+                pending.append(func.outer)
+                pending.append(func.inner)
+            else:
+                tree = apply(func, tree)
+
+        return tree
+
+
+class Reassociate(metaclass=FieldMeta, fields="func size", state="is_open"):
+    """Reduction of the trees of a reassociated sequence (see Sequence._reassociate), which applies func to the first
+    tree and the first size trees of the remainder, and follows the result with the other trees of the remainder"""
+
+    def __init__(self, func: Callable, size: int):
+        self.func = func
+        self.size = size
+        self.is_open = getattr(func, "is_open", False)
+
+    def __call__(self, tree):
+        return self._apply(tree, _call)
+
+    def apply_open(self, tree):
+        return self._apply(tree, defer)
+
+    def _apply(self, tree, apply: Callable):
+        first, remainder = tree
+        size = self.size
+        return (apply(self.func, (first,) + remainder[:size]),) + remainder[size:]
+
+
+def _call(func: Callable, tree):
+    return func(tree)
+
+
+class Prefix(metaclass=FieldMeta, fields="forest"):
+    """Reduction which pairs the tree of an unambiguous forest with a parse tree"""
+
+    @property
+    def is_open(self) -> bool:
+        return self.forest.is_open
+
+    def __call__(self, tree):
+        return self.forest.first_open_tree(), tree
+
+    apply_open = __call__
+
+
+def _identical_values(left, right) -> bool:
+    """Return whether values are equal and of the same types (unlike 1 and True), such that they form equal trees"""
+    if type(left) is not type(right):
+        return False
+
+    if type(left) is tuple:
+        return len(left) == len(right) and all(map(_identical_values, left, right))
+
+    return left == right
+
+
+class ValueReduction:
+    """Reduction of a parse tree with a known value, which compares equal to reductions with identical values, such
+    that their reduce parsers may be shared (see set_hash_consing).
+
+    The value is arranged with the tree, but not observed, so the reduction applies to trees which hold placeholders
+    (see forest.defer)
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, forest: Forest) -> "ValueReduction":
+        """Return the reduction of the value of a leaf, which is open if the leaf is"""
+        reduction = cls(forest.value)
+        reduction.is_open = forest.is_open
+        return reduction
+
+    def apply_open(self, tree):
+        return self(tree)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and _identical_values(self.value, other.value)
+
+    def __hash__(self):
+        return hash((type(self), self.value))
+
+
+class PairAfter(ValueReduction, metaclass=FieldMeta, fields="value", state="is_open"):
+    def __call__(self, tree):
+        return self.value, tree
+
+
+class PairBefore(ValueReduction, metaclass=FieldMeta, fields="value", state="is_open"):
+    def __call__(self, tree):
+        return tree, self.value
+
+
+class Prepend(ValueReduction, metaclass=FieldMeta, fields="value", state="is_open"):
+    def __call__(self, tree):
+        return self.value + (tree,)
+
+
+class Extend(ValueReduction, metaclass=FieldMeta, fields="value", state="is_open"):
+    def __call__(self, trees: tuple):
+        return self.value + trees
 
 
 class Reduce(FixedPoint, fields="parser func"):
-    def _compact(self, seen: set) -> BaseParser:
+    def _rewrite(self, seen: set) -> Traversal:
         if self not in seen:
             seen.add(self)
-            self.parser = self.parser._compact(seen)
+            self.parser = yield self.parser
 
         if self.parser is empty_parser:
             return empty_parser
 
-        elif isinstance(self.parser, self.__class__):
-            sub_reduction = self.parser
-            inner = sub_reduction.func
-            outer = self.func
-
-            def combination(token: Token):
-                return outer(inner(token))
+        elif type(self.parser) is Epsilon:
+            return Epsilon(self._reduce(self.parser.forest))
 
-            combination.__qualname__ = f"{inner} >> {outer})"
-            return self.__class__(sub_reduction.parser, combination)
+        elif isinstance(self.parser, Reduce):
+            sub_reduction = self.parser
+            # Deferral of either reduction applies to the combination
+            cls = DeferredReduce if isinstance(sub_reduction, DeferredReduce) else self.__class__
+            return cls(sub_reduction.parser, Composition(sub_reduction.func, self.func))
 
         else:
             return self
 
-    def _derive(self, token: Token) -> "Reduce":
-        return self.__class__(self.parser.derive(token), self.func)
+    def _derive(self, token: Token) -> BaseParser:
+        derivative = self.parser.derive(token)
+        if derivative is empty_parser:
+            return empty_parser
+
+        return self.__class__(derivative, self.func)
 
-    def _derive_null(self) -> frozenset:
-        return frozenset(map(self.func, self.parser.derive_null()))
+    def _derive_null(self) -> Traversal:
+        return self._reduce((yield self.parser))
+
+    def _reduce(self, forest: Forest) -> Forest:
+        """Return the forest of the reduced trees of a forest"""
+        return mapped(forest, self.func)
+
+    def _is_nullable(self) -> bool:
+        return self.parser.is_nullable()
+
+    def _children(self) -> tuple:
+        return (self.parser,)
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return firsts[self.parser]
+
+
+class DeferredReduce(Reduce):
+    """Reduction which is applied only when the trees of the parse forest are built.
+
+    Used where the reduction is costly, and may otherwise be evaluated for every parse prefix (e.g. flattening a
+    repetition)
+    """
+
+    def _reduce(self, forest: Forest) -> Forest:
+        if forest is empty_forest:
+            return empty_forest
+
+        return deferred_mapped(forest, self.func)
 
 
 class Literal(BaseParser, fields="string"):
+    _nullable = False
+
+    def __init__(self, string: str):
+        # Token kinds are interned, so that they are compared by identity
+        self.string = intern_kind(string)
+        self._compacted = None
+
     def derive(self, token: Token) -> BaseParser:
-        return Epsilon.from_value(token.second) if token.first == self.string else empty_parser
+        global _matched_token, _matched_epsilon
+
+        if token.first is not self.string:
+            return empty_parser
+
+        # The literals which match a token share its Epsilon
+        if token is not _matched_token:
+            _matched_epsilon = Epsilon.from_value(token.second)
+            _matched_token = token
+        return _matched_epsilon
+
+    def derive_null(self) -> Forest:
+        return empty_forest
+
+    def is_nullable(self) -> bool:
+        return False
+
+    def _first(self, firsts: Dict[BaseParser, frozenset]) -> frozenset:
+        return frozenset((self.string,))
 
-    def derive_null(self) -> frozenset:
-        return frozenset()
+
+def _derivative_owner(key: tuple) -> BaseParser:
+    return key[0]
+
+
+# Derivatives of analysed parsers by (parser, token), which are shared between parses (see caching.session)
+_shared_derivatives = create_cache(_derivative_owner)
+
+# Placeholder of a derivative (or null forest) which is being evaluated
+_deriving = object()
+
+# Number of derivatives which are being evaluated eagerly, and its limit, beyond which they are deferred (as lazy
+# derivatives, which are evaluated with an explicit stack) so that the depth of the parser graph is not limited by the
+# Python call stack
+_derive_depth = 0
+_eager_depth_limit = 16
+
+
+def _derive_memoized(parser: FixedPoint, token: Token, memo: dict, key) -> BaseParser:
+    """Return the memoized derivative of a fixed point.
+
+    Derivatives are evaluated eagerly, and only a parser which is derived again whilst its derivative is evaluated (a
+    cycle) allocates a lazy derivative, which is resolved once the evaluation is complete.
+    """
+    global _derive_depth
+
+    try:
+        derivative = memo[key]
+    except KeyError:
+        pass
+    else:
+        if derivative is _deriving:
+            derivative = memo[key] = LazyDerivative(parser, token)
+        return derivative
+
+    if _derive_depth >= _eager_depth_limit:
+        derivative = memo[key] = LazyDerivative(parser, token)
+        return derivative
+
+    memo[key] = _deriving
+    _derive_depth += 1
+    try:
+        # Deriving the lazy children of a parser evaluates them, so these are evaluated beforehand (see _evaluate)
+        if parser._compacted is None and parser._first_set is None:
+            _evaluate(parser)
+
+        derivative = parser._derive(token)
+    finally:
+        _derive_depth -= 1
+
+    placeholder = memo[key]
+    if placeholder is not _deriving:
+        placeholder._derivative = derivative
+    memo[key] = derivative
+    return derivative
+
+
+def _compact(parser: BaseParser) -> BaseParser:
+    """Compact a parser, driving the rewrites of the parser graph with an explicit stack"""
+    seen = set()
+    # Parsers whose rewrites are suspended upon their children (parser, rewrite, is_provisional), where rewrite is None
+    # once the rewritten form of the parser is being compacted
+    frames = []
+
+    while True:
+        # Visit the parser, unless it is already compacted
+        result = parser._compacted
+        if result is _final:
+            result = parser
+        rewritten = None
+        if result is None:
+            # Within a cycle, a parser may be revisited before its children are compacted
+            provisional = parser in seen
+            rewritten = parser._rewrite(seen)
+            if type(rewritten) is GeneratorType:
+                frames.append((parser, rewritten, provisional))
+                rewritten = None
+
+        # Return results to the suspended rewrites, until one yields a child to compact
+        while True:
+            if rewritten is not None:
+                if provisional:
+                    result = rewritten
+                elif rewritten is parser:
+                    parser._compacted = _final
+                    result = parser
+                elif rewritten not in parser._children() and not _is_settled(rewritten, seen):
+                    # A parser built by the rewrite is compacted by the next pass which reaches it, if it references a
+                    # parser whose compaction is incomplete (e.g. a cyclic reduction, whose merged reduction would
+                    # reference it again without end)
+                    parser._compacted = result = rewritten
+                else:
+                    frames.append((parser, None, False))
+                    parser = rewritten
+                    break
+
+                rewritten = None
+
+            if not frames:
+                return result
+
+            parser, rewrite, provisional = frames[-1]
+            if rewrite is None:
+                frames.pop()
+                parser._compacted = result
+                continue
+
+            try:
+                child = rewrite.send(result)
+            except StopIteration as stop:
+                frames.pop()
+                rewritten = stop.value
+            else:
+                result = child._compacted
+                if result is _final:
+                    result = child
+                elif result is None:
+                    parser = child
+                    break
+
+
+def _is_settled(parser: BaseParser, seen: set) -> bool:
+    """Return whether the children of a parser are compacted (final), or not yet visited by the current pass"""
+    for child in parser._children():
+        compacted = child._compacted
+        if compacted is not _final and (compacted is not None or child in seen):
+            return False
+    return True
+
+
+def _null_forest(parser: BaseParser) -> Forest:
+    """Derive the null forest of a parser, driving the traversal of the parser graph with an explicit stack"""
+    # Parsers whose forests are suspended upon their children (parser, traversal)
+    frames = []
+
+    while True:
+        traversal = None
+        if isinstance(parser, FixedPoint):
+            forest = parser._null_set
+            if forest is None:
+                if not parser.is_nullable():
+                    forest = parser._null_set = empty_forest
+                else:
+                    parser._null_set = _deriving
+                    traversal = parser._derive_null()
+
+            elif forest is _deriving:
+                # Recursive references to this parser share the forest through a placeholder
+                forest = parser._null_set = Deferred(empty_forest)
+        else:
+            forest = parser._derive_null()
+            if type(forest) is GeneratorType:
+                traversal = forest
+
+        if traversal is not None:
+            frames.append((parser, traversal))
+            forest = None
+
+        while frames:
+            parser, traversal = frames[-1]
+            try:
+                parser = traversal.send(forest)
+            except StopIteration as stop:
+                frames.pop()
+                forest = stop.value
+                if isinstance(parser, FixedPoint):
+                    deferred = parser._null_set
+                    if deferred is not _deriving:
+                        if forest is deferred:
+                            forest = empty_forest
+                        deferred.forest = forest
+                    parser._null_set = forest
+            else:
+                break
+        else:
+            return forest
+
+
+def _evaluate(parser: BaseParser):
+    """Evaluate the lazy derivatives which are (transitively) children of a parser, with an explicit stack.
+
+    Lazy children only exist until the derived graph is compacted (compacted and analysed parsers have none), e.g. if
+    several tokens are derived without compaction. Deriving them then evaluates a chain of derivatives, one per token.
+    """
+    pending = list(parser._children())
+
+    while pending:
+        derivative = pending[-1]
+        if type(derivative) is not LazyDerivative or derivative._derivative is not None:
+            pending.pop()
+            continue
+
+        # Evaluate the lazy children of the derived parser before the derivative itself
+        parser = derivative.parser
+        if parser._compacted is None and parser._first_set is None:
+            for child in parser._children():
+                if type(child) is LazyDerivative and child._derivative is None:
+                    pending.append(child)
+
+        if pending[-1] is derivative:
+            pending.pop()
+            derivative._derivative = parser._derive(derivative.token)
+
+
+def first_sets(*roots: BaseParser) -> Dict[BaseParser, frozenset]:
+    """Compute the set of token kinds which may begin a sentence of each parser reachable from roots"""
+    parsers = list(roots)
+    reached = set(roots)
+    for parser in parsers:
+        for child in parser._children():
+            if child not in reached:
+                reached.add(child)
+                parsers.append(child)
+
+    # Kleene iteration from empty sets, visiting children (which are mostly discovered later) first
+    firsts = dict.fromkeys(parsers, frozenset())
+    parsers.reverse()
+    changed = True
+    while changed:
+        changed = False
+        for parser in parsers:
+            first = parser._first(firsts)
+            if first != firsts[parser]:
+                firsts[parser] = first
+                changed = True
+
+    return firsts
+
+
+def _solve_component(component: list) -> int:
+    """Find the least fixed point of nullability for a strongly connected component whose successors are solved.
+    Return the number of parsers evaluated"""
+    variables = [p for p in component if isinstance(p, FixedPoint)]
+    members = set(component)
+    dependents = {p: [] for p in component}
+    for parser in component:
+        for child in parser._children():
+            if child in members:
+                dependents[child].append(parser)
+
+    # Parsers start as non-nullable, and are only re-evaluated when a parser they depend upon becomes nullable
+    for parser in variables:
+        parser._nullable = False
+
+    worklist = variables[::-1]
+    pending = set(variables)
+    evaluations = 0
+
+    while worklist:
+        parser = worklist.pop()
+        pending.discard(parser)
+        evaluations += 1
+
+        if not parser._is_nullable():
+            continue
+
+        parser._nullable = True
+
+        # Notify dependent fixed points, looking through transparent parsers (e.g. LazyDerivative, Delta)
+        visited = {parser}
+        to_visit = list(dependents[parser])
+        while to_visit:
+            dependent = to_visit.pop()
+            if dependent in visited:
+                continue
+            visited.add(dependent)
+
+            if not isinstance(dependent, FixedPoint):
+                to_visit.extend(dependents[dependent])
+            elif not dependent._nullable and dependent not in pending:
+                pending.add(dependent)
+                worklist.append(dependent)
+
+    return evaluations
+
+
+def solve_nullability(root: BaseParser) -> int:
+    """Compute the nullability of every unsolved parser reachable from root, returning the number of evaluations.
+
+    The strongly connected components of the unsolved parser graph are found with (a non-recursive form of) Tarjan's
+    algorithm. As they are found in reverse topological order, each component is solved exactly once, after the
+    components it depends upon.
+    """
+    if root._nullable is not None:
+        return 0
+
+    evaluations = 0
+    indices = {root: 0}
+    low_links = {root: 0}  # Only holds parsers which are on the stack
+    stack = [root]
+    work = [(root, iter(root._children()))]
+
+    self_dependent = set()
+
+    while work:
+        parser, children = work[-1]
+        for child in children:
+            if child._nullable is not None:
+                continue
+
+            if child is parser:
+                self_dependent.add(parser)
+                continue
+
+            if child not in indices:
+                indices[child] = low_links[child] = len(indices)
+                stack.append(child)
+                work.append((child, iter(child._children())))
+                break
+
+            if child in low_links and indices[child] < low_links[parser]:
+                low_links[parser] = indices[child]
+
+        else:
+            work.pop()
+            low_link = low_links[parser]
+            if work:
+                caller = work[-1][0]
+                if low_link < low_links[caller]:
+                    low_links[caller] = low_link
+
+            if low_link != indices[parser]:
+                continue
+
+            # Acyclic parsers, whose children are all solved, need no iteration
+            if stack[-1] is parser and parser not in self_dependent:
+                del low_links[stack.pop()]
+                if isinstance(parser, FixedPoint):
+                    parser._nullable = parser._is_nullable()
+                    evaluations += 1
+                continue
+
+            position = len(stack) - 1
+            while stack[position] is not parser:
+                position -= 1
+
+            component = stack[position:]
+            del stack[position:]
+            for member in component:
+                del low_links[member]
+
+            evaluations += _solve_component(component)
+
+    return evaluations
+
+
+def graph_size(parser: BaseParser, limit: int = None) -> int:
+    """Count the parsers reachable from parser which are not analysed (e.g. the derived parsers of a parse, excluding the
+    frozen grammar). If a limit is given, counting stops once it is exceeded"""
+    parsers = [parser]
+    reached = {parser}
+    for parser in parsers:
+        for child in parser._children():
+            if child not in reached and not (isinstance(child, FixedPoint) and child._first_set is not None):
+                reached.add(child)
+                parsers.append(child)
+
+        if limit is not None and len(reached) > limit:
+            break
+
+    return len(reached)
+
+
+def _recurrence_successors(parser: BaseParser) -> list:
+    """Return the recurrences which are reachable from the children of a parser through parsers which are not
+    recurrences"""
+    successors = []
+    pending = list(parser._children())
+    visited = set()
+    while pending:
+        parser = pending.pop()
+        if parser in visited:
+            continue
+        visited.add(parser)
+
+        if type(parser) is Recurrence:
+            successors.append(parser)
+        else:
+            pending.extend(parser._children())
+
+    return successors
+
+
+def splice_recurrences(*roots: BaseParser) -> int:
+    """Replace the references to recurrences (e.g. forward-declared grammar rules) within the graph reachable from
+    roots by the parsers which they stand for, returning the number of recurrences which are no longer referenced.
+
+    As other parsers are constructed from existing parsers, every cycle of the graph passes through a recurrence. A
+    recurrence is retained upon each cycle of the recurrences (those which a depth-first search reaches from its
+    successors), so that the graph only cycles through recurrences. The graph must be complete (e.g. a frozen Grammar).
+    """
+    starts = []
+    for root in roots:
+        starts.extend((root,) if type(root) is Recurrence else _recurrence_successors(root))
+
+    # Depth-first search of the recurrences, where is_active holds whether a recurrence is upon the stack
+    is_active = {}
+    retained = set()
+    for start in starts:
+        if start in is_active:
+            continue
+
+        is_active[start] = True
+        work = [(start, iter(_recurrence_successors(start)))]
+        while work:
+            recurrence, successors = work[-1]
+            for successor in successors:
+                active = is_active.get(successor)
+                if active is None:
+                    is_active[successor] = True
+                    work.append((successor, iter(_recurrence_successors(successor))))
+                    break
+
+                if active:
+                    retained.add(successor)
+            else:
+                work.pop()
+                is_active[recurrence] = False
+
+    spliced = set()
+
+    def resolve(value):
+        while type(value) is Recurrence and value not in retained:
+            spliced.add(value)
+            value = value.parser
+        return value
+
+    parsers = list(roots)
+    reached = set(roots)
+    for parser in parsers:
+        if type(parser) is Recurrence:
+            parser.parser = resolve(parser.parser)
+        else:
+            for name in parser._fields:
+                value = getattr(parser, name)
+                if type(value) is tuple:
+                    setattr(parser, name, tuple(map(resolve, value)))
+                elif type(value) is Recurrence:
+                    setattr(parser, name, resolve(value))
+
+        for child in parser._children():
+            if child not in reached:
+                reached.add(child)
+                parsers.append(child)
+
+    return len(spliced)
+
+
+def _build_choice_indices(firsts: Dict[BaseParser, frozenset]):
+    """Index the parsers of every choice by the token kinds that may begin them"""
+    for parser in firsts:
+        if type(parser) is Choice and parser._index is None:
+            index = {}
+            for option in parser.parsers:
+                for kind in firsts[option]:
+                    index.setdefault(kind, []).append(option)
+
+            parser._index = {kind: tuple(options) for kind, options in index.items()}
+
+
+def analyse(*roots: BaseParser):
+    """Compute the nullability and FIRST set of every parser reachable from roots.
+
+    Afterwards, these parsers derive tokens which cannot begin them directly to empty_parser. As the results are
+    stored upon the parsers, the graph must be complete (e.g. a frozen Grammar). The parsers are also pinned, so that
+    their derivatives are retained between parse sessions.
+    """
+    firsts = first_sets(*roots)
+    pin(*firsts)
+
+    for parser, first in firsts.items():
+        solve_nullability(parser)
+
+        if isinstance(parser, FixedPoint):
+            parser._first_set = first
+
+    _build_choice_indices(firsts)
 
 
 # Macro API #####################################################
-def plus(parser: BaseParser) -> Reduce:
-    """Kleene plus (1+) parser"""
+def _repetition(parser: BaseParser) -> Recurrence:
+    """Repetition parser, producing nested (first, remainder) pairs which end with an empty string"""
+    recurrence = Recurrence()
+    recurrence.parser = Alternate(empty_string, Concatenate(parser, recurrence))  # recurrence = ~(parser & recurrence)
+    return recurrence
+
+
+def _red_repeat(args):
+    """Flatten the nested pairs of a repetition into a tuple, in linear time"""
+    items = []
+    while args != "":
+        item, args = args
+        items.append(item)
+
+    if not items:
+        return ""
+
+    return tuple(items)
 
-    def red_one_plus(args):
-        first, remainder = args
-        if remainder == "":
-            return (first,)
-        return (first,) + remainder
 
-    return Reduce(Concatenate(parser, star(parser)), red_one_plus)
+def plus(parser: BaseParser) -> DeferredReduce:
+    """Kleene plus (1+) parser"""
+    return DeferredReduce(Concatenate(parser, _repetition(parser)), _red_repeat)
 
 
 def arr(parser: BaseParser, n: int):
@@ -347,20 +1553,9 @@ def arr(parser: BaseParser, n: int):
     return Reduce(p, red_array)
 
 
-def star(parser: BaseParser) -> Recurrence:
+def star(parser: BaseParser) -> DeferredReduce:
     """Kleene star (0+) parser"""
-
-    def red_repeat(args):
-        first, remainder = args
-        if remainder == "":
-            return (first,)
-        return (first,) + remainder
-
-    recurrence = Recurrence()
-    recurrence.parser = Alternate(
-        empty_string, Reduce(Concatenate(parser, recurrence), red_repeat)
-    )  # recurrence = ~(parser & recurrence)
-    return recurrence
+    return DeferredReduce(_repetition(parser), _red_repeat)
 
 
 def least(parser: BaseParser, n: int):
@@ -393,6 +1588,14 @@ def cat(left: BaseParser, right: BaseParser) -> Concatenate:
     return Concatenate(left, right)
 
 
+def seq(*parsers: BaseParser) -> Sequence:
+    """Create a Sequence parser"""
+    if not parsers:
+        raise ValueError("Sequence requires at least one parser")
+
+    return Sequence(parsers)
+
+
 def alt(left: BaseParser, right: BaseParser) -> Alternate:
     """Create an Alternate parser"""
     return Alternate(left, right)
@@ -408,16 +1611,54 @@ def rec() -> Recurrence:
     return Recurrence()
 
 
-def parse(parser: BaseParser, tokens: Iterable[Token]) -> frozenset:
-    for i, token in enumerate(tokens):
-        parser = parser.derive(token)
-        parser = parser.compact()
+def kind_token(token: Token) -> Token:
+    """Return the (shared) token of the kind of a token, whose value is a placeholder (see forest.token_value)"""
+    try:
+        return _kind_tokens[token.first]
+    except KeyError:
+        result = _kind_tokens[token.first] = Token(token.first, token_value)
+        return result
+
+
+def parse_forest(parser: BaseParser, tokens: Iterable[Token], policy: "CompactionPolicy" = None) -> Forest:
+    """Parse tokens (e.g. a list, or a TokenBuffer) into a shared packed parse forest.
+
+    The parser derives by the kinds of the tokens (see kind_token), so that derivatives are shared between tokens of
+    the same kind (e.g. every identifier), and between parses. The values of the tokens are substituted, and the
+    reductions which observe them applied, when the trees of the forest are built (see forest.Bound).
+
+    The derivatives of the input are cached for the duration of the parse (see caching.session). Each derivative is
+    compacted, unless a policy schedules compaction (see compaction.CompactionPolicy)
+    """
+    consumed = []
+    with session():
+        for token in tokens:
+            consumed.append(token)
+            parser = parser.derive(kind_token(token))
+            if policy is None:
+                parser = parser.compact()
+            else:
+                parser = policy.derived(parser)
+
+            if parser is empty_parser:
+                break
+
+        forest = parser.derive_null()
+
+    if forest is empty_forest:
+        return forest
+    return Bound(forest, consumed)
+
+
+def parse(parser: BaseParser, tokens: Iterable[Token], policy: "CompactionPolicy" = None) -> frozenset:
+    """Parse tokens into the set of distinct parse trees"""
+    return parse_forest(parser, tokens, policy).trees()
 
-        if parser is empty_parser:
-            break
 
-    return parser.derive_null()
+_kind_tokens = {}
+_leaf_types = frozenset((Leaf, OpenLeaf))
 
+_interned_types = frozenset((Alternate, Concatenate, Sequence, Reduce, DeferredReduce, Delta, Epsilon, Literal))
 
 empty_parser = Empty()
 empty_string = Epsilon.from_value("")
@@ -0,0 +1,191 @@
+"""Recognition (membership testing) with derivatives.
+
+A recognizer determines whether a sequence of tokens belongs to the language of a parser, without producing parse trees.
+It is built from a mirror of the parser graph in which reductions are removed, literals derive to the shared
+empty_string parser, and the skipped prefix of a concatenation is omitted, as only its nullability matters.
+Consequently, recognition never invokes a reduction or allocates a parse tree.
+
+As the token values are never observed, the recognizer derives by the token kind alone, such that derivatives are
+shared between tokens of the same kind (e.g. every identifier).
+"""
+from typing import Iterable
+
+from .caching import create_cache, is_pinned, pin, session
+from .parsers import (
+    Alternate,
+    BaseParser,
+    Choice,
+    Concatenate,
+    DeferredReduce,
+    Empty,
+    Epsilon,
+    Literal,
+    Recurrence,
+    Reduce,
+    Sequence,
+    Traversal,
+    analyse,
+    empty_parser,
+    empty_string,
+    kind_token,
+)
+from .token import Token
+
+__all__ = ("recognize", "recognizer")
+
+_recognizers = create_cache()
+
+
+class RecognizerConcatenate(Concatenate):
+    def _rewrite(self, seen: set) -> Traversal:
+        if self not in seen:
+            seen.add(self)
+            self.left = yield self.left
+            self.right = yield self.right
+
+        if self.left is empty_parser or self.right is empty_parser:
+            return empty_parser
+
+        if type(self.left) is Epsilon:
+            return self.right
+
+        if type(self.right) is Epsilon:
+            return self.left
+
+        # Nested concatenations are reassociated to the right (like Sequence._reassociate), so that a token is not
+        # derived through every level of nested brackets
+        left = self.left
+        if type(left) is RecognizerConcatenate and left._is_final() and self.right._is_final():
+            right = RecognizerConcatenate(left.right, self.right)._as_final()
+            return RecognizerConcatenate(left.left, right)._as_final()
+
+        return self
+
+    def _derive(self, token: Token) -> BaseParser:
+        cls = self.__class__
+        left = self.left.derive(token)
+
+        if not self.left.is_nullable():
+            return empty_parser if left is empty_parser else cls(left, self.right)
+
+        # The skipped (nullable) left parser only matches the empty string, so the derivative of the right parser stands
+        # for the concatenation
+        right = self.right.derive(token)
+        if right is empty_parser:
+            return empty_parser if left is empty_parser else cls(left, self.right)
+
+        if left is empty_parser:
+            return right
+
+        return Alternate(cls(left, self.right), right)
+
+
+class RecognizerLiteral(Literal):
+    def derive(self, token: Token) -> BaseParser:
+        return empty_string if token.first is self.string else empty_parser
+
+
+def _build_recognizer(root: BaseParser) -> BaseParser:
+    mirrors = {}
+    pending = []
+
+    def mirror(parser: BaseParser) -> BaseParser:
+        try:
+            return mirrors[parser]
+        except KeyError:
+            pass
+
+        parser_type = type(parser)
+        if parser_type is Alternate:
+            result = Alternate(None, None)
+        elif parser_type is Choice:
+            result = Choice(None)
+        elif parser_type is Concatenate:
+            result = RecognizerConcatenate(None, None)
+        elif parser_type is Sequence:
+            # Tree structure is irrelevant to recognition, so a sequence is mirrored as a chain of concatenations
+            result = RecognizerConcatenate(None, None) if len(parser.parsers) > 1 else Recurrence()
+        elif parser_type is Literal:
+            result = RecognizerLiteral(parser.string)
+        elif parser_type is Epsilon:
+            result = empty_string
+        elif parser_type is Empty:
+            result = empty_parser
+        elif parser_type in (Recurrence, Reduce, DeferredReduce):
+            # Reductions are transparent to recognition, but may be part of a cycle
+            result = Recurrence()
+        else:
+            raise TypeError(f"Cannot build recognizer for {parser_type.__name__}")
+
+        mirrors[parser] = result
+        pending.append(parser)
+
+        # Mirrors of pinned parsers share their lifetime
+        if is_pinned(parser):
+            pin(result)
+        return result
+
+    mirrored_root = mirror(root)
+
+    while pending:
+        parser = pending.pop()
+        result = mirrors[parser]
+        parser_type = type(parser)
+
+        if parser_type is Alternate or parser_type is Concatenate:
+            result.left = mirror(parser.left)
+            result.right = mirror(parser.right)
+
+        elif parser_type is Choice:
+            result.parsers = tuple([mirror(p) for p in parser.parsers])
+
+        elif parser_type is Sequence:
+            *parsers, last = parser.parsers
+            if not parsers:
+                result.parser = mirror(last)
+                continue
+
+            for item in parsers[:-1]:
+                result.left = mirror(item)
+                result.right = RecognizerConcatenate(None, None)
+                result = result.right
+
+                if is_pinned(parser):
+                    pin(result)
+
+            result.left = mirror(parsers[-1])
+            result.right = mirror(last)
+
+        elif parser_type in (Recurrence, Reduce, DeferredReduce):
+            result.parser = mirror(parser.parser)
+
+    return mirrored_root
+
+
+def recognizer(parser: BaseParser) -> BaseParser:
+    """Return the recognizer of the language of a parser"""
+    try:
+        return _recognizers[parser]
+    except KeyError:
+        result = _recognizers[parser] = _build_recognizer(parser)
+
+        # The mirror of a frozen grammar is complete, so it may be analysed too
+        if is_pinned(parser):
+            analyse(result)
+
+        return result
+
+
+def recognize(parser: BaseParser, tokens: Iterable[Token]) -> bool:
+    """Determine whether tokens are a sentence of the language of a parser, without building parse trees"""
+    with session():
+        parser = recognizer(parser)
+
+        for token in tokens:
+            parser = parser.derive(kind_token(token))
+            parser = parser.compact()
+
+            if parser is empty_parser:
+                return False
+
+        return parser.is_nullable()
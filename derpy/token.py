@@ -1,9 +1,172 @@
+from array import array
+from sys import getsizeof, intern
+from typing import Iterable, Iterator, Optional
+
 from .fields import FieldMeta
 
 
-class Token(metaclass=FieldMeta, fields="first second"):
+# Interned token kinds which are not strings
+_interned_kinds = {}
+
+
+def intern_kind(kind):
+    """Return the interned form of a token kind, such that equal kinds are identical"""
+    if type(kind) is str:
+        return intern(kind)
+    return _interned_kinds.setdefault(kind, kind)
+
+
+class Token(metaclass=FieldMeta, fields="first second", state="_hash"):
+    """Token of a kind (first) and value (second).
+
+    The kind is interned (see intern_kind), so that parsers compare kinds by identity. Tokens are pickled and copied
+    by their kind and value, so that they are interned again when restored. The hash of a token is cached, so a token
+    should not be modified once it is hashed (e.g. derived).
+    """
+
+    def __init__(self, first: str, second):
+        self.first = intern_kind(first)
+        self.second = second
+        self._hash = None
+
     def __hash__(self):
-        return hash((self.first, self.second))
+        value = self._hash
+        if value is None:
+            value = self._hash = hash((self.first, self.second))
+        return value
 
     def __eq__(self, other):
-        return type(other) is self.__class__ and other.first == self.first and other.second == self.second
+        if other is self:
+            return True
+        return isinstance(other, Token) and other.first is self.first and other.second == self.second
+
+    def __reduce__(self):
+        # Rebuilt through __init__, so that the kind is interned (and the hash recomputed) by the receiving process
+        return Token, (self.first, self.second)
+
+
+class LazyToken(Token):
+    """Token whose value is decoded on access from a slice of a UTF-8 encoded source (e.g. a memory-mapped file), which
+    it references until then. It is pickled as a plain Token of its decoded value."""
+
+    __slots__ = ("_source", "_start", "_end", "_value")
+
+    def __init__(self, first: str, source, start: int, end: int):
+        self.first = intern_kind(first)
+        self._hash = None
+        self._source = source
+        self._start = start
+        self._end = end
+        self._value = None
+
+    @property
+    def second(self) -> str:
+        value = self._value
+        if value is None:
+            value = self._value = self._source[self._start : self._end].decode()
+            self._source = None
+        return value
+
+
+# Interned token kinds, and their ids (see TokenBuffer)
+_kinds = []
+_kind_ids = {}
+
+
+def kind_id(kind: str) -> int:
+    """Return the id of an interned token kind"""
+    try:
+        return _kind_ids[kind]
+    except KeyError:
+        kind = intern_kind(kind)
+        _kind_ids[kind] = identifier = len(_kinds)
+        _kinds.append(kind)
+        return identifier
+
+
+def kind_name(identifier: int) -> str:
+    """Return the token kind of an interned id"""
+    return _kinds[identifier]
+
+
+class TokenBuffer:
+    """Columnar sequence of tokens, which stores the interned kind ids of its tokens in an array, their values in a
+    parallel list (interning strings, so that equal values are shared), and optionally their start offsets in a second
+    array.
+
+    Tokens are created upon access, e.g. when the buffer is iterated (as by parse).
+    """
+
+    __slots__ = ("kinds", "values", "offsets")
+
+    def __init__(self, with_offsets: bool = False):
+        self.kinds = array("I")
+        self.values = []
+        self.offsets = array("Q") if with_offsets else None
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> "TokenBuffer":
+        buffer = cls()
+        buffer.extend(tokens)
+        return buffer
+
+    def append(self, kind: str, value, offset: int = 0):
+        self.kinds.append(kind_id(kind))
+        if type(value) is str:
+            value = intern(value)
+        self.values.append(value)
+        if self.offsets is not None:
+            self.offsets.append(offset)
+
+    def append_token(self, token: Token, offset: int = 0):
+        self.append(token.first, token.second, offset)
+
+    def extend(self, tokens: Iterable[Token]):
+        for token in tokens:
+            self.append(token.first, token.second)
+
+    def kind(self, index: int) -> str:
+        return _kinds[self.kinds[index]]
+
+    def offset(self, index: int) -> Optional[int]:
+        if self.offsets is None:
+            return None
+        return self.offsets[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the columns of the buffer (excluding the values themselves)"""
+        size = self.kinds.itemsize * len(self.kinds) + getsizeof(self.values)
+        if self.offsets is not None:
+            size += self.offsets.itemsize * len(self.offsets)
+        return size
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            buffer = TokenBuffer(self.offsets is not None)
+            buffer.kinds = self.kinds[index]
+            buffer.values = self.values[index]
+            if self.offsets is not None:
+                buffer.offsets = self.offsets[index]
+            return buffer
+
+        return Token(_kinds[self.kinds[index]], self.values[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        kinds = _kinds
+        for kind, value in zip(self.kinds, self.values):
+            yield Token(kinds[kind], value)
+
+    def __getstate__(self):
+        # Kind ids are local to the process, so the buffer is pickled with the kinds themselves
+        return [_kinds[kind] for kind in self.kinds], self.values, self.offsets
+
+    def __setstate__(self, state):
+        kinds, self.values, self.offsets = state
+        self.kinds = array("I", map(kind_id, kinds))
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self)} tokens)"
@@ -1,17 +1,45 @@
-from .token import Token
+from .token import LazyToken, Token, TokenBuffer
 
 FLOAT_REGEX = r"((^[0-9])|(^[1-9][0-9]*))\.[0-9]+$"
 INT_REGEX = r"^[1-9][0-9]*$"
 
 from ast import literal_eval
 from abc import ABC, abstractmethod
-from re import compile as re_compile, escape
-from typing import Dict, Any, Tuple, Iterable, FrozenSet
+from codecs import getincrementaldecoder
+from itertools import chain
+from mmap import mmap, ACCESS_READ
+from os import fstat
+from re import UNICODE, compile as re_compile, escape
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Iterable, FrozenSet, Union
 from os import PathLike
 
 PatternType = type(re_compile("."))
 MatchType = type(re_compile(".").match(" "))
 
+# Handlers of the dispatch table for patterns whose matches produce no token, or a token whose kind is its value
+_skip = object()
+_value_kind = object()
+
+# Bytes which the byte pattern may match differently to the pattern, i.e. non-ASCII characters (e.g. of \w) and the
+# ASCII separators which are Unicode whitespace (of \s)
+_unicode_bytes = re_compile(rb"[\x1c-\x1f\x80-\xff]")
+
+
+def decode_chunks(chunks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    """Yield the text of chunks of text, or of UTF-8 encoded bytes (whose characters may straddle chunks)"""
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+
+        if decoder is None:
+            decoder = getincrementaldecoder("utf-8")()
+        yield decoder.decode(chunk)
+
+    if decoder is not None:
+        yield decoder.decode(b"", True)
+
 
 class BaseTokenizer(ABC):
     @abstractmethod
@@ -22,10 +50,21 @@ class BaseTokenizer(ABC):
     def tokenize_file(self, file_path: PathLike) -> Iterable[Token]:
         raise NotImplementedError
 
+    def tokenize_to_buffer(self, text: str) -> TokenBuffer:
+        """Tokenize text into a columnar token buffer"""
+        return TokenBuffer.from_tokens(self.tokenize_text(text))
+
+    def tokenize_stream(self, chunks: Iterable[Union[str, bytes]]) -> Iterable[Token]:
+        """Tokenize chunks of text, or of UTF-8 encoded bytes (e.g. read from a socket or pipe).
+
+        By default, the chunks are joined and tokenized as text; tokenizers may instead tokenize each chunk in turn.
+        """
+        return self.tokenize_text("".join(decode_chunks(chunks)))
+
 
 class RegexTokenizer(BaseTokenizer):
     """Basic REGEX matching tokenizer / lexer. Similar API to AST NodeVisitor, define/overload handle_XXX methods 
-    corresponding to pattern names in the patterns table.
+    corresponding to pattern names in the patterns table. A handler which is None produces no token for its pattern.
     
     Patterns priority ordered highest to lowest.
     """
@@ -34,6 +73,11 @@ class RegexTokenizer(BaseTokenizer):
     OP_CHARACTERS: str = "+/-*^%!~@.<>:&|="
     PAREN_CHARACTERS: str = "()[]{}"
 
+    # Number of characters which a stream holds after a match before it is final, i.e. the most by which the text that
+    # follows may extend it (e.g. "..." rather than ".", or a literal opened by an unmatched character) (see
+    # tokenize_stream)
+    max_token_size: int = 2 ** 16
+
     keywords: FrozenSet[str] = frozenset()
     patterns: Tuple[Tuple[str, str], ...] = (
         ("NUMBER", r"(0|[1-9]\d*)(\.\d*)?"),
@@ -48,12 +92,45 @@ class RegexTokenizer(BaseTokenizer):
 
     def __init__(self):
         self.pattern: PatternType = self.create_pattern()
+        self.byte_pattern: PatternType = self.create_byte_pattern()
+        self.dispatch_table: List[Optional[Tuple[str, Any]]] = self.create_dispatch_table()
 
     def create_pattern(self) -> PatternType:
         patterns = self.patterns + (self.default_pattern,)
         full_match_string = "|".join(f"(?P<{n}>{m})" for n, m in patterns)
         return re_compile(full_match_string)
 
+    def create_byte_pattern(self) -> PatternType:
+        """Return the pattern matching ASCII sources (see tokenize_bytes), whose groups are those of pattern"""
+        patterns = self.patterns + (self.default_pattern,)
+        full_match_string = "|".join(f"(?P<{n}>{m})" for n, m in patterns)
+        return re_compile(full_match_string.encode(), self.pattern.flags & ~UNICODE)
+
+    def create_dispatch_table(self) -> List[Optional[Tuple[str, Any]]]:
+        """Return the table of (pattern name, handler) by the index of the group of each pattern (match.lastindex).
+
+        The handler of a pattern is None if its matches produce a token of the pattern name (see default_handler), or
+        _value_kind if they produce a token whose kind is its value (see handle_OP)
+        """
+        table = [None] * (self.pattern.groups + 1)
+        inline_default = type(self).default_handler is RegexTokenizer.default_handler
+
+        for name, _ in self.patterns + (self.default_pattern,):
+            if name == self.NO_MATCH_NAME:
+                handler = self.handle_no_match
+            else:
+                handler = getattr(self, f"handle_{name}", self.default_handler)
+                if handler is None:
+                    handler = _skip
+                elif handler == self.default_handler and inline_default:
+                    handler = None
+                elif getattr(handler, "__func__", None) is RegexTokenizer.handle_OP:
+                    handler = _value_kind
+
+            table[self.pattern.groupindex[name]] = (name, handler)
+
+        return table
+
     def create_context(self, string: str) -> Dict[str, Any]:
         return {"line_number": 1, "char_number": 0, "string": string}
 
@@ -61,13 +138,24 @@ class RegexTokenizer(BaseTokenizer):
         return Token(match.lastgroup, value)
 
     def get_error_string(self, match: MatchType, value, context: Dict[str, Any]) -> str:
-        index = match.start() - context["char_number"]
-        lines = context["string"].splitlines()
-        line = lines[context["line_number"] - 1]
+        # The start of the line may precede the string (e.g. the buffer of a stream)
+        start = max(context["char_number"], 0)
+        index = match.start() - start
+
+        string = context["string"]
+        newline = "\n" if isinstance(string, str) else b"\n"
+        end = string.find(newline, start)
+        line = string[start : end if end >= 0 else len(string)]
+        if not isinstance(line, str):
+            # Byte sources are ASCII, so their byte offsets are character positions
+            line = line.decode()
 
         indicator_string = "".join("^" if i == index else " " for i, _ in enumerate(line))
         return f"Unable to match character {value!r} on line {context['line_number']}\n{line}\n{indicator_string}"
 
+    def handle_no_match(self, match: MatchType, value, context: Dict[str, Any]):
+        raise ValueError(self.get_error_string(match, value, context))
+
     def handle_OP(self, match: MatchType, value, context: Dict[str, Any]) -> Token:
         return Token(value, value)
 
@@ -81,8 +169,7 @@ class RegexTokenizer(BaseTokenizer):
 
         return Token(kind, value)
 
-    def handle_FORMAT(self, match: MatchType, value, context: Dict[str, Any]) -> None:
-        pass
+    handle_FORMAT = None
 
     def handle_NEWLINE(self, match: MatchType, value, context: Dict[str, Any]) -> Token:
         context["char_number"] = match.end()
@@ -98,21 +185,159 @@ class RegexTokenizer(BaseTokenizer):
             string += "\n"
 
         context = self.create_context(string)
+        dispatch_table = self.dispatch_table
+
+        # The group of each pattern spans the whole match
+        for match in self.pattern.finditer(string):
+            kind, handler = dispatch_table[match.lastindex]
+            if handler is None:
+                yield Token(kind, match.group())
+
+            elif handler is _value_kind:
+                value = match.group()
+                yield Token(value, value)
+
+            elif handler is not _skip:
+                result = handler(match, match.group(), context)
+                if result is not None:
+                    yield result
+
+        yield Token("ENDMARKER", "ENDMARKER")
+
+    def tokenize_to_buffer(self, string: str, force_trailing_newline: bool = False) -> TokenBuffer:
+        """Tokenize text into a columnar token buffer, which records the start offset of each token"""
+        if force_trailing_newline:
+            string += "\n"
+
+        context = self.create_context(string)
+        dispatch_table = self.dispatch_table
+        buffer = TokenBuffer(with_offsets=True)
+        append = buffer.append
 
         for match in self.pattern.finditer(string):
-            kind = match.lastgroup
-            value = match.group(kind)
+            kind, handler = dispatch_table[match.lastindex]
+            if handler is None:
+                append(kind, match.group(), match.start())
+
+            elif handler is _value_kind:
+                value = match.group()
+                append(value, value, match.start())
+
+            elif handler is not _skip:
+                result = handler(match, match.group(), context)
+                if result is not None:
+                    append(result.first, result.second, match.start())
+
+        append("ENDMARKER", "ENDMARKER", len(string))
+        return buffer
+
+    def tokenize_stream(
+        self, chunks: Iterable[Union[str, bytes]], force_trailing_newline: bool = False
+    ) -> Iterable[Token]:
+        """Tokenize chunks of text, or of UTF-8 encoded bytes (e.g. read from a socket or pipe), in turn.
+
+        Tokens may straddle chunks, and a longer match (e.g. of "..." rather than ".") may only be found once more text
+        follows, so a match is final once max_token_size characters follow it (or the stream ends). The text after the
+        final matches is held until enough chunks follow it. The state of the context (e.g. line numbers) is shared by
+        the chunks.
+        """
+        context = self.create_context("")
+        buffer = ""
+        pending = []
+        pending_size = 0
+
+        chunks = decode_chunks(chunks)
+        if force_trailing_newline:
+            chunks = chain(chunks, ("\n",))
+
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+
+            # The held text is only tokenized again once as much text follows it, rather than for each chunk
+            if pending_size < self.max_token_size:
+                continue
+
+            buffer += "".join(pending)
+            pending.clear()
+            pending_size = 0
+            position = yield from self._tokenize_buffer(buffer, context, False)
+            buffer = buffer[position:]
+
+        yield from self._tokenize_buffer(buffer + "".join(pending), context, True)
+        yield Token("ENDMARKER", "ENDMARKER")
+
+    def _tokenize_buffer(self, buffer: str, context: Dict[str, Any], is_final: bool) -> Iterator[Token]:
+        """Tokenize the final matches of the buffer of a stream, and return the position of the text which is held"""
+        context["string"] = buffer
+        dispatch_table = self.dispatch_table
+        # Matches which end after the limit may be extended by the text which follows the buffer
+        limit = len(buffer) - self.max_token_size
+        position = 0
+
+        for match in self.pattern.finditer(buffer):
+            if not is_final and match.end() > limit:
+                break
+
+            kind, handler = dispatch_table[match.lastindex]
+
+            if handler is None:
+                yield Token(kind, match.group())
+
+            elif handler is _value_kind:
+                value = match.group()
+                yield Token(value, value)
+
+            elif handler is not _skip:
+                result = handler(match, match.group(), context)
+                if result is not None:
+                    yield result
 
-            if kind == self.NO_MATCH_NAME:
-                raise ValueError(self.get_error_string(match, value, context))
+            position = match.end()
 
-            handler = getattr(self, f"handle_{kind}", self.default_handler)
-            result = handler(match, value, context)
-            if result is not None:
-                yield result
+        # Positions in the context are relative to the buffer
+        context["char_number"] -= position
+        return position
+
+    def tokenize_bytes(self, source, force_trailing_newline: bool = False) -> Iterable[Token]:
+        """Tokenize a UTF-8 encoded source (any bytes-like object) with the byte pattern.
+
+        The values of patterns without handlers are not decoded until they are accessed (see LazyToken), so the tokens
+        reference the source. Handlers are given decoded values, and matches whose positions are those of the text.
+        Sources with characters which the byte pattern may not match as the pattern would (e.g. non-ASCII characters of
+        \\w) are decoded and tokenized as text.
+        """
+        if _unicode_bytes.search(source):
+            yield from self.tokenize_text(str(source, "utf-8"), force_trailing_newline)
+            return
+
+        context = self.create_context(source)
+        dispatch_table = self.dispatch_table
+
+        # A trailing newline is tokenized separately, rather than copying the source
+        segments = (source, b"\n") if force_trailing_newline else (source,)
+        for segment in segments:
+            for match in self.byte_pattern.finditer(segment):
+                kind, handler = dispatch_table[match.lastindex]
+                if handler is None:
+                    yield LazyToken(kind, segment, *match.span())
+
+                elif handler is _value_kind:
+                    value = match.group().decode()
+                    yield Token(value, value)
+
+                elif handler is not _skip:
+                    result = handler(match, match.group().decode(), context)
+                    if result is not None:
+                        yield result
 
         yield Token("ENDMARKER", "ENDMARKER")
 
     def tokenize_file(self, file_path: str, force_trailing_newline: bool = False) -> Iterable[Token]:
-        with open(file_path) as f:
-            yield from self.tokenize_text(f.read(), force_trailing_newline)
+        """Tokenize a UTF-8 encoded file through a read-only memory map, rather than reading it into a string (see
+        tokenize_bytes). The map is closed once no token references it"""
+        with open(file_path, "rb") as f:
+            # Empty files cannot be mapped
+            source = mmap(f.fileno(), 0, access=ACCESS_READ) if fstat(f.fileno()).st_size else b""
+
+        yield from self.tokenize_bytes(source, force_trailing_newline)
@@ -52,6 +52,7 @@ def unpack(seq: Iterable, n: int, first: bool = True) -> Iterator[tuple]:
 
     (x, (y, z)) defines last ordering,
     ((x, y), z) defines first ordering.
+    (x, y, z), the tree of a Sequence, is already flat.
 
     :param seq: nested tuple sequence
     :param n: number of nested tuples
@@ -60,6 +61,9 @@ def unpack(seq: Iterable, n: int, first: bool = True) -> Iterator[tuple]:
     if n < 1:
         raise ValueError("Cannot unpack sequence of length 0")
 
+    elif n > 2 and len(seq) == n:
+        yield from seq
+
     elif n > 1:
         if first:
             seq, x = seq
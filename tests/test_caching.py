@@ -0,0 +1,69 @@
+import unittest
+
+from derpy import Grammar, Token, lit, parse
+from derpy import caching
+from derpy.caching import session, set_cache_limit, statistics
+
+g = Grammar("cached")
+g.pair = lit("a") & lit("b")
+g.freeze()
+
+tokens = [Token("a", "a"), Token("b", "b")]
+
+
+class TestCaching(unittest.TestCase):
+    def tearDown(self):
+        set_cache_limit(2 ** 16)
+
+    def test_grammar_derivatives_retained(self):
+        with session():
+            derivative = g.pair.derive(Token("a", "a"))
+
+        with session():
+            self.assertIs(g.pair.derive(Token("a", "a")), derivative)
+
+    def test_input_derivatives_not_retained(self):
+        pair = lit("a") & lit("b")
+        with session():
+            derivative = pair.derive(Token("a", "a"))
+
+        with session():
+            self.assertIsNot(pair.derive(Token("a", "a")), derivative)
+
+    def test_input_derivatives_memoized(self):
+        pair = lit("a") & lit("b")
+        with session():
+            token = Token("a", "a")
+            derivative = pair.derive(token)
+            self.assertIs(pair.derive(token), derivative)
+            pair.derive(Token("b", "b"))
+            self.assertIs(pair.derive(Token("a", "a")), derivative)
+
+    def test_parse_is_scoped(self):
+        pair = lit("a") & lit("b")
+        self.assertEqual(parse(pair, tokens), {("a", "b")})
+        self.assertEqual(parse(g.pair, tokens), {("a", "b")})
+
+        for cache in caching._root_caches:
+            owners = [cache.owner(key) for key in cache]
+            self.assertTrue(all(caching.is_pinned(o) for o in owners))
+
+    def test_nested_sessions(self):
+        pair = lit("a") & lit("b")
+        with session():
+            with session():
+                derivative = pair.derive(tokens[0])
+            self.assertIs(pair.derive(tokens[0]), derivative)
+
+    def test_limit(self):
+        set_cache_limit(1)
+        evicted = statistics.evicted
+        self.assertEqual(parse(g.pair, tokens), {("a", "b")})
+        self.assertEqual(parse(g.pair, [Token("a", 1), Token("b", 2)]), {(1, 2)})
+
+        self.assertGreater(statistics.evicted, evicted)
+        self.assertTrue(all(len(cache) <= 1 for cache in caching._root_caches))
+
+
+if __name__ == "__main__":
+    unittest.main()
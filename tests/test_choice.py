@@ -0,0 +1,48 @@
+import unittest
+
+from derpy import Grammar, Token, empty_string, lit, parse, recognize
+from derpy.parsers import Choice, Literal
+
+
+class UnmatchedLiteral(Literal):
+    def derive(self, token: Token):
+        raise AssertionError(f"Derived {self.string!r} with respect to {token.first!r}")
+
+
+g = Grammar("choice")
+g.op = lit("+") | lit("-") | lit("*") | lit("/")
+g.unmatched = lit("+") | lit("-") | UnmatchedLiteral("*") | UnmatchedLiteral("/")
+g.expr = g.item | (g.item & g.op & g.expr)
+g.item = lit("1") | (lit("(") & g.expr & lit(")")) | (lit("(") & lit(")"))
+g.ambiguous = (lit("a") & lit("b")) | (lit("a") & (empty_string | lit("b")))
+g.freeze()
+
+
+def make_tokens(string):
+    return [Token(c, c) for c in string]
+
+
+class TestChoice(unittest.TestCase):
+    def test_chain_is_flat(self):
+        a, b, c, d = map(lit, "abcd")
+        choice = (a | b) | (c | d)
+        self.assertIsInstance(choice, Choice)
+        self.assertEqual(choice.parsers, (a, b, c, d))
+
+    def test_derives_matching_branches(self):
+        self.assertEqual(parse(g.unmatched, make_tokens("-")), {"-"})
+        self.assertEqual(parse(g.expr, make_tokens("1+(1-1)")), {("1", "+", ("(", ("1", "-", "1"), ")"))})
+
+    def test_shared_first_kind(self):
+        self.assertEqual(parse(g.item, make_tokens("()")), {("(", ")")})
+        self.assertEqual(parse(g.ambiguous, make_tokens("ab")), {("a", "b")})
+        self.assertEqual(parse(g.ambiguous, make_tokens("a")), {("a", "")})
+
+    def test_no_matching_branch(self):
+        self.assertFalse(parse(g.expr, make_tokens("1+")))
+        self.assertFalse(recognize(g.expr, make_tokens("+1")))
+        self.assertTrue(recognize(g.expr, make_tokens("(1)-1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import gc
+import unittest
+import weakref
+
+from derpy import Grammar, Token, lit, parse, session, suspended_collection
+from derpy.collection import _observe_collection, observe, statistics, unobserve
+
+g = Grammar("collection")
+g.sums = (g.sums & lit("+") & lit("n")) | lit("n")
+g.freeze()
+
+
+class TestCollection(unittest.TestCase):
+    def setUp(self):
+        self.enabled = gc.isenabled()
+        statistics.reset()
+
+    def tearDown(self):
+        if self.enabled:
+            gc.enable()
+
+    def test_collector_suspended(self):
+        gc.enable()
+        with suspended_collection():
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+        gc.disable()
+        with suspended_collection():
+            pass
+        self.assertFalse(gc.isenabled())
+        self.assertEqual(statistics.sessions, 2)
+
+    def test_left_recursive_cycles_collected(self):
+        tokens = [Token(c, c) for c in "n" + "+n" * 50]
+        with suspended_collection():
+            trees = parse(g.sums, tokens)
+        self.assertEqual(len(trees), 1)
+        self.assertGreater(statistics.collected, 0)
+        self.assertGreaterEqual(statistics.release_time, 0.0)
+
+    def test_observation(self):
+        self.assertNotIn(_observe_collection, gc.callbacks)
+        gc.collect()
+        self.assertEqual(statistics.observed, 0)
+
+        observe()
+        observe()
+        try:
+            self.assertEqual(gc.callbacks.count(_observe_collection), 1)
+            gc.collect()
+            self.assertEqual(statistics.observed, 1)
+        finally:
+            unobserve()
+        self.assertNotIn(_observe_collection, gc.callbacks)
+
+        gc.collect()
+        self.assertEqual(statistics.observed, 1)
+
+    def test_derivatives_released_without_collector(self):
+        parser = lit("a") & lit("b") & lit("c")
+        gc.disable()
+        with session():
+            derivative = parser.derive(Token("a", "a")).compact()
+            self.assertIs(derivative.compact(), derivative)
+            released = weakref.ref(derivative)
+            del derivative
+
+        self.assertIsNone(released())
+
+
+if __name__ == "__main__":
+    unittest.main()
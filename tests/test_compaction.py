@@ -0,0 +1,132 @@
+import unittest
+
+from derpy import Grammar, Token, alt, lit, opt, parse, rec, recognize, red, star
+from derpy.parsers import Alternate, Choice, Concatenate, Delta, Epsilon, Reduce, empty_parser, graph_size
+
+
+class CountingConcatenate(Concatenate):
+    rewrites = 0
+
+    def _rewrite(self, seen: set):
+        CountingConcatenate.rewrites += 1
+        return super()._rewrite(seen)
+
+
+class TestCompaction(unittest.TestCase):
+    def test_rules(self):
+        a = lit("a")
+        self.assertIs(Alternate(empty_parser, a).compact(), a)
+        self.assertIs(Concatenate(a, empty_parser).compact(), empty_parser)
+
+        reduction = Concatenate(Epsilon.from_value(1), a).compact()
+        self.assertIs(type(reduction), Reduce)
+        self.assertIs(reduction.parser, a)
+
+    def test_epsilon_rules(self):
+        one, two = Epsilon.from_value(1), Epsilon.from_value(2)
+        self.assertEqual(Reduce(one, str).compact().derive_null().trees(), {"1"})
+        self.assertEqual(Alternate(one, two).compact().derive_null().trees(), {1, 2})
+        self.assertEqual(Concatenate(one, two).compact().derive_null().trees(), {(1, 2)})
+        for parser in (Reduce(one, str), Alternate(one, two), Concatenate(one, two)):
+            self.assertIs(type(parser.compact()), Epsilon)
+
+        a = lit("a")
+        self.assertIs(Alternate(a, a).compact(), a)
+        self.assertIs(Delta(a).compact(), empty_parser)
+
+    def test_equivalent_branches(self):
+        a, b = lit("a"), lit("b")
+        branch = Concatenate(a, b)
+        self.assertIs(Alternate(branch, Concatenate(a, b)).compact(), branch)
+
+        # Duplicates of any branch of a chain of alternations (e.g. the derivative of a choice) are removed
+        chain = Alternate(Alternate(branch, Reduce(a, str)), Reduce(b, str)).compact()
+        self.assertIs(Alternate(chain, Reduce(lit("a"), str)).compact(), chain)
+        self.assertIs(Alternate(chain, Concatenate(a, b)).compact(), chain)
+
+        # Children are compared structurally, so nested duplicates are removed
+        nested = Alternate(Reduce(Concatenate(a, b), str), Reduce(Concatenate(a, b), str)).compact()
+        self.assertIs(type(nested), Reduce)
+
+        self.assertIsNot(type(Alternate(branch, Concatenate(b, a)).compact()), Concatenate)
+        self.assertIsNot(type(Alternate(Reduce(a, str), Reduce(a, repr)).compact()), Reduce)
+
+    def test_repeated_alternatives(self):
+        a, b, c = lit("a"), lit("b"), lit("c")
+        grammar = Choice(tuple(a & b & c for _ in range(8)))
+        tokens = [Token(k, k) for k in "abc"]
+
+        derivative = grammar.derive(tokens[0]).compact()
+        self.assertLess(graph_size(derivative), 8)
+        self.assertEqual(parse(grammar, tokens), {("a", "b", "c")})
+
+    def test_graph_size_bounded(self):
+        items = star(lit("a")) & lit("end")
+        sizes = []
+        derivative = items
+        for i in range(100):
+            derivative = derivative.derive(Token("a", i)).compact()
+            sizes.append(graph_size(derivative))
+
+        self.assertLessEqual(max(sizes[50:]), max(sizes[:50]))
+
+    def test_compacted_once(self):
+        parser = Alternate(CountingConcatenate(lit("a"), lit("b")), CountingConcatenate(lit("c"), lit("d")))
+        CountingConcatenate.rewrites = 0
+
+        compacted = parser.compact()
+        self.assertEqual(CountingConcatenate.rewrites, 2)
+        self.assertIs(parser.compact(), compacted)
+        self.assertIs(Alternate(parser, lit("e")).compact().left, compacted)
+        self.assertEqual(CountingConcatenate.rewrites, 2)
+
+    def test_cyclic_reduction(self):
+        # Merging the reduction of a left-recursive reduction references it again, so is not compacted without end
+        def tag(tree):
+            return "x", tree
+
+        x = rec()
+        x.parser = alt(red(red(lit("c"), tag), tag), red(x, tag))
+        self.assertEqual(parse(x, [Token("b", "b")]), frozenset())
+        self.assertEqual(parse(x, [Token("c", "c")]), {("x", ("x", "c"))})
+
+    def test_cyclic_recurrences(self):
+        # A recognizer mirrors reductions as recurrences, so a rule which only reduces itself is a cycle of recurrences
+        def tag(tree):
+            return "x", tree
+
+        nothing = rec()
+        nothing.parser = red(nothing, tag)
+        x = rec()
+        x.parser = alt(lit("b") & nothing, lit("a"))
+        self.assertFalse(recognize(x, [Token("b", "b")]))
+        self.assertTrue(recognize(x, [Token("a", "a")]))
+        self.assertEqual(parse(x, [Token("a", "a")]), {"a"})
+
+    def test_cyclic_alternation(self):
+        # The derivative of a left-recursive alternation is an alternation whose left spine refers to itself
+        x = rec()
+        x.parser = alt(opt(lit("b")) & x, star(lit("a")))
+        tokens = [Token(k, k) for k in "ba"]
+        self.assertTrue(recognize(x, tokens))
+        self.assertEqual(parse(x, tokens), {("b", ("a",))})
+        self.assertFalse(recognize(x, tokens + [Token("c", "c")]))
+
+        g = Grammar("cyclic")
+        g.x = (opt(lit("b")) & g.x) | star(lit("a"))
+        g.freeze()
+        self.assertTrue(recognize(g.x, tokens))
+        self.assertEqual(parse(g.x, tokens), {("b", ("a",))})
+
+        spine = Alternate(lit("a"), lit("b"))
+        spine.left = spine
+        self.assertIsNot(Alternate(spine, lit("c")).compact(), spine)
+
+    def test_parse(self):
+        items = star(lit("a")) & lit("end")
+        tokens = [Token("a", i) for i in range(100)] + [Token("end", "end")]
+        self.assertEqual(parse(items, tokens), {(tuple(range(100)), "end")})
+
+
+if __name__ == "__main__":
+    unittest.main()
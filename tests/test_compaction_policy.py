@@ -0,0 +1,59 @@
+import unittest
+
+from derpy import Grammar, Token, lit, parse
+from derpy.compaction import AdaptiveCompaction, CompactionPolicy, PeriodicCompaction, ThresholdCompaction
+from derpy.parsers import graph_size
+
+g = Grammar("policy")
+g.sums = (g.sums & lit("+") & lit("n")) | lit("n")
+g.freeze()
+
+tokens = [Token(c, c) for c in "n+n+n+n+n+n+n"]
+
+
+class TestCompactionPolicy(unittest.TestCase):
+    def test_policies_preserve_trees(self):
+        expected = parse(g.sums, tokens)
+        for policy in (
+            CompactionPolicy(),
+            PeriodicCompaction(3),
+            ThresholdCompaction(5),
+            AdaptiveCompaction(max_interval=4),
+        ):
+            with self.subTest(policy=type(policy).__name__):
+                self.assertEqual(parse(g.sums, tokens, policy), expected)
+                self.assertEqual(policy.statistics.tokens, len(tokens))
+
+    def test_periodic_statistics(self):
+        policy = PeriodicCompaction(3)
+        parse(g.sums, tokens, policy)
+        self.assertEqual(policy.statistics.compactions, len(tokens) // 3)
+
+        policy.statistics.reset()
+        self.assertEqual(policy.statistics.tokens, 0)
+
+        with self.assertRaises(ValueError):
+            PeriodicCompaction(0)
+
+    def test_invalid_input(self):
+        invalid = tokens + [Token("n", "n"), Token("+", "+")]
+        for policy in (PeriodicCompaction(4), ThresholdCompaction(100)):
+            with self.subTest(policy=type(policy).__name__):
+                self.assertEqual(parse(g.sums, invalid, policy), frozenset())
+
+    def test_adaptive_interval(self):
+        policy = AdaptiveCompaction(max_interval=4, low_ratio=0.0, high_ratio=0.0)
+        parse(g.sums, tokens, policy)
+        self.assertEqual(policy.interval, 4)
+        self.assertEqual(policy.statistics.measured, policy.statistics.compactions)
+        self.assertGreater(policy.statistics.nodes_before, 0)
+        self.assertLessEqual(policy.statistics.shrink_ratio, 1.0)
+
+    def test_graph_size_limit(self):
+        parser = g.sums.derive(Token("n", "n"))
+        self.assertLessEqual(graph_size(parser, 1), graph_size(parser))
+        self.assertGreater(graph_size(parser, 1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
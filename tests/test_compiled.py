@@ -0,0 +1,87 @@
+import unittest
+
+from derpy import CompiledGrammar, Grammar, Token, compile_grammar, lit, opt, parse, recognize, star
+from derpy.grammars.python36 import p, PythonTokenizer
+
+
+def fail_reduction(args):
+    raise AssertionError("Recognition must not invoke reductions")
+
+
+g = Grammar("compiled")
+g.items = star(lit("a") >> fail_reduction)
+g.pairs = (g.items & lit("b")) >> fail_reduction
+g.sums = (g.sums & lit("+") & lit("n")) | lit("n")
+g.nested = (g.nested & g.nested) | lit("a")
+g.balanced = opt(lit("(") & g.balanced & lit(")") & g.balanced)
+g.cycle = g.cycle | lit("y")
+g.cycles = g.cycle & lit("b")
+g.freeze()
+
+compiled = g.compile()
+tokenizer = PythonTokenizer()
+
+
+def tokens(kinds: str) -> list:
+    return [Token(kind, kind) for kind in kinds]
+
+
+class TestCompiled(unittest.TestCase):
+    def assertAgrees(self, parser, inputs):
+        for kinds in inputs:
+            with self.subTest(kinds=kinds):
+                self.assertEqual(compiled.recognize(parser, tokens(kinds)), recognize(parser, tokens(kinds)))
+
+    def test_accepts(self):
+        self.assertTrue(compiled.recognize(g.pairs, tokens("aaaaab")))
+        self.assertTrue(compiled.recognize(g.items, []))
+        self.assertTrue(compiled.recognize(g.sums, tokens("n+n+n")))
+
+    def test_rejects(self):
+        self.assertFalse(compiled.recognize(g.pairs, tokens("aaaaa")))
+        self.assertFalse(compiled.recognize(g.pairs, tokens("ba")))
+        self.assertFalse(compiled.recognize(g.pairs, tokens("abc")))
+
+    def test_agrees_with_recognize(self):
+        self.assertAgrees(g.sums, ("", "n", "n+", "+n", "n+n+n", "nn"))
+        self.assertAgrees(g.nested, ("", "a", "aa", "aaaaaaa", "ab"))
+        self.assertAgrees(g.balanced, ("", "()", "(()())()", "(()", "())(", ")("))
+        self.assertAgrees(g.cycles, ("yb", "b", "y", "yyb"))
+
+    def test_collection(self):
+        source = "(" * 50 + ")" * 50
+        self.assertTrue(compiled.recognize(g.balanced, tokens(source)))
+
+        collected = compile_grammar(g.balanced)
+        collected.collection_threshold = 4
+        self.assertTrue(collected.recognize(g.balanced, tokens(source)))
+        self.assertFalse(collected.recognize(g.balanced, tokens(source + ")")))
+
+    def test_foreign_parser(self):
+        with self.assertRaises(ValueError):
+            compiled.row(lit("a") & lit("b"))
+
+    def test_unfrozen_grammar(self):
+        grammar = Grammar("unfrozen")
+        grammar.rule = lit("a")
+        with self.assertRaises(ValueError):
+            grammar.compile()
+
+    def test_table(self):
+        self.assertIsInstance(compiled, CompiledGrammar)
+        self.assertGreater(len(compiled), 0)
+        self.assertGreater(compiled.nbytes, 0)
+
+    def test_python_agrees_with_parse(self):
+        python = p.compile()
+        sources = ("x = x + 1", "def f(a, *b):\n    return a(*b)\n", "if x:\n    pass\nelse:\n    y = [1, 2]\n")
+        for source in sources:
+            source_tokens = tuple(tokenizer.tokenize_text(source))
+            self.assertTrue(python.recognize(p.file_input, source_tokens))
+            self.assertTrue(parse(p.file_input, source_tokens))
+
+        self.assertFalse(python.recognize(p.file_input, tuple(tokenizer.tokenize_text("x = = 1"))))
+
+
+if __name__ == "__main__":
+    unittest.main()
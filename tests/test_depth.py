@@ -0,0 +1,97 @@
+import inspect
+import sys
+import unittest
+from contextlib import contextmanager
+
+from derpy import Grammar, Token, lit, parse, rec, recognize, star
+from derpy.caching import session
+from derpy.parsers import Alternate, Concatenate, Reduce, empty_string
+
+depth = 100000
+
+
+@contextmanager
+def recursion_limit(frames: int):
+    """Limit the Python call stack to a number of frames beyond the current depth"""
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack(0)) + frames)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def increment(tree):
+    return tree + 1
+
+
+def nest(tree):
+    return tree[1] + 1
+
+
+def zero(tree):
+    return 0
+
+
+g = Grammar("nested")
+g.expr = ((lit("(") & g.expr & lit(")")) >> nest) | (lit("x") >> zero)
+g.freeze()
+
+
+class TestDepth(unittest.TestCase):
+    def test_nested_alternation(self):
+        parser = lit("a")
+        for _ in range(depth):
+            parser = Alternate(lit("b"), parser)
+
+        self.assertEqual(parse(parser, [Token("a", 1)]), {1})
+
+    def test_nested_reduction(self):
+        parser = lit("a")
+        for _ in range(depth):
+            parser = Reduce(parser, increment)
+
+        self.assertEqual(parse(parser, [Token("a", 0)]), {depth})
+
+    def test_nested_concatenation(self):
+        parser = empty_string
+        for _ in range(depth):
+            parser = Concatenate(empty_string, parser)
+
+        self.assertTrue(parser.is_nullable())
+        self.assertEqual(parser.derive_null().count_trees(), 1)
+        self.assertEqual(parser.compact().derive_null().count_trees(), 1)
+
+    def test_nested_brackets(self):
+        nesting = 5000
+        tokens = [Token("(", "(")] * nesting + [Token("x", "x")] + [Token(")", ")")] * nesting
+        with recursion_limit(200):
+            self.assertEqual(parse(g.expr, tokens), {nesting})
+            self.assertTrue(recognize(g.expr, tokens))
+            self.assertFalse(recognize(g.expr, tokens[:-1]))
+
+    def test_cyclic_reduction(self):
+        # A recursive parser which is reached again through a long chain of reductions
+        parser = rec()
+        cycle = parser
+        for _ in range(depth // 10):
+            cycle = Reduce(cycle, increment)
+        parser.parser = Alternate(lit("a"), cycle)
+
+        with recursion_limit(200):
+            self.assertEqual(parse(parser, [Token("a", 0)]), {0})
+            self.assertTrue(recognize(parser, [Token("a", 0)]))
+            self.assertFalse(parse(parser, [Token("b", 0)]))
+
+    def test_uncompacted_derivation(self):
+        # Each token which is derived without compaction nests the evaluation of the next derivative
+        items = star(lit("a"))
+        with recursion_limit(100), session():
+            for i in range(200):
+                items = items.derive(Token("a", i))
+
+            self.assertEqual(items.derive_null().first_tree(), tuple(range(200)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from derpy import Grammar, Token, empty_parser, lit, opt, parse, session
+from derpy.parsers import Alternate, Delta, Epsilon, LazyDerivative, _skipped
+
+
+def tag(tree):
+    return "x", tree
+
+
+g = Grammar("derivation")
+g.prefix = opt(lit("a"))
+g.pair = g.prefix & lit("b")
+g.cycle = g.cycle | lit("y")
+g.sums = (g.sums & lit("+") & lit("n")) | lit("n")
+g.x = (g.y >> tag) | ((lit("c") >> tag) >> tag)
+g.y = (g.x >> tag) | lit("b")
+g.freeze()
+
+
+class TestDerivation(unittest.TestCase):
+    def test_eager_derivative(self):
+        with session():
+            derivative = Alternate(lit("a") & lit("b"), lit("c")).derive(Token("a", "a"))
+            self.assertNotIsInstance(derivative, LazyDerivative)
+            self.assertNotIsInstance(g.pair.derive(Token("a", "a")), LazyDerivative)
+
+    def test_cyclic_derivative(self):
+        with session():
+            self.assertIs(g.cycle.derive(Token("b", "b")).compact(), empty_parser)
+            self.assertTrue(g.cycle.derive(Token("y", "y")).is_nullable())
+
+        self.assertEqual(parse(g.sums, [Token(c, c) for c in "n+n+n"]), {(("n", "+", "n"), "+", "n")})
+
+    def test_cyclic_reductions(self):
+        # Derivatives of reductions which reduce each other are cyclic, and are compacted once per token
+        self.assertEqual(parse(g.x, [Token("b", "b")]), {("x", "b")})
+        self.assertEqual(parse(g.y, [Token("c", "c")]), {("x", ("x", ("x", "c")))})
+        for tokens in ([Token("b", "b"), Token("c", "c")], [Token("c", "c"), Token("b", "b")]):
+            self.assertEqual(parse(g.x, tokens), frozenset())
+            self.assertEqual(parse(g.y, tokens), frozenset())
+
+    def test_literals_share_epsilon(self):
+        token = Token("a", 1)
+        epsilon = lit("a").derive(token)
+        self.assertIsInstance(epsilon, Epsilon)
+        self.assertIs(lit("a").derive(token), epsilon)
+        self.assertIsNot(lit("a").derive(Token("a", 1)), epsilon)
+
+    def test_shared_skipped_parsers(self):
+        self.assertIs(_skipped(g.prefix), _skipped(g.prefix))
+        self.assertIsNot(_skipped(opt(lit("a"))), _skipped(opt(lit("a"))))
+        self.assertIsInstance(_skipped(g.prefix), Delta)
+
+        tokens = [Token("b", "b")]
+        self.assertEqual(parse(g.pair, tokens), {("", "b")})
+        self.assertEqual(parse(g.pair, tokens), {("", "b")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import weakref
+
+from derpy import Token, empty_parser, empty_string, lit
+from derpy.fields import FieldMeta
+from derpy.parsers import Alternate, Choice, DeferredReduce, LazyDerivative, Recurrence, Reduce, Sequence
+
+
+class Node(metaclass=FieldMeta, fields="value", state="_count _cache"):
+    _count = 0
+    _cache = None
+
+
+class Leaf(Node):
+    _cache = "constant"
+
+
+class Pair(Node, fields="other"):
+    pass
+
+
+class TestFields(unittest.TestCase):
+    def test_state_defaults(self):
+        node = Node(1)
+        self.assertEqual((node.value, node._count, node._cache), (1, 0, None))
+        node._count += 1
+        self.assertEqual((Node(2)._count, node._count), (0, 1))
+
+    def test_constant_replaces_state(self):
+        leaf = Leaf(1)
+        self.assertEqual((leaf._count, leaf._cache), (0, "constant"))
+        with self.assertRaises(AttributeError):
+            leaf._cache = None
+
+    def test_inherited_fields(self):
+        pair = Pair(1, 2)
+        self.assertEqual(Pair._fields, ("value", "other"))
+        self.assertEqual((pair.value, pair.other, pair._count), (1, 2, 0))
+        self.assertEqual(repr(pair), "Pair(value=1, other=2)")
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Node(1).undeclared = None
+
+    def test_parsers_have_no_dict(self):
+        a = lit("a")
+        parsers = (
+            a,
+            empty_parser,
+            empty_string,
+            Alternate(a, a),
+            Choice((a, a)),
+            Sequence((a, a)),
+            Reduce(a, str),
+            DeferredReduce(a, str),
+            Recurrence(),
+            LazyDerivative(a, Token("a", "a")),
+        )
+        for parser in parsers:
+            with self.subTest(parser=type(parser).__name__):
+                self.assertFalse(hasattr(parser, "__dict__"))
+                self.assertIs(weakref.ref(parser)(), parser)
+
+    def test_parser_state(self):
+        recurrence = Recurrence()
+        self.assertIsNone(recurrence.parser)
+        self.assertIsNone(recurrence._first_set)
+        self.assertIsNone(Choice((lit("a"),))._index)
+        self.assertIs(empty_parser._nullable, False)
+        self.assertIs(empty_string._nullable, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
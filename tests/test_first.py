@@ -0,0 +1,44 @@
+import unittest
+
+from derpy import Grammar, Token, empty_parser, lit, opt, parse
+from derpy.parsers import Literal, first_sets
+
+
+class UnmatchedLiteral(Literal):
+    def derive(self, token: Token):
+        raise AssertionError(f"Derived {self.string!r} with respect to {token.first!r}")
+
+
+g = Grammar("first")
+g.sign = opt(lit("+") | lit("-"))
+g.number = g.sign & lit("1")
+g.call = lit("f") & opt(UnmatchedLiteral("!") >> str) & lit("(") & g.number & lit(")")
+g.statement = g.call | g.number
+g.freeze()
+
+
+class TestFirstSets(unittest.TestCase):
+    def test_first_sets(self):
+        firsts = first_sets(g.statement, g.call, g.number, g.sign)
+        self.assertEqual(firsts[g.sign], {"+", "-"})
+        self.assertEqual(firsts[g.number], {"+", "-", "1"})
+        self.assertEqual(firsts[g.call], {"f"})
+        self.assertEqual(firsts[g.statement], {"+", "-", "1", "f"})
+
+    def test_pruned_derivative(self):
+        self.assertIs(g.number.derive(Token("f", "f")), empty_parser)
+        self.assertIs(g.call.derive(Token(")", ")")), empty_parser)
+        self.assertIsNot(g.number.derive(Token("1", "1")), empty_parser)
+
+    def test_parse(self):
+        tokens = [Token(c, c) for c in "-1"]
+        self.assertEqual(parse(g.statement, tokens), {("-", "1")})
+
+        # The optional "!" cannot begin with "(", so is never derived
+        tokens = [Token(c, c) for c in "f(1)"]
+        self.assertEqual(parse(g.statement, tokens), {("f", "", "(", ("", "1"), ")")})
+        self.assertFalse(parse(g.statement, [Token(")", ")")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
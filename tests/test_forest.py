@@ -0,0 +1,93 @@
+import unittest
+
+from derpy import Grammar, Token, lit, parse, parse_forest, session
+from derpy.forest import Applied, bind, token_value
+from derpy.parsers import kind_token
+
+
+def catalan(n):
+    result = 1
+    for k in range(n):
+        result = result * 2 * (2 * k + 1) // (k + 2)
+    return result
+
+
+g = Grammar("ambiguous")
+g.s = (g.s & g.s) | lit("a")
+g.freeze()
+
+
+def make_tokens(n):
+    return [Token("a", i) for i in range(n)]
+
+
+class TestForest(unittest.TestCase):
+    def test_count_trees(self):
+        for n in range(1, 8):
+            forest = parse_forest(g.s, make_tokens(n))
+            self.assertEqual(forest.count_trees(), catalan(n - 1))
+
+    def test_enumeration_matches_parse(self):
+        tokens = make_tokens(6)
+        forest = parse_forest(g.s, tokens)
+        self.assertEqual(frozenset(forest), parse(g.s, tokens))
+        self.assertEqual(len(parse(g.s, tokens)), catalan(5))
+
+    def test_first_tree(self):
+        forest = parse_forest(g.s, make_tokens(4))
+        self.assertIn(forest.first_tree(), forest.trees())
+
+    def test_large_ambiguous_input(self):
+        forest = parse_forest(g.s, make_tokens(30))
+        self.assertEqual(forest.count_trees(), catalan(29))
+        tree = forest.first_tree()
+        self.assertIsInstance(tree, tuple)
+
+    def test_values_bound_in_order(self):
+        calls = []
+
+        def record(tree):
+            calls.append(tree)
+            return ("sum", tree)
+
+        grammar = (lit("n") & lit("+") & lit("n")) >> record
+        tokens = [Token("n", 1), Token("+", "+"), Token("n", 2)]
+        forest = parse_forest(grammar, tokens)
+        self.assertEqual(calls, [])
+        self.assertEqual(forest.trees(), {("sum", (1, "+", 2))})
+        self.assertEqual(calls, [(1, "+", 2)])
+        self.assertEqual(list(forest), [("sum", (1, "+", 2))])
+        self.assertEqual(forest.first_tree(), ("sum", (1, "+", 2)))
+
+    def test_derivatives_shared_between_values(self):
+        with session():
+            derivative = g.s.derive(kind_token(Token("a", 1)))
+            self.assertIs(g.s.derive(kind_token(Token("a", 2))), derivative)
+
+        self.assertEqual(parse(g.s, make_tokens(2)), {(0, 1)})
+        self.assertEqual(parse(g.s, [Token("a", "x"), Token("a", "y")]), {("x", "y")})
+
+    def test_bind(self):
+        tokens = [Token("a", i) for i in range(3)]
+        tree = (token_value, Applied(str, (token_value, ())), token_value)
+        self.assertEqual(bind(tree, tokens), (0, "(1, ())", 2))
+
+        # Deep trees are bound without recursion
+        tree = token_value
+        for _ in range(10000):
+            tree = Applied(list, (tree,))
+        bound = bind(tree, tokens)
+        for _ in range(10000):
+            bound = bound[0]
+        self.assertEqual(bound, 0)
+
+    def test_no_parse(self):
+        forest = parse_forest(g.s, [Token("b", "b")])
+        self.assertFalse(forest)
+        self.assertEqual(forest.count_trees(), 0)
+        with self.assertRaises(ValueError):
+            forest.first_tree()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from derpy import Token, lit, parse, session
+from derpy.parsers import Alternate, BaseParserMeta, Choice, Concatenate, Epsilon, Reduce, graph_size, set_hash_consing
+from derpy.grammars.python36 import p, PythonTokenizer
+
+
+class TestHashConsing(unittest.TestCase):
+    def setUp(self):
+        set_hash_consing(True)
+
+    def tearDown(self):
+        set_hash_consing(False)
+
+    def test_shared(self):
+        a, b = lit("a"), lit("b")
+        self.assertIs(lit("a"), a)
+        self.assertIs(Alternate(a, b), Alternate(a, b))
+        self.assertIs(Concatenate(a, b), Concatenate(a, b))
+        self.assertIs(Reduce(a, str), Reduce(a, str))
+        self.assertIsNot(Concatenate(a, b), Concatenate(b, a))
+
+    def test_values(self):
+        self.assertIs(Epsilon.from_value("x"), Epsilon.from_value("x"))
+        self.assertIsNot(Epsilon.from_value(1), Epsilon.from_value(True))
+
+    def test_placeholders_not_shared(self):
+        self.assertIsNot(Alternate(None, None), Alternate(None, None))
+
+    def test_disabled(self):
+        set_hash_consing(False)
+        self.assertIsNot(lit("a"), lit("a"))
+
+    def test_metaclass_not_modified(self):
+        call = BaseParserMeta.__call__
+        set_hash_consing(False)
+        set_hash_consing(True)
+        self.assertIs(BaseParserMeta.__call__, call)
+
+    def test_repeated_subexpressions_shared(self):
+        def build():
+            return Choice(tuple(lit("a") & lit("b") & lit("c") for _ in range(4)))
+
+        tokens = [Token(c, c) for c in "ab"]
+        sizes = []
+        for enabled in (False, True):
+            set_hash_consing(enabled)
+            derivative = build()
+            with session():
+                for token in tokens:
+                    derivative = derivative.derive(token)
+                sizes.append(graph_size(derivative))
+        self.assertLess(sizes[1], sizes[0])
+
+    def test_parse(self):
+        grammar = (lit("a") & lit("b")) | (lit("a") & lit("c"))
+        self.assertEqual(parse(grammar, [Token("a", 1), Token("c", 2)]), {(1, 2)})
+
+        tokens = list(PythonTokenizer().tokenize_text("x = [a + b for a in y if a]\nf(x, (1, 2))\n"))
+        self.assertEqual(len(parse(p.file_input, tokens)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from derpy import Token, empty_string, lit, parse
+from derpy.parsers import Alternate, Concatenate, Recurrence, solve_nullability
+
+
+def make_nested_cycle():
+    # x = y | ε, y = x x
+    x = Recurrence()
+    y = Recurrence()
+    x.parser = Alternate(y, empty_string)
+    y.parser = Concatenate(x, x)
+    return x, y
+
+
+class TestNullability(unittest.TestCase):
+    def test_nested_cycle(self):
+        x, y = make_nested_cycle()
+        self.assertTrue(x.is_nullable())
+        self.assertTrue(y.is_nullable())
+        self.assertTrue(y.parser.is_nullable())
+
+    def test_not_nullable_cycle(self):
+        # x = a | x x
+        x = Recurrence()
+        x.parser = Alternate(lit("a"), Concatenate(x, x))
+        self.assertFalse(x.is_nullable())
+        self.assertEqual(parse(x, [Token("a", 1)]), {1})
+
+    def test_solved_once(self):
+        x, y = make_nested_cycle()
+        evaluations = solve_nullability(y)
+        self.assertGreaterEqual(evaluations, 4)
+        self.assertEqual(solve_nullability(x), 0)
+        self.assertEqual(solve_nullability(y.parser), 0)
+
+    def test_linear_evaluations(self):
+        # A chain of n nested recursions must not be re-solved by each of its members
+        n = 1000
+        inner = Recurrence()
+        inner.parser = Alternate(empty_string, Concatenate(lit("a"), inner))
+        root = inner
+        for _ in range(n):
+            outer = Recurrence()
+            outer.parser = Alternate(Concatenate(root, outer), lit("b"))
+            root = outer
+
+        evaluations = solve_nullability(root)
+        self.assertFalse(root.is_nullable())
+        self.assertLess(evaluations, 10 * n)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,6 +37,18 @@ class TestParsePython(TestCase):
 
         self.assertEqual(module, expected_ast)
 
+    def test_loop_else(self):
+        body = (ast.Assign((ast.Name("y"),), ast.Num(1)),)
+        orelse = (ast.Assign((ast.Name("z"),), ast.Num(2)),)
+        loops = {
+            "while x:\n    y = 1\nelse:\n    z = 2\n": ast.While(ast.Name("x"), body, orelse),
+            "for a in b:\n    y = 1\nelse:\n    z = 2\n": ast.For(ast.Name("a"), ast.Name("b"), body, orelse),
+        }
+        for source, expected in loops.items():
+            with self.subTest(source=source):
+                parse_trees = parse(p.file_input, tuple(tokenizer.tokenize_text(source)))
+                self.assertEqual(parse_trees, {ast.Module((expected,))})
+
     def test_round_trip(self):
         tokens = tuple(tokenizer.tokenize_text(test_string))
         parse_trees = parse(p.file_input, tokens)
@@ -0,0 +1,80 @@
+import itertools
+import unittest
+
+from derpy import Grammar, Token, empty_string, lit, opt, parse, recognize, session, star
+from derpy.grammars.python36 import p, PythonTokenizer
+from derpy.recognizer import kind_token, recognizer
+
+
+def fail_reduction(args):
+    raise AssertionError("Recognition must not invoke reductions")
+
+
+g = Grammar("reductions")
+g.items = star(lit("a") >> fail_reduction)
+g.pairs = (g.items & lit("b")) >> fail_reduction
+g.freeze()
+
+
+def tag(tree):
+    return "x", tree
+
+
+# Grammars of the other tests (without reductions which fail), and a grammar whose derivatives by token kind share the
+# cycle of a recursive parser (units -> units)
+fixtures = Grammar("fixtures")
+fixtures.items = star(lit("a"))
+fixtures.pairs = fixtures.items & lit("b")
+fixtures.nested = (fixtures.nested & fixtures.nested) | lit("a")
+fixtures.balanced = opt(lit("(") & fixtures.balanced & lit(")") & fixtures.balanced)
+fixtures.cycle = fixtures.cycle | lit("a")
+fixtures.x = (fixtures.y >> tag) | ((lit("c") >> tag) >> tag)
+fixtures.y = (fixtures.x >> tag) | lit("b")
+fixtures.units = star(lit("b")) & (empty_string | fixtures.units) & (lit("a") | fixtures.units)
+fixtures.freeze()
+
+tokenizer = PythonTokenizer()
+
+
+class TestRecognize(unittest.TestCase):
+    def test_accepts(self):
+        tokens = [Token("a", "a")] * 5 + [Token("b", "b")]
+        self.assertTrue(recognize(g.pairs, tokens))
+        self.assertTrue(recognize(g.items, []))
+
+    def test_rejects(self):
+        self.assertFalse(recognize(g.pairs, [Token("a", "a")] * 5))
+        self.assertFalse(recognize(g.pairs, [Token("b", "b"), Token("a", "a")]))
+
+    def test_derives_by_kind(self):
+        self.assertTrue(recognize(g.pairs, [Token("a", i) for i in range(5)] + [Token("b", None)]))
+
+        with session():
+            mirror = recognizer(g.items)
+            derivative = mirror.derive(kind_token(Token("a", 1)))
+            self.assertIs(mirror.derive(kind_token(Token("a", 2))), derivative)
+
+    def test_agrees_with_parse(self):
+        for name in ("items", "pairs", "nested", "balanced", "cycle", "x", "y", "units"):
+            parser = getattr(fixtures, name)
+            for size in range(5):
+                for kinds in itertools.product("abc()", repeat=size):
+                    tokens = [Token(kind, kind) for kind in kinds]
+                    with self.subTest(rule=name, kinds="".join(kinds)):
+                        self.assertEqual(bool(parse(parser, tokens)), recognize(parser, tokens))
+
+    def test_python_agrees_with_parse(self):
+        sources = ("x = x + 1", "def f(a, *b):\n    return a(*b)\n", "if x:\n    pass\nelse:\n    y = [1, 2]\n")
+        for source in sources:
+            tokens = tuple(tokenizer.tokenize_text(source))
+            self.assertTrue(recognize(p.file_input, tokens))
+            self.assertEqual(bool(parse(p.file_input, tokens)), True)
+
+    def test_python_rejects(self):
+        tokens = tuple(tokenizer.tokenize_text("x = = 1"))
+        self.assertFalse(recognize(p.file_input, tokens))
+        self.assertFalse(parse(p.file_input, tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from derpy import Grammar, PeriodicCompaction, Token, cat, lit, parse, plus, rec, star
+
+g = Grammar("repetition")
+g.items = star(lit("a")) & lit("end")
+g.some_items = plus(lit("a")) & lit("end")
+g.groups = star(lit("(") & star(lit("a")) & lit(")"))
+g.freeze()
+
+
+def make_tokens(n):
+    return [Token("a", i) for i in range(n)] + [Token("end", "end")]
+
+
+class TestRepetition(unittest.TestCase):
+    def test_star(self):
+        self.assertEqual(parse(g.items, make_tokens(0)), {("", "end")})
+        self.assertEqual(parse(g.items, make_tokens(1)), {((0,), "end")})
+        self.assertEqual(parse(g.items, make_tokens(3)), {((0, 1, 2), "end")})
+
+    def test_plus(self):
+        self.assertFalse(parse(g.some_items, make_tokens(0)))
+        self.assertEqual(parse(g.some_items, make_tokens(1)), {((0,), "end")})
+        self.assertEqual(parse(g.some_items, make_tokens(3)), {((0, 1, 2), "end")})
+
+    def test_nested(self):
+        tokens = [Token(c, c) for c in "(aa)()(a)"]
+        (tree,) = parse(g.groups, tokens)
+        self.assertEqual(tree, (("(", ("a", "a"), ")"), ("(", "", ")"), ("(", ("a",), ")")))
+
+    def test_long_repetition(self):
+        n = 10000
+        self.assertEqual(parse(g.items, make_tokens(n)), {(tuple(range(n)), "end")})
+        self.assertEqual(parse(g.some_items, make_tokens(n)), {(tuple(range(n)), "end")})
+
+    def test_cyclic_repetition(self):
+        # The forest of a nullable repetition of itself is cyclic, so its prefix is not deferred as a single tree
+        items = rec()
+        items.parser = star(cat(star(lit("a")), items))
+        tokens = [Token("a", "0")]
+        uncompacted = parse(items, tokens, PeriodicCompaction(len(tokens) + 1))
+        self.assertEqual(uncompacted, {((("0",), ""),)})
+        self.assertEqual(parse(items, tokens), uncompacted)
+
+
+if __name__ == "__main__":
+    unittest.main()
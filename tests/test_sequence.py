@@ -0,0 +1,46 @@
+import unittest
+
+from derpy import Grammar, Token, lit, opt, parse, recognize, seq, unpack
+
+a, b, c, d = lit("a"), lit("b"), lit("c"), lit("d")
+
+g = Grammar("sequence")
+g.pair = a & b
+g.nested = g.pair & c
+g.optional = a & opt(b) & opt(c) & d
+g.freeze()
+
+
+def make_tokens(string):
+    return [Token(c, c) for c in string]
+
+
+class TestSequence(unittest.TestCase):
+    def test_chain_is_flat(self):
+        self.assertEqual(parse(a & b & c & d, make_tokens("abcd")), {("a", "b", "c", "d")})
+
+    def test_grouping(self):
+        self.assertEqual(parse(a & (b & c) & d, make_tokens("abcd")), {("a", ("b", "c"), "d")})
+        self.assertEqual(parse(seq(a & b, c & d), make_tokens("abcd")), {(("a", "b"), ("c", "d"))})
+
+    def test_rule_is_single_item(self):
+        self.assertEqual(parse(g.nested, make_tokens("abc")), {(("a", "b"), "c")})
+
+    def test_nullable_items(self):
+        self.assertEqual(parse(g.optional, make_tokens("ad")), {("a", "", "", "d")})
+        self.assertEqual(parse(g.optional, make_tokens("acd")), {("a", "", "c", "d")})
+        self.assertEqual(parse(g.optional, make_tokens("abcd")), {("a", "b", "c", "d")})
+        self.assertFalse(parse(g.optional, make_tokens("abdd")))
+
+    def test_recognize(self):
+        self.assertTrue(recognize(g.optional, make_tokens("abd")))
+        self.assertFalse(recognize(g.optional, make_tokens("ab")))
+
+    def test_unpack_flat(self):
+        tree = next(iter(parse(a & b & c, make_tokens("abc"))))
+        self.assertEqual(tuple(unpack(tree, 3)), ("a", "b", "c"))
+        self.assertEqual(tuple(unpack((("a", "b"), "c"), 3)), ("a", "b", "c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
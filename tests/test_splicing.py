@@ -0,0 +1,59 @@
+import unittest
+
+from derpy import Grammar, Token, lit, parse, star
+from derpy.parsers import Literal, Recurrence, Sequence
+
+
+def tokens(kinds: str) -> list:
+    return [Token(kind, kind) for kind in kinds]
+
+
+class TestSplicing(unittest.TestCase):
+    def test_forward_references(self):
+        g = Grammar("forward")
+        g.pair = g.first & g.second
+        g.first = lit("a")
+        g.second = lit("b")
+        self.assertEqual(g.freeze(), 2)
+
+        self.assertIs(type(g.pair.parser), Sequence)
+        self.assertTrue(all(type(p) is Literal for p in g.pair.parser.parsers))
+        self.assertEqual(parse(g.pair, tokens("ab")), {("a", "b")})
+
+    def test_rule_is_single_item(self):
+        g = Grammar("items")
+        g.pair = lit("a") & lit("b")
+        g.triple = g.pair & lit("c")
+        g.freeze()
+
+        self.assertEqual(parse(g.triple, tokens("abc")), {(("a", "b"), "c")})
+
+    def test_cycles_retained(self):
+        g = Grammar("cycles")
+        g.sums = (g.sums & lit("+") & g.number) | g.number
+        g.number = lit("n")
+        g.items = star(g.number)
+        self.assertEqual(g.freeze(), 1)
+
+        self.assertIs(g.sums.parser.parsers[0].parsers[0], g.sums)
+        self.assertIs(g.sums.parser.parsers[1], g.number.parser)
+        repetition = g.items.parser.parser
+        self.assertIs(type(repetition), Recurrence)
+        self.assertIs(repetition.parser.right.left, g.number.parser)
+        self.assertIs(repetition.parser.right.right, repetition)
+
+        self.assertEqual(parse(g.sums, tokens("n+n")), {("n", "+", "n")})
+        self.assertEqual(parse(g.items, tokens("nn")), {("n", "n")})
+
+    def test_cycle_of_rules(self):
+        g = Grammar("empty")
+        g.first = g.second
+        g.second = g.first
+        g.freeze()
+
+        self.assertFalse(parse(g.first, tokens("a")))
+        self.assertFalse(parse(g.first, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from derpy import Grammar, RegexTokenizer, Token, TokenBuffer, lit, parse, recognize
+from derpy.token import kind_id, kind_name
+
+g = Grammar("buffer")
+g.sums = (g.sums & lit("+") & lit("ID")) | lit("ID")
+g.freeze()
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_columns(self):
+        tokens = [Token("ID", "x"), Token("+", "+"), Token("ID", "y"), Token("NUMBER", 1)]
+        buffer = TokenBuffer.from_tokens(tokens)
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(list(buffer), tokens)
+        self.assertEqual(buffer[2], Token("ID", "y"))
+        self.assertEqual(buffer.kind(3), "NUMBER")
+        self.assertEqual(buffer.kinds[0], buffer.kinds[2])
+        self.assertEqual(kind_name(kind_id("ID")), "ID")
+        self.assertEqual(list(buffer[1:3]), tokens[1:3])
+        self.assertIsNone(buffer.offset(0))
+
+    def test_shared_values(self):
+        buffer = TokenBuffer()
+        for value in ("".join(["na", "me"]), "".join(["nam", "e"])):
+            buffer.append("ID", value)
+        self.assertIs(buffer.values[0], buffer.values[1])
+
+    def test_tokenize_to_buffer(self):
+        text = "x + y\n"
+        buffer = RegexTokenizer().tokenize_to_buffer(text)
+        self.assertEqual(list(buffer), list(RegexTokenizer().tokenize_text(text)))
+        self.assertEqual([buffer.offset(i) for i in range(len(buffer))], [0, 2, 4, 5, 6])
+
+    def test_parse_buffer(self):
+        tokens = [Token("ID", "x"), Token("+", "+"), Token("ID", "y")]
+        buffer = TokenBuffer.from_tokens(tokens)
+        self.assertEqual(parse(g.sums, buffer), parse(g.sums, tokens))
+        self.assertTrue(recognize(g.sums, buffer))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import copy
+import pickle
+import unittest
+
+from derpy import LazyToken, Token, lit, parse, recognize
+from derpy.token import TokenBuffer, intern_kind
+
+
+class TestTokenKinds(unittest.TestCase):
+    def test_kinds_are_interned(self):
+        kind = "".join(["NA", "ME"])
+        self.assertIs(Token(kind, "x").first, Token("NAME", "y").first)
+        self.assertIs(LazyToken(kind, b"x", 0, 1).first, "NAME")
+        self.assertIs(lit(kind).string, "NAME")
+        self.assertIs(TokenBuffer.from_tokens([Token(kind, "x")])[0].first, "NAME")
+
+    def test_non_string_kinds(self):
+        self.assertIs(Token((1, 2), "x").first, Token(tuple([1, 2]), "y").first)
+        self.assertIs(intern_kind(12345), intern_kind(int("12345")))
+        self.assertEqual(parse(lit((1, 2)), [Token(tuple([1, 2]), "x")]), {"x"})
+
+    def test_cached_hash(self):
+        token = Token("NAME", "x")
+        self.assertEqual(hash(token), hash(("NAME", "x")))
+        self.assertEqual(token._hash, hash(("NAME", "x")))
+        self.assertEqual(hash(LazyToken("NAME", b"x", 0, 1)), hash(token))
+
+    def test_equality(self):
+        token = Token("NAME", "x")
+        self.assertEqual(token, Token("".join(["NA", "ME"]), "x"))
+        self.assertEqual(token, LazyToken("NAME", b"x", 0, 1))
+        self.assertNotEqual(token, Token("NAME", "y"))
+        self.assertNotEqual(token, Token("OP", "x"))
+        self.assertNotEqual(token, ("NAME", "x"))
+
+    def test_dynamic_kinds_match(self):
+        tokens = [Token("".join(["N", c]), c) for c in "ab"]
+        grammar = lit("Na") & lit("Nb")
+        self.assertEqual(parse(grammar, tokens), {("a", "b")})
+        self.assertTrue(recognize(grammar, tokens))
+        self.assertFalse(recognize(grammar, tokens[::-1]))
+
+    def test_pickled_tokens_match(self):
+        token = Token("".join(["some_", "kind"]), "x")
+        restored = pickle.loads(pickle.dumps(token))
+        self.assertIs(restored.first, "some_kind")
+        self.assertEqual(restored, token)
+        self.assertEqual(hash(restored), hash(token))
+        self.assertEqual(parse(lit("some_kind"), [restored]), {"x"})
+        self.assertTrue(recognize(lit("some_kind"), [restored]))
+
+        self.assertEqual(copy.copy(token), token)
+        self.assertEqual(pickle.loads(pickle.dumps(LazyToken("NAME", b"x", 0, 1))), Token("NAME", "x"))
+
+    def test_pickled_token_buffer(self):
+        buffer = TokenBuffer.from_tokens([Token("NAME", "x"), Token("OP", "+")])
+        state = buffer.__getstate__()
+        self.assertEqual(state[0], ["NAME", "OP"])
+        restored = pickle.loads(pickle.dumps(buffer))
+        self.assertEqual(list(restored), list(buffer))
+        self.assertIs(restored.kind(1), "OP")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
 import unittest
+from itertools import islice, repeat
+from pathlib import Path
+from tempfile import TemporaryDirectory
 
 from derpy import RegexTokenizer, Token
+from derpy.grammars.ebnf import EBNFTokenizer
+from derpy.grammars.python36 import PythonTokenizer
+from derpy.token import LazyToken
 
 test_string = """
 x = y + z
@@ -23,12 +29,149 @@ expected_tokens = (
 )
 
 
+class DefaultTokenizer(RegexTokenizer):
+    def default_handler(self, match, value, context):
+        return Token(match.lastgroup.lower(), value)
+
+    def handle_OP(self, match, value, context):
+        return Token("OP", value)
+
+
+class WordTokenizer(RegexTokenizer):
+    patterns = (("WORD", r"\w+"), ("FORMAT", r"\s+"))
+
+
+class EllipsisTokenizer(RegexTokenizer):
+    patterns = (("ELLIPSIS", r"\.\.\."),) + RegexTokenizer.patterns
+
+
+class FormatTokenizer(RegexTokenizer):
+    def handle_FORMAT(self, match, value, context):
+        return Token("FORMAT", value)
+
+
 class TestTokenizer(unittest.TestCase):
     def test_tokenizer(self):
         tokenizer = RegexTokenizer()
         tokens = tuple(tokenizer.tokenize_text(test_string))
         self.assertTupleEqual(tokens, expected_tokens)
 
+    def test_dispatch_table(self):
+        tokenizer = RegexTokenizer()
+        for name, _ in tokenizer.patterns:
+            kind, _ = tokenizer.dispatch_table[tokenizer.pattern.groupindex[name]]
+            self.assertEqual(kind, name)
+
+    def test_overridden_handlers(self):
+        tokens = tuple(DefaultTokenizer().tokenize_text("x = 'y'"))
+        self.assertTupleEqual(tokens[:3], (Token("ID", "x"), Token("OP", "="), Token("lit", "'y'")))
+
+        tokens = tuple(FormatTokenizer().tokenize_text("x y"))
+        self.assertTupleEqual(tokens[:3], (Token("ID", "x"), Token("FORMAT", " "), Token("ID", "y")))
+
+    def test_no_match(self):
+        with self.assertRaises(ValueError):
+            tuple(RegexTokenizer().tokenize_text("x = $"))
+
+    def test_tokenize_file(self):
+        tokenizer = RegexTokenizer()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "source.txt"
+            path.write_text(test_string)
+            tokens = tuple(tokenizer.tokenize_file(path))
+            self.assertTupleEqual(tokens, expected_tokens)
+
+            path.write_text("")
+            tokens = tuple(tokenizer.tokenize_file(path, True))
+            self.assertTupleEqual(tokens, (Token("NEWLINE", "\n"), Token("ENDMARKER", "ENDMARKER")))
+
+    def test_tokenize_file_no_match(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "source.txt"
+            for source in ("a = b\nb = $ c", "a = b\nb = \"é\" §"):
+                path.write_text(source, encoding="utf-8")
+                for tokenizer in (RegexTokenizer(), EBNFTokenizer()):
+                    with self.subTest(source=source, tokenizer=type(tokenizer).__name__):
+                        with self.assertRaises(ValueError) as file_error:
+                            tuple(tokenizer.tokenize_file(path))
+                        with self.assertRaises(ValueError) as text_error:
+                            tuple(tokenizer.tokenize_text(source))
+                        self.assertEqual(str(file_error.exception), str(text_error.exception))
+
+    def test_tokenize_file_unicode(self):
+        # Word characters and whitespace of the pattern include non-ASCII characters and separators
+        tokenizer = WordTokenizer()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "source.txt"
+            for source in ("héllo wörld\n", "a\x1cb", "word"):
+                with self.subTest(source=source):
+                    path.write_text(source, encoding="utf-8")
+                    self.assertEqual(list(tokenizer.tokenize_file(path)), list(tokenizer.tokenize_text(source)))
+
+    def test_lazy_values(self):
+        tokens = tuple(RegexTokenizer().tokenize_bytes(b'j = "bob"'))
+        literal = tokens[2]
+        self.assertIsInstance(literal, LazyToken)
+        self.assertIsNotNone(literal._source)
+        self.assertEqual(literal.second, '"bob"')
+        self.assertIsNone(literal._source)
+        self.assertEqual(literal, Token("LIT", '"bob"'))
+
+    def test_python_tokenize_file(self):
+        tokenizer = PythonTokenizer()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "source.py"
+            for source in ("x = (1,\n 2)\n", "if x:\n    y = 'é'", ""):
+                with self.subTest(source=source):
+                    path.write_text(source, encoding="utf-8")
+                    self.assertEqual(list(tokenizer.tokenize_file(path)), list(tokenizer.tokenize_text(source)))
+
+    def test_tokenize_stream(self):
+        tokenizer = RegexTokenizer()
+        for chunks in (list(test_string), [test_string[:8], test_string[8:14], test_string[14:]]):
+            self.assertTupleEqual(tuple(tokenizer.tokenize_stream(chunks)), expected_tokens)
+
+        # Numbers, literals and encoded characters which straddle chunks
+        text = 'x = 12.5 + "é ü"'
+        encoded = text.encode()
+        expected = tuple(tokenizer.tokenize_text(text, True))
+        self.assertTupleEqual(tuple(tokenizer.tokenize_stream(["x = 12.", '5 + "é', ' ü"'], True)), expected)
+        self.assertTupleEqual(tuple(tokenizer.tokenize_stream([encoded[:16], encoded[16:]], True)), expected)
+
+    def test_stream_paren_depth(self):
+        tokenizer = EBNFTokenizer()
+        text = "rule: (a\n| b)\nother: c\n"
+        expected = tuple(tokenizer.tokenize_text(text))
+        self.assertTupleEqual(tuple(tokenizer.tokenize_stream(["rule: (a", "\n|", " b)\n", "other: c\n"])), expected)
+
+    def test_stream_longer_match(self):
+        # A match followed by a character ("." of "a..") may be extended by the next chunk
+        class SmallTokenizer(EllipsisTokenizer):
+            max_token_size = 3
+
+        for tokenizer in (EllipsisTokenizer(), SmallTokenizer()):
+            with self.subTest(tokenizer=type(tokenizer).__name__):
+                expected = tuple(tokenizer.tokenize_text("a...b ..."))
+                self.assertEqual(expected[1], Token("ELLIPSIS", "..."))
+                self.assertTupleEqual(tuple(tokenizer.tokenize_stream(["a..", ".b ", "..", "."])), expected)
+                self.assertTupleEqual(tuple(tokenizer.tokenize_stream("a...b ...")), expected)
+
+    def test_stream_is_incremental(self):
+        tokens = tuple(islice(RegexTokenizer().tokenize_stream(repeat("x = 1\n")), 8))
+        self.assertEqual(tokens[:4], (Token("ID", "x"), Token("=", "="), Token("NUMBER", 1), Token("NEWLINE", "\n")))
+
+        class SmallTokenizer(RegexTokenizer):
+            max_token_size = 4
+
+        with self.assertRaises(ValueError):
+            tuple(SmallTokenizer().tokenize_stream(["x = 'unterminated", " literal'"]))
+
+    def test_python_tokenize_stream(self):
+        tokenizer = PythonTokenizer()
+        source = "if x:\n    y = (1,\n 2)\n"
+        chunks = [source[:3], source[3:11], source[11:].encode()]
+        self.assertEqual(list(tokenizer.tokenize_stream(chunks)), list(tokenizer.tokenize_text(source)))
+
 
 if __name__ == "__main__":
     unittest.main()